@@ -1,16 +1,18 @@
 import os
+import re
 import threading
 import logging
 from typing import List, Dict, Optional
 from flask import jsonify
 from flask_cors import CORS
-from langchain_groq import ChatGroq
 import json
 import redis
 from rq import Queue
 from rq.job import Job
 import time
 from dotenv import load_dotenv
+from Services.instrumentation import span, record_tokens, LLM_DISPATCH
+from Services.cassette import cassette
 
 # Configure logging
 logging.basicConfig(level=logging.INFO)
@@ -18,6 +20,19 @@ logger = logging.getLogger(__name__)
 
 load_dotenv()
 
+# What get_response() returns instead of a completion when the RQ fallback
+# times out or fails; fine to show in a chat, never to store as a result
+LLM_BUSY_TIMEOUT = "Service is extremely busy. Please try again in a minute."
+LLM_BUSY_FAILED = "Worker processing failed. Please try again."
+LLM_BUSY_CAPACITY = "The system is currently at maximum capacity. Please wait a moment."
+LLM_BUSY_MESSAGES = (LLM_BUSY_TIMEOUT, LLM_BUSY_FAILED, LLM_BUSY_CAPACITY)
+HR_CHAT_UNAVAILABLE = "I apologize, but I'm having trouble connecting right now. Please try again in a moment."
+
+
+class LLMUnavailable(RuntimeError):
+    """No completion could be produced (see LLM_BUSY_MESSAGES)"""
+
+
 def execute_groq_task(system_prompt: str, user_message: str, history: List[Dict[str, str]] = None) -> str:
     """Task function for Redis Worker execution."""
     service = GroqChatService()
@@ -29,7 +44,8 @@ class GroqChatService:
     """
     _instance: Optional['GroqChatService'] = None
     _lock = threading.Lock()
-    _semaphore = threading.Semaphore(10)  # Maximum concurrent LLM requests allowed
+    # Maximum concurrent LLM requests per process; with gthread workers one process serves many requests
+    _semaphore = threading.Semaphore(int(os.getenv("LLM_MAX_CONCURRENCY") or 10))
 
     def __new__(cls):
         with cls._lock:
@@ -41,13 +57,9 @@ class GroqChatService:
     def __init__(self, model: str = "llama-3.1-8b-instant", temperature: float = 0.7):
         if self._initialized:
             return
-        api_key = os.getenv("groq_Api")
-        self.llm = ChatGroq(
-            groq_api_key=api_key,
-            model_name=model,
-            temperature=temperature,
-            max_tokens=4096
-        )
+        self.model = model
+        self.temperature = temperature
+        self._llm = None
         # Initialize Redis for heavy traffic fallback
         try:
             self.redis_url = os.getenv("REDIS_URL", "redis://localhost:6379")
@@ -60,6 +72,25 @@ class GroqChatService:
 
         self._initialized = True
 
+    @property
+    def llm(self):
+        """
+        ChatGroq client, built on first use: importing langchain_groq costs
+        ~0.6s, which should not land on every worker boot (see /readyz warmup).
+        """
+        if self._llm is None:
+            with self._lock:
+                if self._llm is None:
+                    from langchain_groq import ChatGroq
+                    # ChatGroq also reads GROQ_API_BASE, which load tests point at loadtest/emulators.py
+                    self._llm = ChatGroq(
+                        groq_api_key=os.getenv("groq_Api"),
+                        model_name=self.model,
+                        temperature=self.temperature,
+                        max_tokens=4096
+                    )
+        return self._llm
+
     def get_response(self, system_prompt: str, user_message: str, history: List[Dict[str, str]] = None) -> str:
         """
         Sends a request to Groq LLM. Uses local semaphore for normal traffic,
@@ -72,6 +103,7 @@ class GroqChatService:
         if self._semaphore.acquire(blocking=False):
             try:
                 logger.info("Handling request via EXISTING flow (Local Semaphore)...")
+                LLM_DISPATCH.labels(path="local").inc()
                 return self._execute_llm(system_prompt, user_message, history)
             finally:
                 self._semaphore.release()
@@ -80,32 +112,41 @@ class GroqChatService:
         if self.queue:
             try:
                 logger.info("⚠️ Heavy traffic detected! Offloading to REDIS WORKER...")
-                job = self.queue.enqueue(
-                    execute_groq_task, 
-                    system_prompt, 
-                    user_message, 
-                    history
-                )
-                
-                # Wait for worker result with a timeout
-                timeout = 30 # seconds
-                start_time = time.time()
-                while not job.is_finished:
-                    if time.time() - start_time > timeout:
-                        return "Service is extremely busy. Please try again in a minute."
-                    if job.is_failed:
-                        return "Worker processing failed. Please try again."
-                    time.sleep(0.5)
+                LLM_DISPATCH.labels(path="rq").inc()
+                with span("rq_wait"):
+                    job = self.queue.enqueue(
+                        execute_groq_task, 
+                        system_prompt, 
+                        user_message, 
+                        history
+                    )
+                    
+                    # Wait for worker result with a timeout
+                    timeout = 30 # seconds
+                    start_time = time.time()
+                    while not job.is_finished:
+                        if time.time() - start_time > timeout:
+                            LLM_DISPATCH.labels(path="rq_timeout").inc()
+                            return LLM_BUSY_TIMEOUT
+                        if job.is_failed:
+                            LLM_DISPATCH.labels(path="rq_failed").inc()
+                            return LLM_BUSY_FAILED
+                        time.sleep(0.5)
                 
                 return job.result
             except Exception as e:
                 logger.error(f"Redis Worker Fallback Error: {e}")
-                return "The system is currently at maximum capacity. Please wait a moment."
+                return LLM_BUSY_CAPACITY
         
         # Absolute fallback: Block until semaphore is available
         logger.info("Redis unavailable and Semaphore full. Blocking thread...")
-        with self._semaphore:
+        LLM_DISPATCH.labels(path="blocking").inc()
+        with span("semaphore_wait"):
+            self._semaphore.acquire()
+        try:
             return self._execute_llm(system_prompt, user_message, history)
+        finally:
+            self._semaphore.release()
 
     def _execute_llm(self, system_prompt: str, user_message: str, history: List[Dict[str, str]]) -> str:
         """Core LLM execution logic used by both local flow and workers."""
@@ -118,7 +159,12 @@ class GroqChatService:
         messages.append(("human", user_message))
         
         try:
-            response = self.llm.invoke(messages)
+            with span("llm_call"):
+                if cassette.active:
+                    response = cassette.chat(self.model, messages, self.llm.invoke)
+                else:
+                    response = self.llm.invoke(messages)
+            record_tokens(self.model, response)
             return response.content if hasattr(response, "content") else str(response)
         except Exception as e:
             logger.error(f"LLM Execution Error: {str(e)}")
@@ -127,6 +173,15 @@ class GroqChatService:
     def get_quick_completion(self, prompt: str) -> str:
         """Helper for simple completions, using the robust fallback flow."""
         return self.get_response(system_prompt="You are a helpful assistant.", user_message=prompt, history=[])
+
+    def get_strict_completion(self, prompt: str) -> str:
+        """get_quick_completion that raises LLMUnavailable instead of returning a busy message"""
+        reply = self.get_quick_completion(prompt)
+        if reply is None or reply in LLM_BUSY_MESSAGES:
+            raise LLMUnavailable(reply or "Empty LLM reply")
+        return reply
+
+
 load_dotenv()
 
 # Default questions mapping used if DB is empty
@@ -137,16 +192,389 @@ DEFAULT_QUESTIONS = {
 }
 
 
+# Intro flair the model sometimes puts before the question, stripped in order
+QUESTION_PREFIXES = [re.compile(pattern, re.IGNORECASE) for pattern in (
+    r"^Here is (a|your) .*? question:?\s*",
+    r"^Technical Interview Question:?\s*",
+    r"^Question \d+:?\s*",
+    r"^.*? interview question as follows?:?\s*",
+    r"^this is .*? questin as follow :?\s*",
+)]
+
+
+# ── PROMPT BUILDERS ────────────────────────────────────────────────────────
+# Pure functions, so the per-turn string work can be benchmarked without an
+# LLM (see benchmarks/).
+def build_question_prompt(stage, count, focus, level, context, history):
+    # Build History Context
+    history_str = ""
+    for i, turn in enumerate(history[-3:]): # last 3 turns
+        history_str += f"\nQ{i+1}: {turn['question']}\nA{i+1}: {turn['answer']}"
+
+    return f"""
+        You are an experienced HR and Technical Interviewer conducting a structured interview.
+        Current Stage: {stage} (Question {count})
+        Focus: {focus}
+        Difficulty Level: {level}
+        
+        CONTEXT:
+        {context}
+        
+        PREVIOUS Q&A HISTORY (for continuity, do not repeat questions):
+        {history_str}
+        
+        INSTRUCTIONS:
+        1. Generate exactly 1 interview question appropriate for the {stage} stage.
+        2. Tailor it to the provided context and difficulty level.
+        3. Make it natural and conversational.
+        4. Return ONLY the question text, with no introductory or concluding remarks.
+        """
+
+
+def clean_question(question):
+    """Strips introductory flair and quotes from a generated question"""
+    question = question.strip()
+    for pattern in QUESTION_PREFIXES:
+        question = pattern.sub("", question).strip()
+    # Remove leading/trailing quotes
+    return question.strip('"\'')
+
+
+def build_evaluation_prompt(interview):
+    """Final-report prompt for the whole interview, or None when no answer was recorded"""
+    # Build full transcript and emotional summary
+    history_str = ""
+    emotion_summary = []
+    valid_count = 0
+    for i, turn in enumerate(interview.history):
+        ans = turn.get('answer', '').strip()
+        if not ans: continue
+
+        history_str += f"\nQ{i+1}: {turn.get('question', '')}\nA{i+1}: {ans}\n"
+
+        posture = turn.get('posture', {})
+        if posture:
+            emotion_summary.append(f"Q{i+1} Emotion: {posture.get('dominant_emotion', 'N/A')} (Stability: {posture.get('stability', 'N/A')})")
+
+        valid_count += 1
+
+    if valid_count == 0:
+        return None
+
+    emotions_str = "\n".join(emotion_summary) if emotion_summary else "No emotion data recorded."
+
+    return f"""
+            You are an expert Head of HR and Senior Interviewer providing a final, comprehensive evaluation for a candidate's entire interview.
+            Use their answers AND their emotional presence/posture data to provide a holistic assessment.
+
+            INTERVIEW CONTEXT:
+            Job Description / Context: {interview.jd_text}
+            Candidate Resume: {"Included in context" if interview.resume_text else "Not provided"}
+            Total Scorable Questions Answered: {valid_count}
+
+            FULL INTERVIEW TRANSCRIPT:
+            {history_str}
+
+            EMOTIONAL & POSTURE DATA SUMMARY:
+            {emotions_str}
+
+            Provide a comprehensive final interview assessment that evaluates the candidate across all questions combined.
+            Use EXACTLY the following format:
+
+            ## Overall Assessment
+            [Provide a detailed paragraph summarizing their overall performance, behavioral consistency, and technical depth]
+
+            ## Key Strengths
+            - [Strength 1 based on their answers]
+            - [Strength 2 based on their answers]
+            - [Strength 3 based on their answers]
+
+            ## Areas for Improvement (including Body Language/Emotions)
+            - [Area 1 to improve]
+            - [Area 2 to improve]
+            - [Area 3 to improve]
+            
+            ## Behavioral & Emotional Analysis
+            [Provide a brief paragraph on their non-verbal communication, emotional stability, and overall confidence detected by the AI]
+
+            ## Question Breakdown & HR Expected Answers
+            For each question asked in the transcript, provide:
+            **Question**: [The exact question from the transcript]
+            **Feedback on Candidate's Answer**: [Brief analysis based on what they actually said]
+            **HR Recommended Answer**: [The ideal, professional answer that HR would expect for this specific question]
+
+            ## Score
+            [X]/10
+
+            ## Hiring Recommendation
+            [State clearly: Move Forward, Hold, or Reject with a 1-sentence justification]
+            """
+
+
+def build_turn_evaluation_prompt(payload):
+    """Prompt scoring one answered turn; the model replies with the JSON parse_turn_evaluation() reads"""
+    posture = payload.get('posture_data') or {}
+    return f"""
+            You are an expert interview coach evaluating ONE answer from a mock interview.
+
+            INTERVIEW CONTEXT:
+            Topic: {payload.get('topic', 'Unknown')}
+            Difficulty Level: {payload.get('difficulty_level', 'Unknown')}
+            Job Description / Context: {(payload.get('jd_text') or 'Not provided')[:1500]}
+
+            INTERVIEW QUESTION:
+            {payload.get('question_text', '')}
+
+            CANDIDATE'S ANSWER (Speech-to-Text):
+            {payload.get('user_transcription', '')}
+
+            POSTURE & EMOTION DATA (detected in the browser):
+            - Duration: {posture.get('duration', 0)} seconds
+            - Stability: {posture.get('stability', 'Unknown')}
+            - Dominant Emotion: {posture.get('dominant_emotion', 'Unknown')}
+            - Notes: {posture.get('notes', '')}
+
+            Reply with ONLY a JSON object, no markdown fences, with exactly these keys:
+            {{
+              "score": <number 0-10>,
+              "feedback": "<2-3 sentences on relevance, depth, structure and clarity of what they actually said>",
+              "strengths": ["<strength>", "<strength>"],
+              "improvements": ["<improvement>", "<improvement>"],
+              "emotion_note": "<one sentence on emotional presence and body language>",
+              "ideal_answer": "<the ideal answer HR would expect, in a professional candidate style>"
+            }}
+            """
+
+
+def parse_turn_evaluation(text):
+    """Structured turn result from the model's reply; tolerates fences and stray prose"""
+    result = None
+    match = re.search(r"\{[\s\S]*\}", text or "")
+    if match:
+        try:
+            result = json.loads(match.group(0))
+        except ValueError:
+            result = None
+    if not isinstance(result, dict):
+        # Not JSON: keep the text as feedback and salvage a score if there is one
+        score = re.search(r'(\d+(?:\.\d+)?)\s*/\s*10', text or "")
+        result = {"score": score.group(1) if score else None, "feedback": (text or "").strip()[:1000]}
+    try:
+        score = min(10.0, max(0.0, float(result.get("score"))))
+    except (TypeError, ValueError):
+        score = None
+
+    def _items(value):
+        if isinstance(value, str):
+            value = [value]
+        return [str(item).strip() for item in (value or []) if str(item).strip()][:4]
+
+    return {
+        "score": score,
+        "feedback": str(result.get("feedback") or "").strip(),
+        "strengths": _items(result.get("strengths")),
+        "improvements": _items(result.get("improvements")),
+        "emotion_note": str(result.get("emotion_note") or "").strip(),
+        "ideal_answer": str(result.get("ideal_answer") or "").strip(),
+    }
+
+
+def build_summary_prompt(interview, turns):
+    """
+    Reduce step of the final report: a short digest per scored turn in, the
+    fixed-size summary sections out. The per-question breakdown is assembled
+    from the stored turn results instead, so this prompt's output does not
+    grow with the interview.
+    """
+    digest = ""
+    for turn in turns:
+        result = turn["evaluation"]
+        digest += (f"\nQ{turn['turn']}: {turn['question'][:200]}\n"
+                   f"   Score: {result['score'] if result['score'] is not None else 'n/a'}/10. {result['feedback'][:300]}\n"
+                   f"   Strengths: {'; '.join(result['strengths'][:2]) or '-'} | "
+                   f"Improvements: {'; '.join(result['improvements'][:2]) or '-'}\n"
+                   f"   Presence: {result['emotion_note'][:150] or '-'}\n")
+
+    return f"""
+            You are an expert Head of HR writing the summary of a candidate's mock interview from
+            per-question evaluations that have already been made. Do not re-score the questions.
+
+            INTERVIEW CONTEXT:
+            Job Description / Context: {interview.jd_text[:1500] if interview.jd_text else "Not provided"}
+            Difficulty Level: {interview.difficulty_level}
+            Questions Evaluated: {len(turns)}
+
+            PER-QUESTION EVALUATIONS:
+            {digest}
+
+            Write EXACTLY these sections and nothing else:
+
+            ## Overall Assessment
+            [A detailed paragraph on overall performance, behavioral consistency, and technical depth]
+
+            ## Key Strengths
+            - [Strength 1]
+            - [Strength 2]
+            - [Strength 3]
+
+            ## Areas for Improvement (including Body Language/Emotions)
+            - [Area 1]
+            - [Area 2]
+            - [Area 3]
+
+            ## Behavioral & Emotional Analysis
+            [A brief paragraph on non-verbal communication, emotional stability, and confidence]
+
+            ## Hiring Recommendation
+            [Move Forward, Hold, or Reject with a 1-sentence justification]
+            """
+
+
+def _section(markdown_text, title):
+    match = re.search(rf"##\s*{re.escape(title)}[^\n]*\n([\s\S]*?)(?=\n##\s|\Z)", markdown_text or "", re.IGNORECASE)
+    return match.group(1).strip() if match else ""
+
+
+def assemble_final_report(summary_md, turns, score):
+    """
+    The final report in the format the feedback page renders (same sections
+    as evaluate_all's), from the summary sections plus the stored turn results.
+    """
+    def _bullets(items, fallback):
+        return "\n".join(f"- {item}" for item in items[:3]) or f"- {fallback}"
+
+    strengths = [item for turn in turns for item in turn["evaluation"]["strengths"]]
+    improvements = [item for turn in turns for item in turn["evaluation"]["improvements"]]
+    sections = {
+        "Overall Assessment": _section(summary_md, "Overall Assessment")
+        or f"The candidate answered {len(turns)} question(s) with an average score of {score} out of 10.",
+        "Key Strengths": _section(summary_md, "Key Strengths") or _bullets(list(dict.fromkeys(strengths)), "Completed the interview"),
+        "Areas for Improvement (including Body Language/Emotions)": _section(summary_md, "Areas for Improvement")
+        or _bullets(list(dict.fromkeys(improvements)), "Add concrete examples"),
+        "Behavioral & Emotional Analysis": _section(summary_md, "Behavioral & Emotional Analysis")
+        or " ".join(turn["evaluation"]["emotion_note"] for turn in turns if turn["evaluation"]["emotion_note"])[:600]
+        or "No emotion data recorded.",
+    }
+    recommendation = _section(summary_md, "Hiring Recommendation") or (
+        "Move Forward" if score >= 7 else "Hold" if score >= 5 else "Reject") + f": average score {score} out of 10."
+
+    # Per-turn scores are written as "scored N of 10" so the only "/10" in the
+    # report stays the final score
+    breakdown = "\n\n".join(
+        f"**Question**: {turn['question']}\n"
+        f"**Feedback on Candidate's Answer**: "
+        f"{'(scored %g of 10) ' % turn['evaluation']['score'] if turn['evaluation']['score'] is not None else ''}"
+        f"{turn['evaluation']['feedback'] or 'No feedback recorded.'}\n"
+        f"**HR Recommended Answer**: {turn['evaluation']['ideal_answer'] or 'Not available.'}"
+        for turn in turns
+    )
+    body = "\n\n".join(f"## {title}\n{text}" for title, text in sections.items())
+    return (f"{body}\n\n## Question Breakdown & HR Expected Answers\n{breakdown}\n\n"
+            f"## Score\n{score}/10\n\n## Hiring Recommendation\n{recommendation}")
+
+
+def feedback_digest(feedback, limit=200):
+    """A finished report's overall assessment (or the raw feedback) as one short line"""
+    # Reports open with this section; only a short prefix is ever looked at,
+    # since this runs for every row of the chat context
+    text = (feedback or "")[:limit + 100]
+    if text.startswith("## Overall Assessment"):
+        text = text[len("## Overall Assessment"):]
+        end = text.find("##")
+        text = text[:end] if end != -1 else text
+    return " ".join(text.split())[:limit]
+
+
+def format_progress_summary(progress_data):
+    """Recent sessions as prompt lines for the HR chat"""
+    if not progress_data:
+        return "No previous interview sessions recorded yet."
+    progress_summary = ""
+    for session in progress_data[:5]: # last 5 sessions
+        progress_summary += f"- {session.get('session_date')}: Topic '{session.get('topic')}', Score: {session.get('score')}/10. Feedback: {feedback_digest(session.get('feedback'))}...\n"
+    return progress_summary
+
+
+def build_chat_context(progress_data, resume_text):
+    """
+    Everything /api/hr-chat needs from the DB, precompiled into prompt-ready
+    strings. Cached per user by Services/chat_context.py, so it must be JSON.
+    """
+    scores = [float(row["score"]) for row in reversed(progress_data or []) if row.get("score")]
+    if len(scores) >= 2:
+        delta = scores[-1] - scores[0]
+        direction = "improving" if delta > 0.5 else "declining" if delta < -0.5 else "steady"
+        score_trend = f"Scores oldest to newest: {', '.join(f'{score:g}' for score in scores)} ({direction})"
+    elif scores:
+        score_trend = f"One scored session so far: {scores[0]:g}"
+    else:
+        score_trend = "No scored sessions yet."
+
+    return {
+        "progress_summary": format_progress_summary(progress_data),
+        "score_trend": score_trend,
+        "resume_excerpt": resume_text[:2000] if resume_text else "No resume uploaded yet.",
+    }
+
+
+def format_chat_history(chat_history, limit=6):
+    history_str = ""
+    for msg in chat_history[-limit:]: # last 6 messages by default
+        role = "User" if msg['role'] == 'user' else "HR Assistant"
+        history_str += f"{role}: {msg['content'][:1200]}\n"
+    return history_str
+
+
+def build_chat_summary_prompt(summary, messages):
+    """Folds older HR chat messages into the rolling summary (Services/chat_memory.py)"""
+    return f"""
+            Condense this HR coaching conversation into a running summary for the assistant's memory.
+
+            SUMMARY SO FAR:
+            {summary or "None yet."}
+
+            NEWER MESSAGES TO FOLD IN:
+            {format_chat_history(messages, limit=len(messages))}
+
+            Write at most 150 words of plain text: the candidate's goals and concerns, advice already
+            given, commitments or next steps agreed, and facts they shared about themselves. Keep
+            scores and dates exactly as stated. No headings, no preamble.
+            """
+
+
 class InterviewGenratSession:
+    _embeddings_lock = threading.Lock()
+
     def __init__(self):
         self.groq_service = GroqChatService()
-        # Use Cloud-based Gemini Embeddings to save RAM (removes need for local 400MB model)
-        from langchain_google_genai import GoogleGenerativeAIEmbeddings
-        self.embeddings = GoogleGenerativeAIEmbeddings(
-            model="models/text-embedding-004", # Updated for better performance and 2026 compatibility
-            google_api_key=os.getenv("GEMINI_API_KEY")
-        )
-        logger.info("✅ Gemini Cloud Embeddings initialized with text-embedding-004.")
+        self._embeddings = None
+
+    @property
+    def embeddings(self):
+        """Gemini embeddings client, built on first use (google-genai is slow to import)"""
+        if getattr(self, "_embeddings", None) is None:
+            with self._embeddings_lock:
+                if getattr(self, "_embeddings", None) is None:
+                    # Use Cloud-based Gemini Embeddings to save RAM (removes need for local 400MB model)
+                    from langchain_google_genai import GoogleGenerativeAIEmbeddings
+                    embeddings = GoogleGenerativeAIEmbeddings(
+                        model="models/text-embedding-004", # Updated for better performance and 2026 compatibility
+                        google_api_key=os.getenv("GEMINI_API_KEY"),
+                        base_url=os.getenv("GEMINI_API_BASE") or None  # loadtest/emulators.py in load tests
+                    )
+                    self._embeddings = cassette.wrap_embeddings(embeddings, "text-embedding-004")
+                    logger.info("✅ Gemini Cloud Embeddings initialized with text-embedding-004.")
+        return self._embeddings
+
+    @embeddings.setter
+    def embeddings(self, client):
+        self._embeddings = client
+
+    def warm_up(self):
+        """Builds both clients ahead of the first interview (gunicorn post_worker_init)"""
+        self.groq_service.llm
+        self.embeddings
+
     def _embed_and_chunk(self, text, query):
         if not self.embeddings:
             return text[:3000]
@@ -160,8 +588,9 @@ class InterviewGenratSession:
                 return text[:2000]
 
             # Get embeddings from Gemini API
-            chunk_embeddings = np.array(self.embeddings.embed_documents(chunks))
-            query_embedding = np.array(self.embeddings.embed_query(query)).reshape(1, -1)
+            with span("embedding"):
+                chunk_embeddings = np.array(self.embeddings.embed_documents(chunks))
+                query_embedding = np.array(self.embeddings.embed_query(query)).reshape(1, -1)
 
             # Manual Cosine Similarity to avoid loading scikit-learn (saves ~100MB RAM)
             norm_query = np.linalg.norm(query_embedding, axis=1, keepdims=True)
@@ -181,6 +610,7 @@ class InterviewGenratSession:
             logger.error(f"Embedding failed: {e}")
             return text[:3000]  # truncate to save tokens
     
+    @span("next_question")
     def get_next_question(self, interview_state: dict):
         count = interview_state.get('question_count', 0)
         level = interview_state.get('level', 'medium')
@@ -213,48 +643,10 @@ class InterviewGenratSession:
             focus = "Conflict resolution, teamwork (STAR method), behavioral rubric"
             context = f"Job Description: {jd}"
 
-        # Build History Context
-        history_str = ""
-        for i, turn in enumerate(history[-3:]): # last 3 turns
-            history_str += f"\nQ{i+1}: {turn['question']}\nA{i+1}: {turn['answer']}"
-        
-        prompt = f"""
-        You are an experienced HR and Technical Interviewer conducting a structured interview.
-        Current Stage: {stage} (Question {count})
-        Focus: {focus}
-        Difficulty Level: {level}
-        
-        CONTEXT:
-        {context}
-        
-        PREVIOUS Q&A HISTORY (for continuity, do not repeat questions):
-        {history_str}
-        
-        INSTRUCTIONS:
-        1. Generate exactly 1 interview question appropriate for the {stage} stage.
-        2. Tailor it to the provided context and difficulty level.
-        3. Make it natural and conversational.
-        4. Return ONLY the question text, with no introductory or concluding remarks.
-        """
+        prompt = build_question_prompt(stage, count, focus, level, context, history)
         
         try:
-            question = self.groq_service.get_quick_completion(prompt)
-            question = question.strip()
-
-            # Clean up introductory flair if any
-            import re
-            prefixes_to_strip = [
-                r"^Here is (a|your) .*? question:?\s*",
-                r"^Technical Interview Question:?\s*",
-                r"^Question \d+:?\s*",
-                r"^.*? interview question as follows?:?\s*",
-                r"^this is .*? questin as follow :?\s*"
-            ]
-            for pattern in prefixes_to_strip:
-                question = re.sub(pattern, "", question, flags=re.IGNORECASE).strip()
-            
-            # Remove leading/trailing quotes
-            question = question.strip('"\'')
+            question = clean_question(self.groq_service.get_quick_completion(prompt))
             # Save generated question to use as fallback later
             from database_con import StoreGeneratedQuestion
             StoreGeneratedQuestion(jd, level, stage, question)
@@ -280,172 +672,53 @@ class InterviewGenratSession:
             else:
                 return random.choice(available_qs), stage
 
-    def evaluate_Answer(self,structured_payload):
+    @span("evaluate_answer")
+    def evaluate_Answer(self, structured_payload):
         """
-        Context-aware evaluation using complete session + emotion data.
-        posture_data is now supplied by the Python EmotionDetector,
-        but the frontend can still send its own posture_data as override/fallback.
+        Scores one answered turn (question, transcript, posture data) and
+        returns the structured result of parse_turn_evaluation(). Runs in the
+        background after /submit-answer (Services/turn_evaluation.py).
         """
+        reply = self.groq_service.get_strict_completion(build_turn_evaluation_prompt(structured_payload))
+        return parse_turn_evaluation(reply)
 
+    @span("summarize_interview")
+    def summarize_interview(self, interview, turns, score):
+        """
+        Final report from per-turn results: one fixed-size summary call, with
+        local fallbacks for any section the model leaves out or if it fails.
+        """
         try:
-            prompt = f"""
-            You are an expert interview coach providing detailed, professional feedback.
-
-            STRUCTURED INTERVIEW SESSION DATA:
-            Session ID: {structured_payload.get('session_id', 'Unknown')}
-            Topic: {structured_payload.get('topic', 'Unknown')}
-            Difficulty Level: {structured_payload.get('difficulty_level', 'Unknown')}
-            Timestamp: {structured_payload.get('timestamp', 'Unknown')}
-
-            INTERVIEW QUESTION:
-            {structured_payload.get('question_text', '')}
-
-            CANDIDATE'S ANSWER (Speech-to-Text):
-            {structured_payload.get('user_transcription', '')}
-
-            POSTURE & EMOTION DATA (detected by Python AI):
-            - Duration: {structured_payload.get('posture_data', {}).get('duration', 0)} seconds
-            - Stability: {structured_payload.get('posture_data', {}).get('stability', 'Unknown')}
-            - Current Emotion: {structured_payload.get('posture_data', {}).get('emotion', 'Unknown')}
-            - Dominant Emotion: {structured_payload.get('posture_data', {}).get('dominant_emotion', 'Unknown')}
-            - Notes: {structured_payload.get('posture_data', {}).get('notes', '')}
-
-            Please provide structured feedback in the following format:
-
-            ## Interview Question (Restated)
-            [Clearly restate the interview question]
-
-            ## Overall Assessment
-            [Provide a brief overall evaluation – 2–3 sentences]
-
-            ## Content Analysis (Answer Quality)
-            - Relevance: [How well did they address the question?]
-            - Depth: [Did they provide sufficient detail and examples?]
-            - Structure: [Was the answer well-organized?]
-
-            ## Communication Skills
-            - Clarity: [Was the answer clear and easy to understand?]
-            - Confidence: [Based on word choice and phrasing]
-            - Professionalism: [Appropriate language and tone?]
-
-            ## Emotional Presence & Body Language
-            - Dominant Emotion Detected: [{structured_payload.get('posture_data', {}).get('dominant_emotion', 'Unknown')}]
-            - Stability: [Comment on their emotional consistency during the interview]
-            - Engagement: [Based on duration and emotional range detected]
-            - Coaching Tip: [One specific tip based on their detected emotions]
-
-            ## Strengths
-            [List 2–3 specific things they did well]
-
-            ## Areas for Improvement
-            [List 2–3 specific suggestions for improvement]
-
-            ## Score
-            [X]/10
-
-            ## Ideal HR-Expected Answer
-            [Return the ideal answer to the interview question as HR expects.
-            Write it in a professional candidate style.]
-
-            ## Final Recommendation
-            [One-sentence summary and encouragement]
-            """
-            
-            feedback = self.groq_service.get_quick_completion(prompt)
-            return feedback
-
+            summary = self.groq_service.get_strict_completion(build_summary_prompt(interview, turns))
         except Exception as e:
-            print("EVALUATE RESULT ERROR:", e)
-            return f"## Score 0/10\n\nEvaluation failed due to an error: {str(e)}."
+            logger.error(f"Interview summary failed, assembling the report locally: {e}")
+            summary = ""
+        return assemble_final_report(summary, turns, score)
 
+    @span("evaluate_all")
     def evaluate_all(self, interview):
-        # Build full transcript and emotional summary
-        history_str = ""
-        emotion_summary = []
-        valid_count = 0
-        for i, turn in enumerate(interview.history):
-            ans = turn.get('answer', '').strip()
-            if not ans: continue
-            
-            history_str += f"\nQ{i+1}: {turn.get('question', '')}\nA{i+1}: {ans}\n"
-            
-            posture = turn.get('posture', {})
-            if posture:
-                emotion_summary.append(f"Q{i+1} Emotion: {posture.get('dominant_emotion', 'N/A')} (Stability: {posture.get('stability', 'N/A')})")
-            
-            valid_count += 1
-            
-        if valid_count == 0:
+        prompt = build_evaluation_prompt(interview)
+        if prompt is None:
             return "## Final Score 0/10\nNo valid answers were recorded to evaluate."
-            
-        emotions_str = "\n".join(emotion_summary) if emotion_summary else "No emotion data recorded."
-            
-        try:
-            prompt = f"""
-            You are an expert Head of HR and Senior Interviewer providing a final, comprehensive evaluation for a candidate's entire interview.
-            Use their answers AND their emotional presence/posture data to provide a holistic assessment.
-
-            INTERVIEW CONTEXT:
-            Job Description / Context: {interview.jd_text}
-            Candidate Resume: {"Included in context" if interview.resume_text else "Not provided"}
-            Total Scorable Questions Answered: {valid_count}
 
-            FULL INTERVIEW TRANSCRIPT:
-            {history_str}
-
-            EMOTIONAL & POSTURE DATA SUMMARY:
-            {emotions_str}
-
-            Provide a comprehensive final interview assessment that evaluates the candidate across all questions combined.
-            Use EXACTLY the following format:
-
-            ## Overall Assessment
-            [Provide a detailed paragraph summarizing their overall performance, behavioral consistency, and technical depth]
-
-            ## Key Strengths
-            - [Strength 1 based on their answers]
-            - [Strength 2 based on their answers]
-            - [Strength 3 based on their answers]
-
-            ## Areas for Improvement (including Body Language/Emotions)
-            - [Area 1 to improve]
-            - [Area 2 to improve]
-            - [Area 3 to improve]
-            
-            ## Behavioral & Emotional Analysis
-            [Provide a brief paragraph on their non-verbal communication, emotional stability, and overall confidence detected by the AI]
-
-            ## Question Breakdown & HR Expected Answers
-            For each question asked in the transcript, provide:
-            **Question**: [The exact question from the transcript]
-            **Feedback on Candidate's Answer**: [Brief analysis based on what they actually said]
-            **HR Recommended Answer**: [The ideal, professional answer that HR would expect for this specific question]
-
-            ## Score
-            [X]/10
-
-            ## Hiring Recommendation
-            [State clearly: Move Forward, Hold, or Reject with a 1-sentence justification]
-            """
-            
+        try:
             return self.groq_service.get_quick_completion(prompt)
         
         except Exception as e:
             print("EVALUATE ALL ERROR:", e)
             return f"## Score 0/10\n\nFinal evaluation compilation failed: {str(e)}."
-    def chat_with_hr(self, user_name, progress_data, resume_text, user_message, chat_history):
-        # Format progress data for the prompt
-        progress_summary = ""
-        if progress_data:
-            for i, session in enumerate(progress_data[:5]): # last 5 sessions
-                progress_summary += f"- {session.get('session_date')}: Topic '{session.get('topic')}', Score: {session.get('score')}/10. Feedback: {session.get('feedback')[:200]}...\n"
-        else:
-            progress_summary = "No previous interview sessions recorded yet."
 
-        history_str = ""
-        for msg in chat_history[-6:]: # last 6 messages
-            role = "User" if msg['role'] == 'user' else "HR Assistant"
-            history_str += f"{role}: {msg['content']}\n"
+    @span("summarize_chat")
+    def summarize_chat(self, summary, messages):
+        """New rolling summary of an HR chat; raises on failure so the old one is kept"""
+        return self.groq_service.get_strict_completion(build_chat_summary_prompt(summary, messages)).strip()
+
+    @span("hr_chat")
+    def chat_with_hr(self, user_name, context, user_message, chat_history, conversation_summary=""):
+        """context comes from build_chat_context()"""
+        history_str = format_chat_history(chat_history, limit=len(chat_history))
+        if conversation_summary:
+            history_str = f"(Earlier in this conversation) {conversation_summary}\n{history_str}"
 
         prompt = f"""
         You are 'SkillUp HR Assistant', a highly professional, encouraging, and expert HR consultant.
@@ -454,10 +727,11 @@ class InterviewGenratSession:
         ### SOURCE OF TRUTH (STRICTLY USE ONLY THIS DATA):
         1. USER PROFILE:
            - Name: {user_name}
-           - Resume Context: {resume_text[:2000] if resume_text else "No resume uploaded yet."}
+           - Resume Context: {context['resume_excerpt']}
 
         2. USER PROGRESS DATA (Actual Interview Records):
-           {progress_summary}
+           {context['progress_summary']}
+           {context['score_trend']}
 
         ### GUIDELINES TO PREVENT HALLUCINATION:
         - NEVER invent interview scores, feedback, or dates that are not in the 'USER PROGRESS DATA' section.
@@ -482,7 +756,11 @@ class InterviewGenratSession:
         """
 
         try:
-            return self.groq_service.get_quick_completion(prompt)
+            # Raises LLMUnavailable rather than returning a busy message, so
+            # nothing but a real reply can reach the chat memory
+            return self.groq_service.get_strict_completion(prompt)
+        except LLMUnavailable:
+            raise
         except Exception as e:
-            print("HR CHAT ERROR:", e)
-            return "I apologize, but I'm having trouble connecting right now. Please try again in a moment."
+            logger.error(f"HR chat failed: {e}")
+            raise LLMUnavailable(str(e)) from e
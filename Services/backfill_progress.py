@@ -0,0 +1,18 @@
+import os
+import sys
+
+# Add project root to path
+sys.path.append(os.getcwd())
+
+from database_con import RebuildUserProgress
+
+def backfill(user_id=None):
+    count = RebuildUserProgress(user_id)
+    target = f"user {user_id}" if user_id else "all users"
+    print(f"Progress rollup rebuilt for {target} ({count} row(s)).")
+
+if __name__ == "__main__":
+    if len(sys.argv) > 1:
+        backfill(int(sys.argv[1]))
+    else:
+        backfill()
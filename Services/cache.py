@@ -0,0 +1,46 @@
+import os
+import time
+import logging
+import threading
+import redis
+from dotenv import load_dotenv
+
+load_dotenv()
+logger = logging.getLogger(__name__)
+
+REDIS_URL = os.getenv("REDIS_URL", "redis://localhost:6379")
+REDIS_TIMEOUT = float(os.getenv("REDIS_TIMEOUT") or 0.5)          # seconds; Redis is an optimisation, never block on it
+REDIS_RETRY_AFTER = float(os.getenv("REDIS_RETRY_AFTER") or 30)   # back-off after a failure
+
+_client = None
+_client_lock = threading.Lock()
+_down_until = 0.0
+
+
+def get_redis():
+    """
+    Shared Redis client for caches and counters, or None while Redis is known
+    to be unreachable. Callers must treat Redis as optional and fall back to
+    MySQL; report failures with redis_failed() so other callers back off.
+    """
+    global _client
+    if time.monotonic() < _down_until:
+        return None
+    if _client is None:
+        with _client_lock:  # gthread workers: one client (and connection pool) per process
+            if _client is None:
+                _client = redis.from_url(
+                    REDIS_URL,
+                    socket_connect_timeout=REDIS_TIMEOUT,
+                    socket_timeout=REDIS_TIMEOUT,
+                    decode_responses=True,
+                )
+    return _client
+
+
+def redis_failed(error):
+    """Marks Redis as unavailable for REDIS_RETRY_AFTER seconds"""
+    global _down_until
+    if time.monotonic() >= _down_until:
+        logger.warning(f"Redis unavailable, falling back to MySQL for {REDIS_RETRY_AFTER:.0f}s: {error}")
+    _down_until = time.monotonic() + REDIS_RETRY_AFTER
@@ -0,0 +1,199 @@
+import os
+import json
+import time
+import glob
+import base64
+import hashlib
+import logging
+import threading
+from dotenv import load_dotenv
+
+load_dotenv()
+logger = logging.getLogger(__name__)
+
+# off | record | replay | auto (replay what is recorded, record the rest)
+LLM_CASSETTE_MODE = (os.getenv("LLM_CASSETTE_MODE") or "off").lower()
+LLM_CASSETTE_DIR = os.getenv("LLM_CASSETTE_DIR") or "cassettes/default"
+# Replay latency as a fraction of the recorded one: 0/instant, 1/recorded, or e.g. 0.5
+LLM_CASSETTE_LATENCY = os.getenv("LLM_CASSETTE_LATENCY") or "instant"
+
+
+class CassetteMiss(LookupError):
+    """Replay mode was asked for a call that was never recorded"""
+
+
+def _latency_scale(value):
+    named = {"instant": 0.0, "recorded": 1.0}
+    if value in named:
+        return named[value]
+    try:
+        return float(value)
+    except ValueError:
+        return None
+
+
+def _key(*parts):
+    return hashlib.sha256(json.dumps(parts, ensure_ascii=False, separators=(",", ":")).encode()).hexdigest()[:32]
+
+
+def _pack_vector(values):
+    import numpy as np
+    return base64.b64encode(np.asarray(values, dtype=np.float32).tobytes()).decode()
+
+
+def _unpack_vector(packed):
+    import numpy as np
+    return np.frombuffer(base64.b64decode(packed), dtype=np.float32).astype(float).tolist()
+
+
+class Cassette:
+    """
+    Record/replay store for LLM and embedding calls, so interview transcripts
+    can be profiled offline and repeatably.
+
+    Recording appends one JSON line per call to <dir>/<pid>.jsonl (one file per
+    process, so gunicorn and RQ workers never interleave writes), with the
+    response, the wall time it took and token usage. Embedding vectors are kept
+    per text as base64 float32. Calls are keyed by a hash of model + request;
+    the same request recorded several times replays its responses in order.
+    """
+
+    def __init__(self, mode=LLM_CASSETTE_MODE, directory=LLM_CASSETTE_DIR, latency=LLM_CASSETTE_LATENCY):
+        if mode not in ("off", "record", "replay", "auto"):
+            raise ValueError(f"LLM_CASSETTE_MODE must be off, record, replay or auto, not {mode!r}")
+        self.mode = mode
+        self.directory = directory
+        self.latency_scale = _latency_scale(latency)
+        if self.latency_scale is None:
+            raise ValueError(f"LLM_CASSETTE_LATENCY must be instant, recorded or a number, not {latency!r}")
+        self._lock = threading.Lock()
+        self._entries = None          # key -> [entry, ...] in recording order
+        self._served = {}             # key -> how many of its entries were replayed
+        self._file = None
+        self._file_pid = None
+
+    @property
+    def active(self):
+        return self.mode != "off"
+
+    # ── storage ────────────────────────────────────────────────────────────
+    def _load(self):
+        with self._lock:
+            if self._entries is not None:
+                return
+            entries = []
+            for path in sorted(glob.glob(os.path.join(self.directory, "*.jsonl"))):
+                with open(path, encoding="utf-8") as f:
+                    entries.extend(json.loads(line) for line in f if line.strip())
+            entries.sort(key=lambda e: e["at"])
+            self._entries = {}
+            for entry in entries:
+                self._entries.setdefault(entry["key"], []).append(entry)
+            logger.info(f"Cassette {self.directory}: {len(entries)} recorded calls loaded")
+
+    def _append(self, entry):
+        with self._lock:
+            if self._file is None or self._file_pid != os.getpid():
+                os.makedirs(self.directory, exist_ok=True)
+                self._file = open(os.path.join(self.directory, f"{os.getpid()}.jsonl"), "a", encoding="utf-8")
+                self._file_pid = os.getpid()
+            self._file.write(json.dumps(entry, ensure_ascii=False, separators=(",", ":")) + "\n")
+            self._file.flush()
+            if self._entries is not None:
+                self._entries.setdefault(entry["key"], []).append(entry)
+
+    def _lookup(self, key):
+        """Next recorded entry for key (cycling), or None"""
+        if self.mode == "record":
+            return None
+        self._load()
+        with self._lock:
+            recorded = self._entries.get(key, [])
+            index = self._served.get(key, 0)
+            self._served[key] = index + 1
+            if not recorded or (self.mode == "auto" and index >= len(recorded)):
+                return None
+            return recorded[index % len(recorded)]
+
+    def _wait(self, ms):
+        if self.latency_scale:
+            time.sleep(ms / 1000 * self.latency_scale)
+
+    # ── chat ───────────────────────────────────────────────────────────────
+    def chat(self, model, messages, invoke):
+        """
+        Replays or records invoke(messages), which returns a LangChain
+        AIMessage. Replayed messages carry the recorded usage metadata.
+        """
+        from langchain_core.messages import AIMessage
+
+        key = _key("chat", model, [list(m) for m in messages])
+        entry = self._lookup(key)
+        if entry is not None:
+            self._wait(entry["ms"])
+            return AIMessage(content=entry["content"], usage_metadata=entry.get("usage"))
+        if self.mode == "replay":
+            raise CassetteMiss(f"No recorded chat call for {model} (key {key})")
+
+        started = time.perf_counter()
+        response = invoke(messages)
+        usage = getattr(response, "usage_metadata", None)
+        self._append({"key": key, "kind": "chat", "model": model, "at": time.time(),
+                      "ms": round((time.perf_counter() - started) * 1000, 1),
+                      "content": response.content if hasattr(response, "content") else str(response),
+                      "usage": dict(usage) if usage else None})
+        return response
+
+    # ── embeddings ─────────────────────────────────────────────────────────
+    def wrap_embeddings(self, embeddings, model):
+        return CassetteEmbeddings(self, embeddings, model) if self.active else embeddings
+
+    def embed(self, model, kind, texts, live):
+        """
+        Vectors for texts. Each text is its own entry, so a batch replays even
+        if it was recorded split differently; a replayed batch waits for the
+        recorded time of its texts. Misses are fetched in one live call.
+        """
+        keys = [_key(kind, model, text) for text in texts]
+        vectors, misses, delay = [None] * len(texts), [], 0.0
+        for i, key in enumerate(keys):
+            entry = self._lookup(key)
+            if entry is None:
+                misses.append(i)
+            else:
+                vectors[i] = _unpack_vector(entry["vector"])
+                delay += entry["ms"] * entry.get("share", 1.0)
+        if misses and self.mode == "replay":
+            raise CassetteMiss(f"{len(misses)} of {len(texts)} texts have no recorded {kind} call")
+        self._wait(delay)
+
+        if misses:
+            started = time.perf_counter()
+            fetched = live([texts[i] for i in misses])
+            elapsed = round((time.perf_counter() - started) * 1000, 1)
+            now = time.time()
+            for i, vector in zip(misses, fetched):
+                vectors[i] = list(vector)
+                self._append({"key": keys[i], "kind": kind, "model": model, "at": now, "ms": elapsed,
+                              "share": round(1 / len(misses), 4), "vector": _pack_vector(vector)})
+        return vectors
+
+
+class CassetteEmbeddings:
+    """Drop-in for the LangChain embeddings client used by InterviewGenratSession"""
+
+    def __init__(self, cassette, embeddings, model):
+        self.cassette = cassette
+        self.embeddings = embeddings
+        self.model = model
+
+    def embed_documents(self, texts, *args, **kwargs):
+        return self.cassette.embed(self.model, "embed_documents", list(texts),
+                                   lambda batch: self.embeddings.embed_documents(batch, *args, **kwargs))
+
+    def embed_query(self, text, *args, **kwargs):
+        return self.cassette.embed(self.model, "embed_query", [text],
+                                   lambda batch: [self.embeddings.embed_query(batch[0], *args, **kwargs)])[0]
+
+
+cassette = Cassette()
@@ -0,0 +1,62 @@
+import os
+import json
+import logging
+from dotenv import load_dotenv
+from Services.cache import get_redis, redis_failed
+from Services.instrumentation import cache_outcome
+from Services.response_cache import get_version, version_keys
+
+load_dotenv()
+logger = logging.getLogger(__name__)
+
+CHAT_CONTEXT_TTL = int(os.getenv("CHAT_CONTEXT_TTL") or 24 * 3600)
+# The context is built from these version scopes (see response_cache.py), so
+# writes that bump them (FinishSession / StoreFeedbackReport / SaveUserResume)
+# invalidate it without any explicit delete
+CHAT_CONTEXT_SCOPES = ("sessions", "resume")
+
+
+def _key(user_id):
+    return f"chatctx:{user_id}"
+
+
+class ChatContextCache:
+    """
+    Per-user HR chat context (progress digest, score trend, resume excerpt)
+    in Redis, stamped with the user's sessions and resume versions. A chat
+    message costs one Redis round trip and no DB reads until the user
+    finishes an interview or changes their resume. Without Redis the context
+    is loaded from MySQL every time.
+    """
+
+    def get(self, user_id, loader):
+        """Cached context for user_id; loader(user_id) builds it on a miss"""
+        r = get_redis()
+        if r is None or user_id is None:
+            return loader(user_id)
+        try:
+            *versions, cached = r.mget(version_keys(user_id, CHAT_CONTEXT_SCOPES) + [_key(user_id)])
+        except Exception as e:
+            redis_failed(e)
+            return loader(user_id)
+
+        if cached and None not in versions:
+            entry = json.loads(cached)
+            if entry.get("versions") == versions:
+                cache_outcome("chat_context", "hit")
+                return entry["context"]
+        cache_outcome("chat_context", "miss")
+
+        # Versions are read before the DB, so a write racing with this load
+        # leaves the entry stamped with the older version and it misses next time
+        versions = [get_version(user_id, scope) for scope in CHAT_CONTEXT_SCOPES]
+        context = loader(user_id)
+        if None not in versions:
+            try:
+                r.set(_key(user_id), json.dumps({"versions": versions, "context": context}), ex=CHAT_CONTEXT_TTL)
+            except Exception as e:
+                redis_failed(e)
+        return context
+
+
+chat_context_cache = ChatContextCache()
@@ -0,0 +1,142 @@
+import os
+import json
+import logging
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from dotenv import load_dotenv
+from Services.cache import get_redis, redis_failed
+
+load_dotenv()
+logger = logging.getLogger(__name__)
+
+CHAT_RECENT_MESSAGES = int(os.getenv("CHAT_RECENT_MESSAGES") or 6)      # left verbatim by a fold
+# Older messages are folded into the summary once this many are waiting;
+# until then they are sent verbatim too, so nothing drops out of the prompt
+CHAT_SUMMARIZE_AFTER = int(os.getenv("CHAT_SUMMARIZE_AFTER") or 6)
+# Everything a fold has not absorbed yet, plus one exchange that can arrive
+# while a fold is running: the most messages a prompt carries
+CHAT_PROMPT_MESSAGES = CHAT_RECENT_MESSAGES + CHAT_SUMMARIZE_AFTER + 2
+# Hard cap on the stored log, reached only if summarization keeps failing
+CHAT_MAX_MESSAGES = int(os.getenv("CHAT_MAX_MESSAGES") or 40)
+CHAT_MESSAGE_CHARS = int(os.getenv("CHAT_MESSAGE_CHARS") or 1200)       # per stored message
+CHAT_INPUT_MAX_CHARS = int(os.getenv("CHAT_INPUT_MAX_CHARS") or 2000)   # longer messages are refused
+CHAT_SUMMARY_CHARS = int(os.getenv("CHAT_SUMMARY_CHARS") or 1500)
+CHAT_MEMORY_TTL = int(os.getenv("CHAT_MEMORY_TTL") or 7 * 24 * 3600)
+CHAT_FOLD_LOCK_TTL = 60
+
+# Commits a fold: drops the messages that were summarized from the head of
+# the log and stores the new summary, unless the head has changed since they
+# were read (the log was capped or cleared meanwhile); the next fold redoes it.
+#   KEYS: log, summary   ARGV: first folded message, folded count, summary, ttl
+FOLD_COMMIT_LUA = """
+if redis.call('LINDEX', KEYS[1], 0) ~= ARGV[1] then
+  return 0
+end
+redis.call('LTRIM', KEYS[1], tonumber(ARGV[2]), -1)
+redis.call('SET', KEYS[2], ARGV[3], 'EX', tonumber(ARGV[4]))
+return 1
+"""
+
+
+class ChatMemory:
+    """
+    Server-side HR chat conversation per user, in Redis: a rolling summary
+    plus every message not folded into it yet, verbatim. Once
+    CHAT_SUMMARIZE_AFTER messages sit behind the last CHAT_RECENT_MESSAGES,
+    a background thread folds them into the summary after the reply has been
+    sent, so the prompt stays bounded however long the conversation gets.
+    Without Redis there is no memory and the client sends its own recent
+    history instead.
+    """
+
+    def __init__(self, llm_service):
+        self.llm_service = llm_service
+        self._pool = None
+        self._pool_pid = None
+        self._lock = threading.Lock()
+        self._commit = None
+        self._commit_client = None
+
+    @staticmethod
+    def _keys(user_id):
+        return f"chat:{user_id}:log", f"chat:{user_id}:summary", f"chat:{user_id}:folding"
+
+    def _get_pool(self):
+        with self._lock:
+            if self._pool is None or self._pool_pid != os.getpid():
+                # Threads do not survive fork (gunicorn --preload); start a pool per worker
+                self._pool_pid = os.getpid()
+                self._pool = ThreadPoolExecutor(max_workers=2, thread_name_prefix="chat-fold")
+            return self._pool
+
+    def _commit_script(self, r):
+        if self._commit is None or self._commit_client is not r:
+            self._commit = r.register_script(FOLD_COMMIT_LUA)
+            self._commit_client = r
+        return self._commit
+
+    def context(self, user_id):
+        """(summary, unfolded messages) for the prompt, or None without Redis"""
+        r = get_redis()
+        if r is None:
+            return None
+        log_key, summary_key, _ = self._keys(user_id)
+        try:
+            pipe = r.pipeline(transaction=False)
+            pipe.get(summary_key)
+            pipe.lrange(log_key, -CHAT_PROMPT_MESSAGES, -1)
+            summary, recent = pipe.execute()
+        except Exception as e:
+            redis_failed(e)
+            return None
+        return summary or "", [json.loads(message) for message in recent]
+
+    def append(self, user_id, user_message, reply):
+        """Records one exchange; schedules a fold when enough older messages are waiting"""
+        r = get_redis()
+        if r is None:
+            return
+        log_key, summary_key, _ = self._keys(user_id)
+        messages = [json.dumps({"role": role, "content": content[:CHAT_MESSAGE_CHARS]})
+                    for role, content in (("user", user_message), ("assistant", reply))]
+        try:
+            pipe = r.pipeline(transaction=False)
+            pipe.rpush(log_key, *messages)
+            pipe.ltrim(log_key, -CHAT_MAX_MESSAGES, -1)
+            pipe.llen(log_key)
+            pipe.expire(log_key, CHAT_MEMORY_TTL)
+            pipe.expire(summary_key, CHAT_MEMORY_TTL)
+            length = pipe.execute()[2]
+        except Exception as e:
+            redis_failed(e)
+            return
+        if length - CHAT_RECENT_MESSAGES >= CHAT_SUMMARIZE_AFTER:
+            self._get_pool().submit(self._fold, user_id)
+
+    def _fold(self, user_id):
+        r = get_redis()
+        if r is None:
+            return
+        log_key, summary_key, lock_key = self._keys(user_id)
+        try:
+            # One fold per user at a time, across workers
+            if not r.set(lock_key, "1", nx=True, ex=CHAT_FOLD_LOCK_TTL):
+                return
+            try:
+                pipe = r.pipeline(transaction=False)
+                pipe.get(summary_key)
+                pipe.lrange(log_key, 0, -CHAT_RECENT_MESSAGES - 1)
+                summary, older = pipe.execute()
+                if not older:
+                    return
+                # Raises when the LLM is unavailable: the log is only trimmed
+                # once a real summary has replaced what it held
+                summary = self.llm_service.summarize_chat(summary or "", [json.loads(m) for m in older])
+                if not summary:
+                    return
+                self._commit_script(r)(keys=[log_key, summary_key],
+                                       args=[older[0], len(older), summary[:CHAT_SUMMARY_CHARS], CHAT_MEMORY_TTL])
+            finally:
+                r.delete(lock_key)
+        except Exception as e:
+            logger.error(f"HR chat summary failed for user {user_id}: {e}")
@@ -0,0 +1,151 @@
+import os
+import gzip
+import logging
+import threading
+from collections import OrderedDict
+from flask import g, request
+from dotenv import load_dotenv
+from Services.instrumentation import cache_outcome, record_compression
+
+load_dotenv()
+logger = logging.getLogger(__name__)
+
+COMPRESS_MIN_BYTES = int(os.getenv("COMPRESS_MIN_BYTES") or 1024)        # smaller bodies fit in a packet anyway
+COMPRESSED_CACHE_BYTES = int(os.getenv("COMPRESSED_CACHE_BYTES") or 16 * 1024 * 1024)
+
+# Encodings per content type, in server preference order, with the level used
+# for bodies compressed per request: fast settings, since they run on the
+# request path. zstd -3 is cheaper than gzip -6 at a better ratio for JSON;
+# browsers without zstd get brotli at a mid level. Unlisted types (images,
+# video, PDFs, already-compressed data) are never compressed.
+POLICY = {
+    "application/json": (("zstd", 3), ("br", 4), ("gzip", 6)),
+    "text/html": (("br", 5), ("zstd", 3), ("gzip", 6)),
+    "text/markdown": (("zstd", 3), ("br", 4), ("gzip", 6)),
+    "text/plain": (("zstd", 3), ("br", 4), ("gzip", 6)),
+    "text/css": (("br", 5), ("gzip", 6)),
+    "text/javascript": (("br", 5), ("gzip", 6)),
+    "image/svg+xml": (("br", 5), ("gzip", 6)),
+}
+# Immutable payloads are compressed once and then served from cache, so they
+# get the best ratio instead
+CACHED_LEVELS = {"zstd": 19, "br": 11, "gzip": 9}
+
+
+def _zstd(data, level):
+    import zstandard
+    return zstandard.ZstdCompressor(level=level).compress(data)
+
+
+def _brotli(data, level):
+    import brotli
+    return brotli.compress(data, quality=level)
+
+
+def _gzip(data, level):
+    return gzip.compress(data, compresslevel=level, mtime=0)
+
+
+CODECS = {"zstd": _zstd, "br": _brotli, "gzip": _gzip}
+
+
+class CompressedCache:
+    """
+    Byte-budgeted LRU of compressed bodies, keyed by (ETag, encoding). Only
+    responses marked with cache_compressed() go in: the ETag must identify
+    the body exactly, which holds for immutable payloads.
+    """
+
+    def __init__(self, max_bytes=COMPRESSED_CACHE_BYTES):
+        self.max_bytes = max_bytes
+        self.size = 0
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key):
+        with self._lock:
+            body = self._entries.get(key)
+            if body is not None:
+                self._entries.move_to_end(key)
+            return body
+
+    def put(self, key, body):
+        if len(body) > self.max_bytes // 8:
+            return
+        with self._lock:
+            old = self._entries.pop(key, None)
+            if old is not None:
+                self.size -= len(old)
+            self._entries[key] = body
+            self.size += len(body)
+            while self.size > self.max_bytes:
+                _, evicted = self._entries.popitem(last=False)
+                self.size -= len(evicted)
+
+
+compressed_cache = CompressedCache()
+
+
+def cache_compressed():
+    """Called by a view whose response never changes for its ETag (e.g. a finished feedback report)"""
+    g.cache_compressed = True
+
+
+def choose_encoding(mimetype, accept_encodings):
+    """(encoding, level) from POLICY that the client accepts, or None"""
+    for encoding, level in POLICY.get(mimetype, ()):
+        if accept_encodings[encoding] > 0:
+            return encoding, level
+    return None
+
+
+def _skip(response):
+    return (response.mimetype not in POLICY
+            or not 200 <= response.status_code < 300
+            or response.status_code in (204, 206)
+            # Streams (SSE, stream_with_context) must flush as they go; files
+            # (send_file) are served precompressed from static/dist
+            or response.is_streamed
+            or response.direct_passthrough
+            or "Content-Encoding" in response.headers
+            or "no-transform" in (response.headers.get("Cache-Control") or ""))
+
+
+def compress_response(response):
+    if response.mimetype in POLICY:
+        response.vary.add("Accept-Encoding")
+    if _skip(response):
+        return response
+    data = response.get_data()
+    if len(data) < COMPRESS_MIN_BYTES:
+        return response
+    choice = choose_encoding(response.mimetype, request.accept_encodings)
+    if choice is None:
+        return response
+    encoding, level = choice
+
+    etag, weak = response.get_etag()
+    if etag and g.get("cache_compressed"):
+        key = (etag, encoding)
+        body = compressed_cache.get(key)
+        cache_outcome("compressed", "hit" if body is not None else "miss")
+        if body is None:
+            body = CODECS[encoding](data, CACHED_LEVELS[encoding])
+            compressed_cache.put(key, body)
+    else:
+        body = CODECS[encoding](data, level)
+
+    if len(body) >= len(data):
+        return response
+    record_compression(encoding, len(data), len(body))
+    response.set_data(body)
+    response.headers["Content-Encoding"] = encoding
+    if etag and not weak:
+        # A strong ETag names exact bytes, which are now different
+        response.set_etag(f"{etag}-{encoding}")
+    return response
+
+
+def init_compression(app):
+    """Compresses responses per POLICY; replaces Flask-Compress"""
+    app.after_request(compress_response)
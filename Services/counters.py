@@ -0,0 +1,155 @@
+import os
+import time
+import logging
+from datetime import datetime
+from dotenv import load_dotenv
+from Services.cache import get_redis, redis_failed
+
+load_dotenv()
+logger = logging.getLogger(__name__)
+
+STATS_RECONCILE_SECONDS = int(os.getenv("STATS_RECONCILE_SECONDS") or 900)
+STATS_DAYS = int(os.getenv("STATS_DAYS") or 30)
+
+KEY_USERS = "stats:users"
+KEY_SESSIONS = "stats:sessions"
+KEY_BY_DAY = "stats:sessions:by_day"
+KEY_BY_LEVEL = "stats:sessions:by_level"
+KEY_BY_STAGE = "stats:sessions:by_stage"
+KEY_RECONCILED_AT = "stats:reconciled_at"
+KEY_RECONCILE_LOCK = "stats:reconcile_lock"
+
+
+def session_stage(topic):
+    """'Technical | Senior backend...' -> 'Technical'"""
+    return (topic or "General").split("|")[0].strip() or "General"
+
+
+class StatsCounters:
+    """
+    Platform totals for the admin dashboard kept as Redis counters.
+
+    Writes bump the counters (user registered, interview row inserted), so
+    reading them costs a handful of O(1) Redis calls instead of COUNT(*) scans.
+    Every STATS_RECONCILE_SECONDS the counters are overwritten with exact
+    counts from MySQL, which also repairs drift from rolled-back requests or
+    Redis restarts. Without Redis every read is exact.
+    """
+
+    def user_registered(self):
+        self._apply(lambda pipe: pipe.incr(KEY_USERS))
+
+    def session_created(self, session_date=None, level=None, topic=None):
+        self._apply(lambda pipe: self._count_session(pipe, session_date, level, topic))
+
+    def get_stats(self, mode="approx"):
+        """Returns totals and breakdowns; mode='exact' always reads MySQL"""
+        if mode != "exact":
+            stats = self._read_counters()
+            if stats is not None:
+                return stats
+        return self.reconcile()
+
+    def reconcile(self):
+        """Recomputes exact counts from MySQL and stores them as the new counter values"""
+        stats = self._exact_counts()
+        r = get_redis()
+        if r is None:
+            return stats
+        try:
+            pipe = r.pipeline(transaction=True)
+            pipe.set(KEY_USERS, stats["total_users"])
+            pipe.set(KEY_SESSIONS, stats["total_sessions"])
+            for key, values in ((KEY_BY_DAY, stats["by_day"]), (KEY_BY_LEVEL, stats["by_level"]),
+                                (KEY_BY_STAGE, stats["by_stage"])):
+                pipe.delete(key)
+                if values:
+                    pipe.hset(key, mapping=values)
+            pipe.set(KEY_RECONCILED_AT, stats["reconciled_at"])
+            pipe.execute()
+        except Exception as e:
+            redis_failed(e)
+        return stats
+
+    # ── internals ──────────────────────────────────────────────────────────
+    @staticmethod
+    def _count_session(pipe, session_date, level, topic):
+        day = (session_date or datetime.now()).strftime("%Y-%m-%d")
+        pipe.incr(KEY_SESSIONS)
+        pipe.hincrby(KEY_BY_DAY, day, 1)
+        pipe.hincrby(KEY_BY_LEVEL, level or "unknown", 1)
+        pipe.hincrby(KEY_BY_STAGE, session_stage(topic), 1)
+
+    @staticmethod
+    def _apply(write):
+        r = get_redis()
+        if r is None:
+            return
+        try:
+            pipe = r.pipeline(transaction=False)
+            write(pipe)
+            pipe.execute()
+        except Exception as e:
+            redis_failed(e)
+
+    def _read_counters(self):
+        r = get_redis()
+        if r is None:
+            return None
+        try:
+            pipe = r.pipeline(transaction=False)
+            pipe.get(KEY_USERS)
+            pipe.get(KEY_SESSIONS)
+            pipe.hgetall(KEY_BY_DAY)
+            pipe.hgetall(KEY_BY_LEVEL)
+            pipe.hgetall(KEY_BY_STAGE)
+            pipe.get(KEY_RECONCILED_AT)
+            users, sessions, by_day, by_level, by_stage, reconciled_at = pipe.execute()
+        except Exception as e:
+            redis_failed(e)
+            return None
+
+        stale = not reconciled_at or time.time() - float(reconciled_at) > STATS_RECONCILE_SECONDS
+        if users is None or sessions is None or stale:
+            # Only one worker rebuilds; the others keep serving the current values
+            try:
+                if r.set(KEY_RECONCILE_LOCK, 1, nx=True, ex=60):
+                    return self.reconcile()
+            except Exception as e:
+                redis_failed(e)
+            if users is None or sessions is None:
+                return None
+
+        cutoff = self._cutoff_day()
+        return {
+            "total_users": int(users),
+            "total_sessions": int(sessions),
+            "by_day": {d: int(c) for d, c in sorted(by_day.items()) if d >= cutoff and int(c) > 0},
+            "by_level": {k: int(v) for k, v in by_level.items() if int(v) > 0},
+            "by_stage": {k: int(v) for k, v in by_stage.items() if int(v) > 0},
+            "mode": "approx",
+            "reconciled_at": float(reconciled_at) if reconciled_at else None,
+        }
+
+    @staticmethod
+    def _cutoff_day():
+        return datetime.fromtimestamp(time.time() - STATS_DAYS * 86400).strftime("%Y-%m-%d")
+
+    def _exact_counts(self):
+        from database_con import GetExactStats
+        stats = GetExactStats(STATS_DAYS)
+        stats["by_stage"] = self._fold_stages(stats.pop("by_topic"))
+        stats["mode"] = "exact"
+        stats["reconciled_at"] = time.time()
+        return stats
+
+    @staticmethod
+    def _fold_stages(by_topic):
+        stages = {}
+        for topic, count in by_topic.items():
+            stage = session_stage(topic)
+            stages[stage] = stages.get(stage, 0) + count
+        return stages
+
+
+stats_counters = StatsCounters()
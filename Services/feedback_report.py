@@ -0,0 +1,37 @@
+import re
+import markdown
+
+# Same pattern as the feedback page used client-side: each per-question block of
+# the evaluation becomes a card before the markdown is rendered.
+BREAKDOWN_PATTERN = re.compile(
+    r"\*\*Question\*\*:([\s\S]*?)\*\*Feedback on Candidate's Answer\*\*:([\s\S]*?)"
+    r"\*\*HR Recommended Answer\*\*:([\s\S]*?)(?=\*\*Question|$|##)",
+    re.IGNORECASE,
+)
+
+# Blank lines around the card so Python-Markdown passes it through as an HTML block
+CARD_TEMPLATE = """
+
+<div class="q-card">
+    <div class="q-text"><i class="ph-bold ph-question"></i> {question}</div>
+    <div class="ans-feedback"><strong>Feedback:</strong> {feedback}</div>
+    <div class="hr-answer"><span class="hr-label">HR Recommended Answer</span>{answer}</div>
+</div>
+
+"""
+
+
+def render_feedback_html(report_md):
+    """Renders the evaluation markdown to the HTML the feedback page shows"""
+    carded = BREAKDOWN_PATTERN.sub(
+        lambda m: CARD_TEMPLATE.format(question=m.group(1).strip(), feedback=m.group(2).strip(),
+                                       answer=m.group(3).strip()),
+        report_md or "",
+    )
+    return markdown.markdown(carded, extensions=["extra", "sane_lists"])
+
+
+def compact_history(history):
+    """Keeps only the answered turns and the fields the feedback page displays"""
+    return [{"turn": index + 1, "question": turn["question"], "answer": turn["answer"]}
+            for index, turn in enumerate(history or []) if turn.get("question") and turn.get("answer")]
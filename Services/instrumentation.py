@@ -0,0 +1,167 @@
+import sys
+import time
+import functools
+import contextvars
+from prometheus_client import Counter, Histogram
+
+# Stage timings for the interview pipeline. `stage` is what ran (llm_call,
+# embedding, rq_wait, db, ...); `site` is where: the decorated function, or
+# for a nested span the enclosing span, e.g. llm_call{site="next_question"}.
+STAGE_SECONDS = Histogram(
+    "interview_stage_seconds", "Time spent per pipeline stage", ["stage", "site"],
+    buckets=(0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10, 20, 30, 60),
+)
+STAGE_ERRORS = Counter("interview_stage_errors_total", "Pipeline stages that raised", ["stage", "site"])
+LLM_TOKENS = Counter("llm_tokens_total", "LLM tokens by direction", ["model", "kind", "site"])
+LLM_DISPATCH = Counter(
+    "llm_dispatch_total", "How LLM calls were dispatched (local, rq, blocking, rq_timeout, rq_failed)", ["path"])
+CACHE_REQUESTS = Counter("cache_requests_total", "Cache lookups by outcome", ["cache", "outcome"])
+LLM_ADMISSION = Counter(
+    "llm_admission_total", "LLM route admission decisions (admitted, delayed, rejected_user, rejected_global, bypass)",
+    ["route", "outcome"])
+LLM_ADMISSION_WAIT = Histogram(
+    "llm_admission_wait_seconds", "Predicted wait at admission: slept when delayed, Retry-After when rejected",
+    ["route", "outcome"], buckets=(0.05, 0.1, 0.25, 0.5, 1, 2, 3, 5, 10, 30, 60))
+COMPRESSION_BYTES = Counter(
+    "http_compression_bytes_total", "Response bytes before (identity) and after compression", ["encoding", "stage"])
+
+_current_span = contextvars.ContextVar("current_span", default=None)
+_collector = contextvars.ContextVar("span_collector", default=None)
+
+
+class span:
+    """
+    Times a pipeline stage into STAGE_SECONDS. Works as a context manager
+
+        with span("embedding"):
+            ...
+
+    or as a decorator, where the site defaults to the function name:
+
+        @span("db")
+        def StoreSession(...): ...
+    """
+
+    def __init__(self, stage, site=None):
+        self.stage = stage
+        self.site = site
+        self._token = None
+        self._started = None
+        self._parent = None
+        self._children = 0.0    # time spent in nested spans, for exclusive timings
+
+    # ── context manager ───────────────────────────────────────────────────
+    def __enter__(self):
+        self._parent = _current_span.get()
+        if self.site is None:
+            self.site = self._parent.stage if self._parent else sys._getframe(1).f_code.co_name
+        self._token = _current_span.set(self)
+        self._started = time.perf_counter()
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        elapsed = time.perf_counter() - self._started
+        _current_span.reset(self._token)
+        STAGE_SECONDS.labels(stage=self.stage, site=self.site).observe(elapsed)
+        collector = _collector.get()
+        if collector is not None:
+            collector.add(self.stage, self._started, elapsed, max(0.0, elapsed - self._children))
+        if self._parent is not None:
+            self._parent._children += elapsed
+        if exc_type is not None:
+            STAGE_ERRORS.labels(stage=self.stage, site=self.site).inc()
+        return False
+
+    # ── decorator ─────────────────────────────────────────────────────────
+    def __call__(self, func):
+        stage, site = self.stage, self.site or func.__name__
+
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):
+            with span(stage, site):
+                return func(*args, **kwargs)
+        return wrapper
+
+
+class collect_spans:
+    """
+    Records every span that finishes inside the block, for per-request
+    timelines (see ActiveInterview.timings):
+
+        with collect_spans() as timeline:
+            ...
+        timeline.to_dict()
+    """
+
+    def __init__(self):
+        self.spans = []
+        self._token = None
+        self._started = None
+        self.started_at = None   # wall clock, for lining timelines up across requests
+        self.total = 0.0
+
+    def __enter__(self):
+        self.started_at = time.time()
+        self._started = time.perf_counter()
+        self._token = _collector.set(self)
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.total = time.perf_counter() - self._started
+        _collector.reset(self._token)
+        return False
+
+    def add(self, stage, started, elapsed, exclusive):
+        self.spans.append((stage, started - self._started, elapsed, exclusive))
+
+    def to_dict(self):
+        """
+        Compact form: total ms, per-stage exclusive ms (time not spent in a
+        nested span, so stages never add up to more than the total), plus
+        [stage, offset_ms, duration_ms] for the waterfall
+        """
+        total = self.total or time.perf_counter() - self._started
+        stages = {}
+        for stage, _, _, exclusive in self.spans:
+            stages[stage] = round(stages.get(stage, 0) + exclusive * 1000, 1)
+        return {
+            "total_ms": round(total * 1000, 1),
+            "stages": stages,
+            "spans": [[stage, round(offset * 1000, 1), round(elapsed * 1000, 1)]
+                      for stage, offset, elapsed, _ in sorted(self.spans, key=lambda s: s[1])],
+        }
+
+
+def current_site():
+    """Stage of the innermost open span, or None"""
+    parent = _current_span.get()
+    return parent.stage if parent else None
+
+
+def record_tokens(model, response):
+    """Counts prompt/completion tokens from a LangChain chat response, if it reports usage"""
+    usage = getattr(response, "usage_metadata", None) or {}
+    if not usage:
+        token_usage = (getattr(response, "response_metadata", None) or {}).get("token_usage") or {}
+        usage = {"input_tokens": token_usage.get("prompt_tokens"),
+                 "output_tokens": token_usage.get("completion_tokens")}
+    site = current_site() or "-"
+    for kind, key in (("prompt", "input_tokens"), ("completion", "output_tokens")):
+        if usage.get(key):
+            LLM_TOKENS.labels(model=model, kind=kind, site=site).inc(usage[key])
+
+
+def cache_outcome(cache, outcome):
+    """outcome: hit, miss, not_modified or error"""
+    CACHE_REQUESTS.labels(cache=cache, outcome=outcome).inc()
+
+
+def record_compression(encoding, before, after):
+    COMPRESSION_BYTES.labels(encoding=encoding, stage="identity").inc(before)
+    COMPRESSION_BYTES.labels(encoding=encoding, stage="compressed").inc(after)
+
+
+def record_admission(route, outcome, wait=None):
+    LLM_ADMISSION.labels(route=route, outcome=outcome).inc()
+    if wait is not None:
+        LLM_ADMISSION_WAIT.labels(route=route, outcome=outcome).observe(wait)
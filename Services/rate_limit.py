@@ -0,0 +1,160 @@
+import os
+import math
+import time
+import logging
+from functools import wraps
+from flask import jsonify, session
+from dotenv import load_dotenv
+from Services.cache import get_redis, redis_failed
+from Services.instrumentation import record_admission
+
+load_dotenv()
+logger = logging.getLogger(__name__)
+
+# Rates are LLM calls per minute; one call on /hr-questions costs 1 token,
+# bigger prompts cost more (see the llm_admission() calls in app.py).
+LLM_USER_RATE = float(os.getenv("LLM_USER_RATE") or 20)
+LLM_USER_BURST = float(os.getenv("LLM_USER_BURST") or 8)
+# Size the global bucket to the Groq quota, so bursts queue here instead of
+# in GroqChatService's semaphore and the RQ fallback
+LLM_GLOBAL_RATE = float(os.getenv("LLM_GLOBAL_RATE") or 600)
+LLM_GLOBAL_BURST = float(os.getenv("LLM_GLOBAL_BURST") or 60)
+# A request that would wait longer than this for the global bucket is shed
+# with 429 + Retry-After rather than queued; a user over their own bucket is
+# never queued
+LLM_ADMISSION_DEADLINE = float(os.getenv("LLM_ADMISSION_DEADLINE") or 3)
+
+# Token buckets for every key in one round trip. Both buckets are checked
+# before either is charged, so a request shed by the global bucket costs the
+# user nothing. A bucket may go negative by up to rate * max_wait: that debt
+# is the predicted queueing delay, which the caller sleeps off. Redis TIME
+# keeps web hosts with skewed clocks on one timeline.
+#   KEYS: bucket hashes
+#   ARGV: cost, then per key: rate (tokens/s), burst, max_wait (ms)
+#   ->   {admitted (0/1), wait_ms, index of the bucket that refused (0 if none)}
+TOKEN_BUCKET_LUA = """
+local now_parts = redis.call('TIME')
+local now = tonumber(now_parts[1]) * 1000 + math.floor(tonumber(now_parts[2]) / 1000)
+local cost = tonumber(ARGV[1])
+local after, wait = {}, 0
+for i, key in ipairs(KEYS) do
+  local rate = tonumber(ARGV[i * 3 - 1])
+  local burst = tonumber(ARGV[i * 3])
+  local max_wait = tonumber(ARGV[i * 3 + 1])
+  local state = redis.call('HMGET', key, 'tokens', 'ts')
+  local tokens = tonumber(state[1]) or burst
+  local ts = tonumber(state[2]) or now
+  tokens = math.min(burst, tokens + math.max(0, now - ts) * rate / 1000)
+  local left = tokens - cost
+  local w = 0
+  if left < 0 then w = -left / rate * 1000 end
+  if w > max_wait then
+    return {0, math.ceil(w), i}
+  end
+  after[i] = left
+  if w > wait then wait = w end
+end
+for i, key in ipairs(KEYS) do
+  local rate = tonumber(ARGV[i * 3 - 1])
+  local burst = tonumber(ARGV[i * 3])
+  local max_wait = tonumber(ARGV[i * 3 + 1])
+  redis.call('HSET', key, 'tokens', tostring(after[i]), 'ts', now)
+  redis.call('PEXPIRE', key, math.ceil((burst / rate) * 1000 + max_wait) + 1000)
+end
+return {1, math.ceil(wait), 0}
+"""
+
+
+class Admission:
+    __slots__ = ("admitted", "wait", "limited_by")
+
+    def __init__(self, admitted, wait=0.0, limited_by=None):
+        self.admitted = admitted
+        self.wait = wait                # seconds to sleep (admitted) or until a retry can pass (refused)
+        self.limited_by = limited_by    # "user" | "global" when refused
+
+
+class LLMAdmission:
+    """
+    Per-user and global token buckets in Redis for LLM-backed routes. One
+    EVALSHA per request, so it is cheap enough to run before any DB or LLM
+    work. Without Redis every request is admitted.
+    """
+
+    def __init__(self):
+        self._script = None
+        self._script_client = None
+
+    def _bucket_script(self, r):
+        if self._script is None or self._script_client is not r:
+            self._script = r.register_script(TOKEN_BUCKET_LUA)
+            self._script_client = r
+        return self._script
+
+    def check(self, user_id, cost=1):
+        r = get_redis()
+        if r is None:
+            return None
+        keys = [f"rl:llm:user:{user_id}", "rl:llm:global"]
+        args = [cost,
+                LLM_USER_RATE / 60, LLM_USER_BURST, 0,
+                LLM_GLOBAL_RATE / 60, LLM_GLOBAL_BURST, LLM_ADMISSION_DEADLINE * 1000]
+        try:
+            admitted, wait_ms, refused = self._bucket_script(r)(keys=keys, args=args)
+        except Exception as e:
+            redis_failed(e)
+            return None
+        if admitted:
+            return Admission(True, wait_ms / 1000)
+        return Admission(False, wait_ms / 1000, ("user", "global")[int(refused) - 1])
+
+
+llm_admission_control = LLMAdmission()
+
+
+def llm_admission(route, cost=1):
+    """
+    Admits a request to an LLM-backed view, sleeping off a short predicted
+    queueing delay and answering 429 with Retry-After past the deadline.
+    Goes under @login_required, above anything that touches the DB.
+    """
+    def decorator(view):
+        @wraps(view)
+        def wrapper(*args, **kwargs):
+            decision = llm_admission_control.check(session.get("user_id"), cost)
+            if decision is None:
+                record_admission(route, "bypass")
+                return view(*args, **kwargs)
+            if not decision.admitted:
+                record_admission(route, f"rejected_{decision.limited_by}", decision.wait)
+                retry_after = max(1, math.ceil(decision.wait))
+                message = ("You are sending requests too quickly." if decision.limited_by == "user"
+                           else "The interviewer is busy right now.")
+                body = {"error": "Too Many Requests", "message": f"{message} Please retry in {retry_after}s.",
+                        "retry_after": retry_after}
+                return jsonify(body), 429, {"Retry-After": str(retry_after)}
+            if decision.wait > 0:
+                record_admission(route, "delayed", decision.wait)
+                time.sleep(decision.wait)
+            else:
+                record_admission(route, "admitted", 0.0)
+            return view(*args, **kwargs)
+        return wrapper
+    return decorator
+
+
+def admit_background(route, cost=1):
+    """
+    Admission for LLM work a view queues instead of waiting on: True to queue
+    it now, False to leave it for later. Never sleeps and never answers 429,
+    so the view's own writes always go through.
+    """
+    decision = llm_admission_control.check(session.get("user_id"), cost)
+    if decision is None:
+        record_admission(route, "bypass")
+        return True
+    if not decision.admitted:
+        record_admission(route, f"rejected_{decision.limited_by}", decision.wait)
+        return False
+    record_admission(route, "delayed" if decision.wait > 0 else "admitted", decision.wait)
+    return True
@@ -0,0 +1,152 @@
+import os
+import uuid
+import hashlib
+import logging
+from functools import wraps
+from flask import g, request, session, make_response, Response
+from dotenv import load_dotenv
+from Services.cache import get_redis, redis_failed
+from Services.instrumentation import cache_outcome
+from Services.compression import cache_compressed
+
+load_dotenv()
+logger = logging.getLogger(__name__)
+
+RESPONSE_CACHE_TTL = int(os.getenv("RESPONSE_CACHE_TTL") or 300)
+RESPONSE_CACHE_MAX_BYTES = int(os.getenv("RESPONSE_CACHE_MAX_BYTES") or 256 * 1024)
+
+# Version scopes, each bumped by the database_con.py helpers that write it:
+#   sessions  interview_sessions rows (StoreSession, FinishSession)
+#   streak    daily attempts and streak (StartDailyAttempt, UpdateStreak)
+#   resume    users.resume_text (SaveUserResume)
+SCOPES = ("sessions", "streak", "resume")
+
+
+def _version_key(user_id, scope):
+    return f"ver:{user_id}:{scope}"
+
+
+def version_keys(user_id, scopes):
+    """Redis keys of a user's version tokens, for callers that MGET them with their own keys"""
+    return [_version_key(user_id, scope) for scope in scopes]
+
+
+def get_version(user_id, scope):
+    """Current version token of a user's scope, created on first use; None without Redis"""
+    r = get_redis()
+    if r is None:
+        return None
+    key = _version_key(user_id, scope)
+    try:
+        version = r.get(key)
+        if version is None:
+            r.set(key, uuid.uuid4().hex[:12], nx=True)
+            version = r.get(key)
+        return version
+    except Exception as e:
+        redis_failed(e)
+        return None
+
+
+def bump_version(user_id, *scopes):
+    """
+    Invalidates ETags and cached responses for the given scopes. Register it
+    with on_commit() so readers never see the new version before the data.
+    """
+    r = get_redis()
+    if r is None or user_id is None:
+        return
+    try:
+        pipe = r.pipeline(transaction=False)
+        for scope in scopes:
+            # Random rather than INCR: an evicted key must not reissue an old version
+            pipe.set(_version_key(user_id, scope), uuid.uuid4().hex[:12])
+        pipe.execute()
+    except Exception as e:
+        redis_failed(e)
+
+
+def skip_response_cache():
+    """Called by a versioned view whose response is still changing (e.g. feedback being generated)"""
+    g.skip_response_cache = True
+
+
+def _cacheable(response):
+    return (response.status_code == 200 and response.mimetype == "application/json"
+            and not g.get("skip_response_cache"))
+
+
+def _cache_key(user_id, etag):
+    # v2: entries start with a one-character flag (see _IMMUTABLE)
+    return f"resp2:{user_id}:{etag}"
+
+
+# Marks a cached body whose view called cache_compressed(), so a hit is
+# served from the compressed cache just like the view's own response
+_IMMUTABLE, _MUTABLE = "i", "m"
+
+
+def versioned(scope, vary=None):
+    """
+    Conditional GET for a per-user JSON view. The ETag is the user's version
+    token for scope plus a digest of the URL, so an If-None-Match hit is
+    answered with 304 before the view (and its queries) run, and an unchanged
+    body is served from a short-lived Redis copy. Without Redis the view always
+    runs and the ETag falls back to a hash of the body.
+
+    vary() may return a string for inputs no write bumps, such as the date for
+    views that report "today".
+    """
+    def decorator(view):
+        @wraps(view)
+        def wrapper(*args, **kwargs):
+            user_id = session.get("user_id")
+            version = get_version(user_id, scope) if user_id is not None else None
+            if version is None:
+                response = make_response(view(*args, **kwargs))
+                if _cacheable(response):
+                    response.set_etag(hashlib.md5(response.get_data()).hexdigest(), weak=True)
+                    response.headers["Cache-Control"] = "private, no-cache"
+                    response.make_conditional(request)
+                return response
+
+            extra = vary() if vary else ""
+            digest = hashlib.sha1(f"{request.full_path}|{extra}".encode()).hexdigest()[:12]
+            etag = f"{scope}.{version}.{digest}"
+            if request.if_none_match.contains_weak(etag):
+                cache_outcome("response", "not_modified")
+                response = Response(status=304)
+                response.set_etag(etag, weak=True)
+                response.headers["Cache-Control"] = "private, no-cache"
+                return response
+
+            r = get_redis()
+            body = None
+            if r is not None:
+                try:
+                    body = r.get(_cache_key(user_id, etag))
+                except Exception as e:
+                    redis_failed(e)
+            if body is not None:
+                cache_outcome("response", "hit")
+                if body[:1] == _IMMUTABLE:
+                    cache_compressed()
+                response = Response(body[1:], mimetype="application/json")
+            else:
+                cache_outcome("response", "miss")
+                response = make_response(view(*args, **kwargs))
+                if not _cacheable(response):
+                    return response
+                data = response.get_data(as_text=True)
+                if r is not None and len(data) <= RESPONSE_CACHE_MAX_BYTES:
+                    try:
+                        flag = _IMMUTABLE if g.get("cache_compressed") else _MUTABLE
+                        r.set(_cache_key(user_id, etag), flag + data, ex=RESPONSE_CACHE_TTL)
+                    except Exception as e:
+                        redis_failed(e)
+
+            response.set_etag(etag, weak=True)
+            response.headers["Cache-Control"] = "private, no-cache"
+            return response
+        return wrapper
+    return decorator
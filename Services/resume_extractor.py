@@ -0,0 +1,250 @@
+import os
+import json
+import uuid
+import signal
+import hashlib
+import logging
+import resource
+import tempfile
+import threading
+import multiprocessing
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from dotenv import load_dotenv
+from Services.cache import get_redis, redis_failed
+from Services.instrumentation import cache_outcome
+
+load_dotenv()
+logger = logging.getLogger(__name__)
+
+RESUME_MAX_BYTES = int(os.getenv("RESUME_MAX_BYTES") or 5 * 1024 * 1024)
+RESUME_MAX_PAGES = int(os.getenv("RESUME_MAX_PAGES") or 20)       # pages beyond this are ignored
+RESUME_CPU_SECONDS = int(os.getenv("RESUME_CPU_SECONDS") or 10)   # CPU budget per document
+RESUME_TIMEOUT = int(os.getenv("RESUME_TIMEOUT") or 20)           # wall-clock budget per document
+RESUME_WORKERS = int(os.getenv("RESUME_WORKERS") or 2)
+RESUME_CACHE_TTL = int(os.getenv("RESUME_CACHE_TTL") or 7 * 86400)
+RESUME_JOB_TTL = int(os.getenv("RESUME_JOB_TTL") or 3600)
+
+CHUNK_SIZE = 64 * 1024
+
+
+class ResumeTooLarge(ValueError):
+    pass
+
+
+class NotAPdf(ValueError):
+    pass
+
+
+# ── CHILD PROCESS ──────────────────────────────────────────────────────────
+def _on_timeout(signum, frame):
+    raise TimeoutError(f"PDF extraction exceeded {RESUME_TIMEOUT}s")
+
+
+def extract_pdf_text(path, max_pages=RESUME_MAX_PAGES, cpu_seconds=RESUME_CPU_SECONDS, timeout=RESUME_TIMEOUT):
+    """
+    Runs in a pool process. The CPU cap is an RLIMIT_CPU soft limit on top of
+    what this process already used (workers are reused), so a runaway document
+    gets the process killed by SIGXCPU; the wall-clock cap is a SIGALRM.
+    """
+    import PyPDF2
+
+    usage = resource.getrusage(resource.RUSAGE_SELF)
+    used = int(usage.ru_utime + usage.ru_stime) + 1
+    soft, hard = resource.getrlimit(resource.RLIMIT_CPU)
+    resource.setrlimit(resource.RLIMIT_CPU, (used + cpu_seconds, hard))
+    signal.signal(signal.SIGALRM, _on_timeout)
+    signal.alarm(timeout)
+    try:
+        reader = PyPDF2.PdfReader(path)
+        total = len(reader.pages)
+        texts = []
+        for page in reader.pages[:max_pages]:
+            texts.append(page.extract_text() or "")
+        return {"text": "\n".join(texts) + "\n", "pages": total, "truncated": total > max_pages}
+    finally:
+        signal.alarm(0)
+        resource.setrlimit(resource.RLIMIT_CPU, (soft, hard))
+
+
+# ── SERVICE ────────────────────────────────────────────────────────────────
+class ResumeExtractionService:
+    """
+    Extracts resume text from uploaded PDFs outside the request worker.
+
+    Uploads are streamed to a temp file while hashing; text is cached in Redis
+    by SHA-256, so re-uploading the same file is instant. Misses go to a small
+    process pool and the client polls job_status(). Without Redis there is
+    nowhere to share job state between gunicorn workers, so extraction runs
+    synchronously (still in the pool, still capped).
+    """
+
+    def __init__(self, workers=RESUME_WORKERS):
+        self.workers = workers
+        self._pool = None
+        self._pool_pid = None
+        self._lock = threading.Lock()
+
+    def _get_pool(self):
+        with self._lock:
+            if self._pool is None or self._pool_pid != os.getpid():
+                # A pool inherited through fork (gunicorn --preload) belongs to the parent
+                self._pool_pid = os.getpid()
+                # fork, not spawn: spawn would re-import the app entry module in every
+                # child. The children only run extract_pdf_text (no logging, DB or Redis).
+                self._pool = ProcessPoolExecutor(max_workers=self.workers,
+                                                 mp_context=multiprocessing.get_context("fork"))
+            return self._pool
+
+    def _reset_pool(self, pool):
+        """A worker killed by its CPU limit breaks the whole executor; start a fresh one"""
+        with self._lock:
+            if self._pool is pool:
+                self._pool = None
+        pool.shutdown(wait=False, cancel_futures=True)
+
+    @staticmethod
+    def spool_upload(file_storage):
+        """Copies the upload to a temp file in chunks; returns (path, sha256)"""
+        digest = hashlib.sha256()
+        size = 0
+        tmp = tempfile.NamedTemporaryFile(prefix="resume-", suffix=".pdf", delete=False)
+        try:
+            with tmp:
+                first = True
+                while True:
+                    chunk = file_storage.stream.read(CHUNK_SIZE)
+                    if not chunk:
+                        break
+                    if first and not chunk.startswith(b"%PDF-"):
+                        raise NotAPdf("File is not a PDF")
+                    first = False
+                    size += len(chunk)
+                    if size > RESUME_MAX_BYTES:
+                        raise ResumeTooLarge(f"Resume exceeds {RESUME_MAX_BYTES // (1024 * 1024)} MB")
+                    digest.update(chunk)
+                    tmp.write(chunk)
+            return tmp.name, digest.hexdigest()
+        except Exception:
+            os.unlink(tmp.name)
+            raise
+
+    def submit(self, user_id, file_storage, on_done):
+        """
+        Starts extracting an uploaded PDF. on_done(user_id, text) is called
+        once the text is known, from whichever thread produced it.
+        Returns a job dict: {"job_id", "status", "resume_text"?, ...}.
+        """
+        path, sha = self.spool_upload(file_storage)
+        cached = self._cached_text(sha)
+        cache_outcome("resume_text", "miss" if cached is None else "hit")
+        if cached is not None:
+            os.unlink(path)
+            on_done(user_id, cached)
+            return {"job_id": None, "status": "done", "resume_text": cached}
+
+        r = get_redis()
+        if r is None:
+            return self._run_sync(user_id, path, sha, on_done)
+
+        job_id = uuid.uuid4().hex
+        job = {"job_id": job_id, "status": "pending", "user_id": user_id}
+        if not self._save_job(job):
+            return self._run_sync(user_id, path, sha, on_done)
+
+        pool = self._get_pool()
+        try:
+            future = pool.submit(extract_pdf_text, path)
+        except BrokenProcessPool:
+            self._reset_pool(pool)
+            pool = self._get_pool()
+            future = pool.submit(extract_pdf_text, path)
+        future.add_done_callback(lambda f: self._finish(f, pool, job, path, sha, on_done))
+        return {"job_id": job_id, "status": "pending"}
+
+    def job_status(self, job_id, user_id):
+        """Returns the job dict, or None if unknown, expired or owned by someone else"""
+        r = get_redis()
+        if r is None:
+            return None
+        try:
+            raw = r.get(f"resume:job:{job_id}")
+        except Exception as e:
+            redis_failed(e)
+            return None
+        job = json.loads(raw) if raw else None
+        if not job or job.get("user_id") != user_id:
+            return None
+        return job
+
+    # ── internals ──────────────────────────────────────────────────────────
+    def _run_sync(self, user_id, path, sha, on_done):
+        pool = self._get_pool()
+        try:
+            result = pool.submit(extract_pdf_text, path).result(timeout=RESUME_TIMEOUT + 5)
+        except BrokenProcessPool:
+            self._reset_pool(pool)
+            raise
+        finally:
+            os.unlink(path)
+        self._cache_text(sha, result["text"])
+        on_done(user_id, result["text"])
+        return {"job_id": None, "status": "done", "resume_text": result["text"],
+                "pages": result["pages"], "truncated": result["truncated"]}
+
+    def _finish(self, future, pool, job, path, sha, on_done):
+        try:
+            os.unlink(path)
+        except OSError:
+            pass
+        try:
+            result = future.result()
+            self._cache_text(sha, result["text"])
+            on_done(job["user_id"], result["text"])
+            job.update(status="done", resume_text=result["text"], pages=result["pages"],
+                       truncated=result["truncated"])
+        except BrokenProcessPool:
+            self._reset_pool(pool)
+            job.update(status="failed", error="The PDF was too complex to process.")
+        except TimeoutError:
+            job.update(status="failed", error="The PDF took too long to process.")
+        except Exception as e:
+            logger.error(f"PDF extract error for user {job['user_id']}: {e}")
+            job.update(status="failed", error="Could not read this PDF.")
+        self._save_job(job)
+
+    @staticmethod
+    def _save_job(job):
+        r = get_redis()
+        if r is None:
+            return False
+        try:
+            r.set(f"resume:job:{job['job_id']}", json.dumps(job), ex=RESUME_JOB_TTL)
+            return True
+        except Exception as e:
+            redis_failed(e)
+            return False
+
+    @staticmethod
+    def _cached_text(sha):
+        r = get_redis()
+        if r is None:
+            return None
+        try:
+            return r.get(f"resume:text:{sha}")
+        except Exception as e:
+            redis_failed(e)
+            return None
+
+    @staticmethod
+    def _cache_text(sha, text):
+        r = get_redis()
+        if r is None:
+            return
+        try:
+            r.set(f"resume:text:{sha}", text, ex=RESUME_CACHE_TTL)
+        except Exception as e:
+            redis_failed(e)
+
+
+resume_extractor = ResumeExtractionService()
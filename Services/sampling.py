@@ -0,0 +1,224 @@
+import os
+import time
+import random
+import logging
+import threading
+from datetime import datetime
+from urllib.parse import urlsplit
+from dotenv import load_dotenv
+from prometheus_client import Counter
+from Services.cache import get_redis, redis_failed
+
+load_dotenv()
+logger = logging.getLogger(__name__)
+
+# Route rules: "path-prefix=rate[:slow_ms]", comma separated. The longest
+# matching prefix wins; "default" applies to everything else.
+DEFAULT_ROUTE_RATES = (
+    "/health=0,/livez=0,/readyz=0,/metrics=0,/check-login=0,/static=0,/favicon.ico=0,/.well-known=0,"
+    "/hr-questions=0.2:15000,/submit-answer=0.2:15000,/api/hr-chat=0.2:15000,"
+    "/finish-interview=0.5:30000,default=0.05"
+)
+SAMPLING_REDIS_KEY = "sentry:sampling"     # live overrides: HSET sentry:sampling /api/progress 0.5 ...
+SAMPLING_REFRESH_SECONDS = float(os.getenv("SENTRY_SAMPLING_REFRESH") or 30)
+
+SAMPLING_DECISIONS = Counter(
+    "sentry_transactions_total", "Recorded transactions by tail sampling decision", ["decision"])
+
+
+def parse_rules(spec):
+    """'/a=0.5:2000,default=0.1' -> {'/a': (0.5, 2000), 'default': (0.1, None)}"""
+    rules = {}
+    for item in (spec or "").split(","):
+        if "=" not in item:
+            continue
+        prefix, value = item.split("=", 1)
+        rate, _, slow_ms = value.partition(":")
+        try:
+            rules[prefix.strip()] = (float(rate), int(slow_ms) if slow_ms else None)
+        except ValueError:
+            logger.warning(f"Ignoring bad sampling rule {item!r}")
+    return rules
+
+
+class TokenBucket:
+    """Allows `rate_per_minute` events per minute with bursts up to one minute's worth"""
+
+    def __init__(self, rate_per_minute):
+        self.lock = threading.Lock()
+        self.set_rate(rate_per_minute)
+
+    def set_rate(self, rate_per_minute):
+        with self.lock:
+            self.capacity = float(rate_per_minute)
+            self.tokens = self.capacity
+            self.updated = time.monotonic()
+
+    def take(self):
+        with self.lock:
+            now = time.monotonic()
+            self.tokens = min(self.capacity, self.tokens + (now - self.updated) * self.capacity / 60)
+            self.updated = now
+            if self.tokens >= 1:
+                self.tokens -= 1
+                return True
+            return False
+
+
+class AdaptiveSampler:
+    """
+    Sentry sampling hooks.
+
+    Head: traces_sampler records a route with probability `record_rate` (or not
+    at all when its base rate is 0, e.g. /health and /metrics scrapes).
+    Tail: before_send_transaction always keeps 5xx and slow transactions and
+    keeps the rest with probability base_rate / record_rate, so the effective
+    rate for healthy traffic is the route's base rate. Two token buckets cap
+    what is sent per process: one for normal samples, a larger one for the
+    errors and slow requests. profiles_sampler profiles a fraction of the
+    recorded transactions on routes with a non-zero rate.
+
+    Rates come from env at boot and are re-read from the SAMPLING_REDIS_KEY
+    hash every SAMPLING_REFRESH_SECONDS, so they can be tuned live. Hash fields
+    are route prefixes or one of: default, record_rate, profiles_rate,
+    slow_ms, budget_per_minute, tail_budget_per_minute.
+    """
+
+    def __init__(self):
+        self.env_rules = parse_rules(os.getenv("SENTRY_ROUTE_RATES") or DEFAULT_ROUTE_RATES)
+        self.env_settings = {
+            "record_rate": float(os.getenv("SENTRY_RECORD_RATE") or 1.0),
+            "profiles_rate": float(os.getenv("SENTRY_PROFILES_RATE") or 0.1),
+            "slow_ms": float(os.getenv("SENTRY_SLOW_MS") or 3000),
+            "budget_per_minute": float(os.getenv("SENTRY_TRACES_PER_MINUTE") or 60),
+            "tail_budget_per_minute": float(os.getenv("SENTRY_TAIL_TRACES_PER_MINUTE") or 120),
+        }
+        self.rules = dict(self.env_rules)
+        self.settings = dict(self.env_settings)
+        self.budget = TokenBucket(self.settings["budget_per_minute"])
+        self.tail_budget = TokenBucket(self.settings["tail_budget_per_minute"])
+        self._refreshed_at = 0.0
+        self._refresh_lock = threading.Lock()
+        self._prefixes = self._sorted_prefixes()
+
+    # ── configuration ─────────────────────────────────────────────────────
+    def _sorted_prefixes(self):
+        return sorted((p for p in self.rules if p != "default"), key=len, reverse=True)
+
+    def refresh(self, force=False):
+        """Re-reads overrides from Redis at most every SAMPLING_REFRESH_SECONDS"""
+        now = time.monotonic()
+        if not force and now - self._refreshed_at < SAMPLING_REFRESH_SECONDS:
+            return
+        # One thread refreshes; the others keep sampling with the current rules
+        if not self._refresh_lock.acquire(blocking=False):
+            return
+        try:
+            self._refreshed_at = now
+            self._refresh()
+        finally:
+            self._refresh_lock.release()
+
+    def _refresh(self):
+        r = get_redis()
+        if r is None:
+            return
+        try:
+            overrides = r.hgetall(SAMPLING_REDIS_KEY)
+        except Exception as e:
+            redis_failed(e)
+            return
+
+        rules, settings = dict(self.env_rules), dict(self.env_settings)
+        for field, value in overrides.items():
+            if field in settings:
+                try:
+                    settings[field] = float(value)
+                except ValueError:
+                    logger.warning(f"Ignoring bad sampling setting {field}={value!r}")
+            else:
+                rules.update(parse_rules(f"{field}={value}"))
+
+        if settings["budget_per_minute"] != self.settings["budget_per_minute"]:
+            self.budget.set_rate(settings["budget_per_minute"])
+        if settings["tail_budget_per_minute"] != self.settings["tail_budget_per_minute"]:
+            self.tail_budget.set_rate(settings["tail_budget_per_minute"])
+        self.rules, self.settings = rules, settings
+        self._prefixes = self._sorted_prefixes()
+
+    def rule_for(self, path):
+        """(base_rate, slow_ms) for a request path"""
+        rules = self.rules  # a concurrent refresh() may swap rules and prefixes between reads
+        for prefix in self._prefixes:
+            if path.startswith(prefix) and prefix in rules:
+                rate, slow_ms = rules[prefix]
+                break
+        else:
+            rate, slow_ms = rules.get("default", (0.0, None))
+        return rate, slow_ms if slow_ms is not None else self.settings["slow_ms"]
+
+    def record_rate(self, base_rate):
+        return 0.0 if base_rate <= 0 else max(base_rate, self.settings["record_rate"])
+
+    # ── sentry hooks ──────────────────────────────────────────────────────
+    @staticmethod
+    def _path(sampling_context):
+        environ = sampling_context.get("wsgi_environ") or {}
+        if environ:
+            return environ.get("PATH_INFO", "")
+        return (sampling_context.get("transaction_context") or {}).get("name", "")
+
+    def traces_sampler(self, sampling_context):
+        self.refresh()
+        parent = sampling_context.get("parent_sampled")
+        if parent is not None:
+            return float(parent)  # keep distributed traces whole
+        base_rate, _ = self.rule_for(self._path(sampling_context))
+        return self.record_rate(base_rate)
+
+    def profiles_sampler(self, sampling_context):
+        base_rate, _ = self.rule_for(self._path(sampling_context))
+        return self.settings["profiles_rate"] if base_rate > 0 else 0.0
+
+    def before_send_transaction(self, event, hint):
+        path = urlsplit((event.get("request") or {}).get("url", "")).path
+        base_rate, slow_ms = self.rule_for(path)
+
+        if self._is_error(event) or self._duration_ms(event) >= slow_ms:
+            keep, decision = self.tail_budget.take(), "tail"
+        else:
+            record_rate = self.record_rate(base_rate)
+            keep = record_rate > 0 and random.random() < base_rate / record_rate and self.budget.take()
+            decision = "sampled"
+
+        SAMPLING_DECISIONS.labels(decision=decision if keep else "dropped").inc()
+        return event if keep else None
+
+    @staticmethod
+    def _seconds(value):
+        """Event timestamps arrive serialized (ISO strings), but accept datetimes and floats too"""
+        if isinstance(value, datetime):
+            return value.timestamp()
+        if isinstance(value, str):
+            return datetime.fromisoformat(value.replace("Z", "+00:00")).timestamp()
+        return float(value)
+
+    def _duration_ms(self, event):
+        try:
+            return (self._seconds(event["timestamp"]) - self._seconds(event["start_timestamp"])) * 1000
+        except (KeyError, TypeError, ValueError):
+            return 0.0
+
+    @staticmethod
+    def _is_error(event):
+        trace = (event.get("contexts") or {}).get("trace") or {}
+        code = (event.get("tags") or {}).get("http.status_code") or (trace.get("data") or {}).get("http.response.status_code")
+        try:
+            if code is not None:
+                return int(code) >= 500
+        except (TypeError, ValueError):
+            pass
+        return trace.get("status") in ("internal_error", "unknown_error", "unavailable", "deadline_exceeded", "data_loss")
+
+
+sampler = AdaptiveSampler()
@@ -0,0 +1,370 @@
+import os
+import json
+import time
+import uuid
+import logging
+import threading
+import redis
+from flask.json.tag import TaggedJSONSerializer
+from flask.sessions import SessionInterface, SessionMixin
+from itsdangerous import BadSignature, Signer
+from werkzeug.datastructures import CallbackDict
+from dotenv import load_dotenv
+from Services.cache import REDIS_URL
+
+load_dotenv()
+logger = logging.getLogger(__name__)
+
+SESSION_KEY_PREFIX = os.getenv("SESSION_KEY_PREFIX", "session:")
+# Sessions get their own client: the cache client backs off for
+# REDIS_RETRY_AFTER after any cache timeout, which would log everyone out.
+# A session read is worth waiting a little longer for than a cache hit.
+SESSION_REDIS_URL = os.getenv("SESSION_REDIS_URL") or REDIS_URL
+SESSION_REDIS_TIMEOUT = float(os.getenv("SESSION_REDIS_TIMEOUT") or 1.0)
+# After a failure, requests get 503 at once for this long instead of each
+# waiting out the timeout
+SESSION_RETRY_AFTER = float(os.getenv("SESSION_RETRY_AFTER") or 2)
+
+# Fields that can be arbitrarily large (a pasted multi-page resume or JD).
+# Each one lives in its own Redis key and is only fetched when a view reads it.
+LARGE_FIELDS = ("resume_text", "jd_text")
+
+
+class SessionStoreUnavailable(Exception):
+    """The session store could not be reached; answered with 503, never with an anonymous session"""
+
+
+class RedisSession(CallbackDict, SessionMixin):
+    """
+    Session dict backed by Redis. Nothing is read from Redis until a view
+    touches the session, and fields in LARGE_FIELDS are only fetched when
+    they are read themselves, so most requests cost one small GET or none.
+    """
+
+    def __init__(self, store, sid, new=False):
+        def on_update(self):
+            self.modified = True
+            self.accessed = True
+
+        super().__init__(on_update=on_update)
+        self.store = store
+        self.sid = sid
+        self.new = new
+        self.modified = False
+        self.accessed = False
+        self.loaded = new
+        self.lazy = set()       # large fields stored in Redis, not fetched yet
+        self.dirty = set()      # large fields to write on save
+        self.deleted = set()    # large fields to delete on save
+
+    # ── loading ────────────────────────────────────────────────────────────
+    def _load(self):
+        self.accessed = True
+        if self.loaded:
+            return
+        data, lazy = self.store.load(self.sid)
+        self.loaded = True
+        dict.update(self, data)
+        self.lazy = set(lazy)
+
+    def _fetch(self, key):
+        self._load()
+        if key in self.lazy:
+            self.lazy.discard(key)
+            value = self.store.load_field(self.sid, key)
+            if value is not None:
+                dict.__setitem__(self, key, value)
+
+    def _fetch_all(self):
+        for key in list(self.lazy):
+            self._fetch(key)
+
+    def large_fields(self):
+        """Large fields currently set, fetched or not"""
+        self._load()
+        return self.lazy | {k for k in LARGE_FIELDS if dict.__contains__(self, k)}
+
+    # ── reads ──────────────────────────────────────────────────────────────
+    def __getitem__(self, key):
+        self._fetch(key)
+        return super().__getitem__(key)
+
+    def get(self, key, default=None):
+        self._fetch(key)
+        return super().get(key, default)
+
+    def __contains__(self, key):
+        self._load()
+        return key in self.lazy or super().__contains__(key)
+
+    def __iter__(self):
+        self._load()
+        return iter(list(super().keys()) + sorted(self.lazy))
+
+    def __len__(self):
+        self._load()
+        return super().__len__() + len(self.lazy)
+
+    def keys(self):
+        return list(iter(self))
+
+    def items(self):
+        self._fetch_all()
+        return super().items()
+
+    def values(self):
+        self._fetch_all()
+        return super().values()
+
+    def copy(self):
+        self._fetch_all()
+        return dict(super().items())
+
+    # ── writes ─────────────────────────────────────────────────────────────
+    def __setitem__(self, key, value):
+        self._load()
+        self.lazy.discard(key)
+        if key in LARGE_FIELDS:
+            self.dirty.add(key)
+            self.deleted.discard(key)
+        super().__setitem__(key, value)
+
+    def __delitem__(self, key):
+        self._fetch(key)
+        super().__delitem__(key)
+        self._forget(key)
+
+    def setdefault(self, key, default=None):
+        self._fetch(key)
+        if not super().__contains__(key):
+            self[key] = default
+        return super().__getitem__(key)
+
+    def pop(self, key, *default):
+        self._fetch(key)
+        value = super().pop(key, *default)
+        self._forget(key)
+        return value
+
+    def update(self, *args, **kwargs):
+        for key, value in dict(*args, **kwargs).items():
+            self[key] = value
+
+    def clear(self):
+        self._load()
+        self.deleted |= self.large_fields()
+        self.lazy.clear()
+        self.dirty.clear()
+        super().clear()
+
+    # ── identity ───────────────────────────────────────────────────────────
+    def regenerate(self):
+        """
+        Moves the data to a fresh session id and deletes the old record, so a
+        sid planted before login is worthless after it (session fixation).
+        """
+        self._load()
+        self._fetch_all()
+        self.store.delete(self.sid)
+        self.sid = uuid.uuid4().hex
+        self.new = True
+        self.modified = True
+        self.dirty = {k for k in LARGE_FIELDS if dict.__contains__(self, k)}
+        self.deleted.clear()
+
+    def _forget(self, key):
+        if key in LARGE_FIELDS:
+            self.dirty.discard(key)
+            self.deleted.add(key)
+
+
+class RedisSessionStore:
+    """
+    Reads and writes session records on a Redis client of its own. Every
+    Redis error raises SessionStoreUnavailable: a missing record means a new
+    session, an unreachable store does not.
+    """
+
+    def __init__(self, prefix=SESSION_KEY_PREFIX, url=SESSION_REDIS_URL):
+        self.prefix = prefix
+        self.url = url
+        self.serializer = TaggedJSONSerializer()
+        self._client = None
+        self._lock = threading.Lock()
+        self._down_until = 0.0
+
+    def key(self, sid, field=None):
+        return f"{self.prefix}{sid}" if field is None else f"{self.prefix}{sid}:{field}"
+
+    def client(self):
+        if time.monotonic() < self._down_until:
+            raise SessionStoreUnavailable("session store unavailable")
+        if self._client is None:
+            with self._lock:  # gthread workers: one client (and connection pool) per process
+                if self._client is None:
+                    self._client = redis.from_url(
+                        self.url,
+                        socket_connect_timeout=SESSION_REDIS_TIMEOUT,
+                        socket_timeout=SESSION_REDIS_TIMEOUT,
+                        decode_responses=True,
+                    )
+        return self._client
+
+    def failed(self, error):
+        if time.monotonic() >= self._down_until:
+            logger.error(f"Session store unavailable, answering 503 for {SESSION_RETRY_AFTER:.0f}s: {error}")
+        self._down_until = time.monotonic() + SESSION_RETRY_AFTER
+        raise SessionStoreUnavailable(str(error)) from error
+
+    def load(self, sid):
+        """Returns (small fields, names of large fields stored separately)"""
+        try:
+            raw = self.client().get(self.key(sid))
+        except redis.RedisError as e:
+            self.failed(e)
+        if not raw:
+            return {}, []
+        record = self.serializer.loads(raw)
+        return record.get("data", {}), record.get("lazy", [])
+
+    def load_field(self, sid, field):
+        try:
+            raw = self.client().get(self.key(sid, field))
+        except redis.RedisError as e:
+            self.failed(e)
+        return self.serializer.loads(raw) if raw else None
+
+    def save(self, session, ttl):
+        try:
+            pipe = self.client().pipeline(transaction=False)
+            if session.modified:
+                small = {k: v for k, v in dict.items(session) if k not in LARGE_FIELDS}
+                record = {"data": small, "lazy": sorted(session.large_fields())}
+                pipe.set(self.key(session.sid), self.serializer.dumps(record), ex=ttl)
+                for field in session.dirty:
+                    pipe.set(self.key(session.sid, field),
+                             self.serializer.dumps(dict.__getitem__(session, field)), ex=ttl)
+                for field in session.deleted:
+                    pipe.delete(self.key(session.sid, field))
+            else:
+                # Sliding expiry: keep an active session alive without rewriting it
+                pipe.expire(self.key(session.sid), ttl)
+                for field in session.large_fields():
+                    pipe.expire(self.key(session.sid, field), ttl)
+            pipe.execute()
+        except redis.RedisError as e:
+            self.failed(e)
+
+    def delete(self, sid):
+        try:
+            self.client().delete(self.key(sid), *(self.key(sid, field) for field in LARGE_FIELDS))
+        except redis.RedisError as e:
+            self.failed(e)
+
+
+class RedisSessionInterface(SessionInterface):
+    """
+    Server-side sessions: the cookie only carries a signed, opaque session id
+    and the data lives in Redis (see RedisSession). Records expire after
+    PERMANENT_SESSION_LIFETIME of inactivity.
+    """
+
+    session_class = RedisSession
+    salt = "redis-session"
+
+    def __init__(self, store=None):
+        self.store = store or RedisSessionStore()
+
+    def _signer(self, app):
+        return Signer(app.secret_key, salt=self.salt)
+
+    def open_session(self, app, request):
+        if not app.secret_key:
+            return None
+        signed = request.cookies.get(self.get_cookie_name(app))
+        if signed:
+            try:
+                sid = self._signer(app).unsign(signed).decode()
+                return self.session_class(self.store, sid)
+            except BadSignature:
+                pass    # tampered, or a cookie from the old signed-cookie sessions
+        return self.session_class(self.store, uuid.uuid4().hex, new=True)
+
+    def save_session(self, app, session, response):
+        name = self.get_cookie_name(app)
+        domain = self.get_cookie_domain(app)
+        path = self.get_cookie_path(app)
+        secure = self.get_cookie_secure(app)
+        samesite = self.get_cookie_samesite(app)
+        httponly = self.get_cookie_httponly(app)
+
+        if session.accessed:
+            response.vary.add("Cookie")
+        # Views that never touched the session cost no Redis round trip
+        if not session.loaded:
+            return
+
+        try:
+            if not session:
+                if session.modified:
+                    self.store.delete(session.sid)
+                    response.delete_cookie(name, domain=domain, path=path, secure=secure,
+                                           samesite=samesite, httponly=httponly)
+                return
+
+            ttl = int(app.permanent_session_lifetime.total_seconds())
+            if session.modified or session.accessed:
+                self.store.save(session, ttl)
+        except SessionStoreUnavailable:
+            # A lost sliding-expiry refresh is harmless; a lost write (a login,
+            # a new interview) must not pass for success
+            if session.modified:
+                unavailable_response(response)
+            return
+
+        if session.new or self.should_set_cookie(app, session):
+            response.set_cookie(
+                name,
+                self._signer(app).sign(session.sid).decode(),
+                expires=self.get_expiration_time(app, session),
+                httponly=httponly,
+                domain=domain,
+                path=path,
+                secure=secure,
+                samesite=samesite,
+            )
+
+
+def regenerate_session(session):
+    """Call on login and logout; Flask's signed-cookie sessions have no id to rotate"""
+    if isinstance(session, RedisSession):
+        session.regenerate()
+
+
+def unavailable_response(response):
+    """Turns response, already built by the view, into the 503 for a session that could not be stored"""
+    response.status_code = 503
+    for header in ("Content-Encoding", "ETag", "Set-Cookie"):
+        response.headers.pop(header, None)
+    response.set_data(json.dumps({"error": "Service Unavailable",
+                                  "message": "Your session could not be saved, please retry shortly."}))
+    response.mimetype = "application/json"
+    response.headers["Retry-After"] = str(int(SESSION_RETRY_AFTER))
+    response.headers["Cache-Control"] = "no-store"
+    return response
+
+
+def init_session_store(app):
+    """
+    Switches app to Redis-backed sessions. Keeps Flask's signed-cookie
+    sessions when Redis is unreachable at startup.
+    """
+    store = RedisSessionStore()
+    try:
+        store.client().ping()
+    except redis.RedisError as e:
+        logger.warning(f"Redis unavailable, keeping cookie-based sessions: {e}")
+        return False
+    app.session_interface = RedisSessionInterface(store)
+    logger.info("Server-side sessions stored in Redis.")
+    return True
@@ -0,0 +1,201 @@
+import os
+import gzip
+import json
+import hashlib
+import logging
+import mimetypes
+from flask import request, url_for, send_from_directory, abort
+from dotenv import load_dotenv
+
+load_dotenv()
+logger = logging.getLogger(__name__)
+
+STATIC_DIST = "dist"                              # under the app's static folder
+STATIC_MANIFEST = "manifest.json"
+STATIC_IMMUTABLE_MAX_AGE = 31536000               # hashed names never change content
+STATIC_COMPRESS_MIN_BYTES = int(os.getenv("STATIC_COMPRESS_MIN_BYTES") or 1024)
+
+# Shipped as one unit under a hashed directory name: face-api resolves weight
+# shards relative to the directory it was given, and avatar_module/index.html
+# links its stylesheet relatively
+BUNDLES = ("models", "avatar_module")
+# Weight shards (.bin, -shard1) are not listed: they barely compress and are
+# fetched with Range requests, which only make sense against the identity bytes
+COMPRESSIBLE = {".js", ".css", ".json", ".html", ".svg", ".txt", ".map"}
+ENCODINGS = (("br", ".br"), ("gzip", ".gz"))
+
+
+# ── BUILD ──────────────────────────────────────────────────────────────────
+def _digest(chunks):
+    h = hashlib.sha256()
+    for chunk in chunks:
+        h.update(chunk)
+    return h.hexdigest()[:10]
+
+
+def _read(path):
+    with open(path, "rb") as f:
+        return f.read()
+
+
+def _hashed_name(rel, digest):
+    stem, ext = os.path.splitext(rel)
+    return f"{stem}.{digest}{ext}"
+
+
+def _write(path, data):
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    tmp = f"{path}.tmp"
+    with open(tmp, "wb") as f:
+        f.write(data)
+    os.replace(tmp, path)
+
+
+def _compress(path, data):
+    """Writes .br/.gz next to path when they are worth it; returns the encodings written"""
+    import brotli
+
+    written = []
+    variants = {"br": lambda: brotli.compress(data, quality=11),
+                "gzip": lambda: gzip.compress(data, compresslevel=9, mtime=0)}
+    for encoding, suffix in ENCODINGS:
+        packed = variants[encoding]()
+        if len(packed) < len(data) * 0.95:
+            _write(path + suffix, packed)
+            written.append(encoding)
+    return written
+
+
+def _emit(dist, rel_out, data, encodings):
+    path = os.path.join(dist, rel_out)
+    if not os.path.exists(path):
+        _write(path, data)
+    ext = os.path.splitext(rel_out)[1].lower()
+    if ext in COMPRESSIBLE and len(data) >= STATIC_COMPRESS_MIN_BYTES:
+        done = [enc for enc, suffix in ENCODINGS if os.path.exists(path + suffix)]
+        encodings[rel_out.replace(os.sep, "/")] = done or _compress(path, data)
+
+
+def build(static_folder, prune=False):
+    """
+    Writes content-hashed copies of every static file to <static>/dist, with
+    brotli and gzip variants, and a manifest mapping logical paths to them.
+    Files are content-addressed, so earlier builds stay valid for pages still
+    open during a deploy; prune removes what the new manifest no longer lists.
+    """
+    dist = os.path.join(static_folder, STATIC_DIST)
+    assets, encodings = {}, {}
+
+    for entry in sorted(os.listdir(static_folder)):
+        source = os.path.join(static_folder, entry)
+        if entry == STATIC_DIST or entry.startswith("."):
+            continue
+        if entry in BUNDLES and os.path.isdir(source):
+            files = sorted(os.path.relpath(os.path.join(root, name), source)
+                           for root, _, names in os.walk(source) for name in names)
+            digest = _digest(chunk for rel in files for chunk in (rel.encode(), _read(os.path.join(source, rel))))
+            bundle = f"{entry}.{digest}"
+            for rel in files:
+                _emit(dist, os.path.join(bundle, rel), _read(os.path.join(source, rel)), encodings)
+            assets[f"{entry}/"] = f"{bundle}/"
+            continue
+        for root, _, names in os.walk(source) if os.path.isdir(source) else [(static_folder, [], [entry])]:
+            for name in sorted(names):
+                rel = os.path.relpath(os.path.join(root, name), static_folder)
+                data = _read(os.path.join(static_folder, rel))
+                hashed = _hashed_name(rel, _digest([data]))
+                _emit(dist, hashed, data, encodings)
+                assets[rel.replace(os.sep, "/")] = hashed.replace(os.sep, "/")
+
+    manifest = {"assets": assets, "encodings": encodings}
+    _write(os.path.join(dist, STATIC_MANIFEST), json.dumps(manifest, indent=2, sort_keys=True).encode())
+
+    if prune:
+        keep = {STATIC_MANIFEST}
+        for hashed in assets.values():
+            keep.add(hashed.rstrip("/").split("/")[0] if hashed.endswith("/") else hashed)
+        for hashed in encodings:
+            keep.update(hashed + suffix for _, suffix in ENCODINGS)
+        _prune(dist, keep)
+    return manifest
+
+
+def _prune(dist, keep):
+    for root, dirs, names in os.walk(dist, topdown=False):
+        for name in names:
+            rel = os.path.relpath(os.path.join(root, name), dist).replace(os.sep, "/")
+            if rel not in keep and rel.split("/")[0] not in keep:
+                os.remove(os.path.join(root, name))
+        if root != dist and not os.listdir(root):
+            os.rmdir(root)
+
+
+# ── SERVING ────────────────────────────────────────────────────────────────
+class StaticAssets:
+    """
+    Manifest lookups for templates (asset_url) and the Flask fallback for
+    /static/dist/ when nginx is not in front. The manifest is read once; with
+    app.debug it is re-read whenever a rebuild changes it.
+    """
+
+    def __init__(self, app):
+        self.app = app
+        self.dist = os.path.join(app.static_folder, STATIC_DIST)
+        self.path = os.path.join(self.dist, STATIC_MANIFEST)
+        self.assets, self.encodings, self._mtime = {}, {}, None
+        self._load()
+        if not self.assets:
+            logger.warning(f"No static manifest at {self.path}; run build_assets.py. "
+                           "Serving unversioned /static/ paths.")
+
+    def _load(self):
+        try:
+            mtime = os.path.getmtime(self.path)
+            if mtime == self._mtime:
+                return
+            with open(self.path, encoding="utf-8") as f:
+                manifest = json.load(f)
+        except (OSError, ValueError):
+            return
+        self.assets, self.encodings, self._mtime = manifest["assets"], manifest["encodings"], mtime
+
+    def url(self, path):
+        """Hashed URL for a static path ("js/script.js", or "models/" for a bundle)"""
+        if self.app.debug:
+            self._load()
+        hashed = self.assets.get(path)
+        if hashed is None:
+            return url_for("static", filename=path)
+        url = url_for("static_dist", filename=hashed.rstrip("/"))
+        return url + "/" if hashed.endswith("/") else url
+
+    def serve(self, filename):
+        if filename == STATIC_MANIFEST:
+            abort(404)
+        encoding, suffix = None, ""
+        if "Range" not in request.headers:
+            accepted = request.accept_encodings
+            for name, ext in ENCODINGS:
+                if name in self.encodings.get(filename, ()) and accepted[name] > 0:
+                    encoding, suffix = name, ext
+                    break
+        mimetype = mimetypes.guess_type(filename)[0] or "application/octet-stream"
+        # conditional=True answers If-None-Match and Range (206) from the file on disk
+        response = send_from_directory(self.dist, filename + suffix, mimetype=mimetype,
+                                       max_age=STATIC_IMMUTABLE_MAX_AGE, conditional=True)
+        response.cache_control.public = True
+        response.cache_control.immutable = True
+        response.headers["Vary"] = "Accept-Encoding"
+        if encoding:
+            response.headers["Content-Encoding"] = encoding
+        return response
+
+
+def init_static_assets(app):
+    """Registers asset_url() for templates and the /static/dist/ fallback route"""
+    assets = StaticAssets(app)
+    app.jinja_env.globals["asset_url"] = assets.url
+    app.add_url_rule(f"{app.static_url_path}/{STATIC_DIST}/<path:filename>", "static_dist", assets.serve)
+    app.extensions["static_assets"] = assets
+    return assets
+
@@ -0,0 +1,156 @@
+import os
+import time
+import hashlib
+import logging
+import threading
+from concurrent.futures import ThreadPoolExecutor, wait
+from dotenv import load_dotenv
+from database_con import MarkTurnPending, StoreTurnEvaluation, GetTurnEvaluations, release_db_connection
+
+load_dotenv()
+logger = logging.getLogger(__name__)
+
+TURN_EVAL_WORKERS = int(os.getenv("TURN_EVAL_WORKERS") or 4)
+# How long /finish-interview waits for evaluations still running in the
+# background before scoring the remaining turns itself
+TURN_EVAL_WAIT = float(os.getenv("TURN_EVAL_WAIT") or 20)
+# A 'pending' row older than this belongs to a worker that died (or was
+# recycled) before storing its result
+TURN_EVAL_STALE = int(os.getenv("TURN_EVAL_STALE") or 180)
+TURN_EVAL_POLL = 0.5
+
+
+def answer_sha(answer):
+    return hashlib.sha256((answer or "").encode("utf-8")).hexdigest()[:16]
+
+
+def turn_payload(interview, turn, user_id, topic=None):
+    """Everything one turn's evaluation needs; turn is 1-based into interview.history"""
+    entry = interview.history[turn - 1]
+    return {
+        "session_id": interview.session_id,
+        "user_id": user_id,
+        "turn": turn,
+        "topic": topic or interview.current_stage,
+        "difficulty_level": interview.difficulty_level,
+        "jd_text": (interview.jd_text or "")[:1000],
+        "question_text": entry.get("question", ""),
+        "user_transcription": entry.get("answer", ""),
+        "posture_data": entry.get("posture") or {},
+        "answer_sha": answer_sha(entry.get("answer")),
+    }
+
+
+class TurnEvaluator:
+    """
+    Map-reduce scoring of an interview. Each answer is evaluated in a
+    background thread as soon as /submit-answer commits (map), and the stored
+    results are summarized by one fixed-size LLM call at /finish-interview
+    (reduce), so finishing costs about the same at 3 questions as at 12.
+
+    Results live in turn_evaluations, so a finish served by another gunicorn
+    worker sees them too; anything missing, failed or orphaned is evaluated
+    at finish time, in parallel.
+    """
+
+    def __init__(self, llm_service, workers=TURN_EVAL_WORKERS):
+        self.llm_service = llm_service
+        self.workers = workers
+        self._pool = None
+        self._pool_pid = None
+        self._futures = {}          # (session_id, turn) -> Future, this process only
+        self._lock = threading.Lock()
+
+    def _get_pool(self):
+        with self._lock:
+            if self._pool is None or self._pool_pid != os.getpid():
+                # Threads do not survive fork (gunicorn --preload); start a pool per worker
+                self._pool_pid = os.getpid()
+                self._futures = {}
+                self._pool = ThreadPoolExecutor(max_workers=self.workers, thread_name_prefix="turn-eval")
+            return self._pool
+
+    def mark_pending(self, payload):
+        MarkTurnPending(payload["session_id"], payload["turn"], payload["user_id"], payload["answer_sha"])
+
+    def submit(self, payload):
+        """Queues one turn's evaluation; call once the pending row is committed"""
+        key = (payload["session_id"], payload["turn"])
+        future = self._get_pool().submit(self._run, payload)
+        with self._lock:
+            self._futures[key] = future
+        future.add_done_callback(lambda f: self._forget(key, f))
+        return future
+
+    def _forget(self, key, future):
+        with self._lock:
+            if self._futures.get(key) is future:
+                del self._futures[key]
+
+    def _run(self, payload):
+        try:
+            # Raises LLMUnavailable rather than returning a busy message
+            result = self.llm_service.evaluate_Answer(payload)
+            if result["score"] is None:
+                raise ValueError("no score in the evaluation")
+        except Exception as e:
+            logger.error(f"Turn evaluation failed for {payload['session_id']} turn {payload['turn']}: {e}")
+            StoreTurnEvaluation(payload["session_id"], payload["turn"], payload["user_id"],
+                                payload["answer_sha"], "failed")
+            return None
+        StoreTurnEvaluation(payload["session_id"], payload["turn"], payload["user_id"],
+                            payload["answer_sha"], "done", result["score"], result)
+        return result
+
+    def collect(self, interview, user_id):
+        """
+        [{turn, question, evaluation}] for every answered turn, in order.
+        Waits up to TURN_EVAL_WAIT for evaluations in flight anywhere, then
+        evaluates whatever is still missing in parallel.
+        """
+        turns = {i: answer_sha(entry.get("answer")) for i, entry in enumerate(interview.history, 1)
+                 if (entry.get("answer") or "").strip()}
+        if not turns:
+            return []
+
+        deadline = time.monotonic() + TURN_EVAL_WAIT
+        with self._lock:
+            local = [f for (sid, _), f in self._futures.items() if sid == interview.session_id]
+        wait(local, timeout=TURN_EVAL_WAIT)
+
+        while True:
+            rows = GetTurnEvaluations(interview.session_id)
+            # Another worker's evaluation that is still young may finish yet
+            waiting = [turn for turn, sha in turns.items()
+                       if turn in rows and rows[turn]["answer_sha"] == sha
+                       and rows[turn]["status"] == "pending" and (rows[turn]["age"] or 0) < TURN_EVAL_STALE]
+            if not waiting or time.monotonic() >= deadline:
+                break
+            release_db_connection()
+            time.sleep(TURN_EVAL_POLL)
+        release_db_connection()
+
+        results = {turn: rows[turn]["evaluation"] for turn, sha in turns.items()
+                   if turn in rows and rows[turn]["answer_sha"] == sha
+                   and rows[turn]["status"] == "done" and rows[turn]["score"] is not None}
+        missing = [turn for turn in turns if turn not in results]
+        if missing:
+            logger.info(f"Evaluating {len(missing)} turn(s) of {interview.session_id} at finish")
+            futures = {turn: self._get_pool().submit(self._run, turn_payload(interview, turn, user_id))
+                       for turn in missing}
+            for turn, future in futures.items():
+                result = future.result()
+                if result is not None:
+                    results[turn] = result
+
+        return [{"turn": turn, "question": interview.history[turn - 1].get("question", ""),
+                 "evaluation": results[turn]} for turn in sorted(results)]
+
+    def final_report(self, interview, user_id):
+        """(report markdown, score) for a finished interview; raises if no turn could be scored"""
+        turns = self.collect(interview, user_id)
+        scores = [turn["evaluation"]["score"] for turn in turns if turn["evaluation"].get("score") is not None]
+        if not scores:
+            raise ValueError("No answered turn could be evaluated")
+        score = round(sum(scores) / len(scores), 1)
+        return self.llm_service.summarize_interview(interview, turns, score), score
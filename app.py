@@ -1,32 +1,53 @@
 import os
-from flask import Flask, request, jsonify, session, redirect, url_for, render_template
-from werkzeug.exceptions import HTTPException
+from flask import Flask, request, jsonify, session, redirect, url_for, render_template, g
+from werkzeug.exceptions import HTTPException, RequestEntityTooLarge
 from flask_cors import CORS
-from flask_compress import Compress
 from dotenv import load_dotenv
 from datetime import datetime
 import uuid
 import bcrypt
 from functools import wraps
-from Services.Genrator import InterviewGenratSession
-import sentry_sdk
-from sentry_sdk.integrations.flask import FlaskIntegration
+import threading
+from Services.Genrator import InterviewGenratSession, build_chat_context, LLMUnavailable, LLM_BUSY_MESSAGES, HR_CHAT_UNAVAILABLE
 from prometheus_flask_exporter import PrometheusMetrics
+from Services.sampling import sampler as sentry_sampler
 
 
 # ── MONITORING ─────────────────────────────────────────────────────────────
-sentry_sdk.init(
-    dsn=os.getenv("SENTRY_DSN"),
-    integrations=[FlaskIntegration()],
-    traces_sample_rate=1.0,
-    profiles_sample_rate=1.0,
-)
+# Per-route head sampling plus tail keeps for errors / slow requests; rates are
+# tunable live through Redis (see Services/sampling.py).
+# Integrations are listed explicitly: Sentry's auto-enabling ones import
+# langchain_openai, huggingface_hub, sqlalchemy, aiohttp... just to patch them,
+# which was over a second of every cold start.
+if os.getenv("SENTRY_DSN"):
+    import sentry_sdk
+    from sentry_sdk.integrations.flask import FlaskIntegration
+    from sentry_sdk.integrations.redis import RedisIntegration
+    from sentry_sdk.integrations.rq import RqIntegration
+    sentry_sdk.init(
+        dsn=os.getenv("SENTRY_DSN"),
+        integrations=[FlaskIntegration(), RedisIntegration(), RqIntegration()],
+        auto_enabling_integrations=False,
+        traces_sampler=sentry_sampler.traces_sampler,
+        profiles_sampler=sentry_sampler.profiles_sampler,
+        before_send_transaction=sentry_sampler.before_send_transaction,
+    )
 
 
 # ── DB helper (unchanged)
-from database_con import get_db_connection, StoreSession, CheckDailyLimit, CreateSessionRecord, UpdateStreak, GetUserStreakInfo
-import io
-import PyPDF2
+from database_con import connection_pool, ensure_lazy_tables, get_db_connection, release_db_connection, init_request_transactions, StoreSession, StartDailyAttempt, UpdateStreak, GetUserStreakInfo, GetUserSessions, GetUserProgress, FinishSession, on_commit, PoolTimeoutError, SaveUserResume, StoreFeedbackReport, GetFeedbackReport
+from Services.counters import stats_counters
+from Services.session_store import init_session_store, regenerate_session, SessionStoreUnavailable, SESSION_RETRY_AFTER
+from Services.static_assets import init_static_assets
+from Services.feedback_report import render_feedback_html, compact_history
+from Services.response_cache import versioned, skip_response_cache
+from Services.compression import init_compression, cache_compressed
+from Services.rate_limit import llm_admission, admit_background
+from Services.turn_evaluation import TurnEvaluator, turn_payload
+from Services.chat_memory import ChatMemory, CHAT_RECENT_MESSAGES, CHAT_INPUT_MAX_CHARS
+from Services.chat_context import chat_context_cache
+from Services.resume_extractor import resume_extractor, NotAPdf, ResumeTooLarge, RESUME_MAX_BYTES
+from Services.instrumentation import collect_spans
 
 import logging
 
@@ -43,7 +64,23 @@ load_dotenv()
 app = Flask(__name__, template_folder='templates', static_folder='static')
 metrics = PrometheusMetrics(app)
 metrics.info('app_info', 'Application info', version='1.0.0')
-Compress(app)
+init_compression(app)  # per-type zstd/br/gzip, see Services/compression.py
+init_request_transactions(app)  # one DB connection + transaction per request
+
+@app.after_request
+def drain_request_body(response):
+    # gthread keep-alive: a body the view never read stays in the socket and
+    # stalls the next request on that connection until the keep-alive timeout.
+    # An oversized body is not worth reading: close that connection instead.
+    if (request.content_length or 0) > app.config["MAX_CONTENT_LENGTH"]:
+        response.headers["Connection"] = "close"
+        return response
+    try:
+        while request.stream.read(64 * 1024):
+            pass
+    except Exception:
+        pass
+    return response
 
 @app.route('/favicon.ico')
 def favicon():
@@ -51,10 +88,25 @@ def favicon():
 
 @app.errorhandler(Exception)
 def handle_exception(e):
+    if isinstance(e, RequestEntityTooLarge):
+        limit_mb = app.config["MAX_CONTENT_LENGTH"] // (1024 * 1024)
+        return jsonify({"success": False, "message": f"Upload too large (max {limit_mb} MB)."}), 413
+
     # Pass through HTTP errors (like 404, 405, etc.)
     if isinstance(e, HTTPException):
         return e
 
+    # Pool exhausted under a burst: ask the client to retry instead of failing hard
+    if isinstance(e, PoolTimeoutError):
+        logger.warning(f"DB pool exhausted on {request.path}: {e}")
+        body = {"error": "Service Busy", "message": "Server is busy, please retry shortly."}
+        return jsonify(body), 503, {"Retry-After": "2"}
+
+    # Session store down: never treat the user as logged out
+    if isinstance(e, SessionStoreUnavailable):
+        body = {"error": "Service Unavailable", "message": "Your session could not be loaded, please retry shortly."}
+        return jsonify(body), 503, {"Retry-After": str(int(SESSION_RETRY_AFTER))}
+
     # Log non-HTTP exceptions with traceback
     logger.error(f"Unhandled Exception: {str(e)}", exc_info=True)
     
@@ -68,7 +120,8 @@ app.config.update(
     SESSION_COOKIE_HTTPONLY=True,
     SESSION_COOKIE_SAMESITE='Lax',
     PERMANENT_SESSION_LIFETIME=1800, # 30 mins
-    SEND_FILE_MAX_AGE_DEFAULT=31536000 # 1 year cache for static assets
+    SEND_FILE_MAX_AGE_DEFAULT=int(os.getenv("STATIC_MAX_AGE") or 300), # unversioned /static/ paths; /static/dist/ is immutable
+    MAX_CONTENT_LENGTH=int(os.getenv("MAX_CONTENT_LENGTH") or RESUME_MAX_BYTES + 64 * 1024) # resume PDF + form overhead
 )
 app.secret_key = os.getenv("FLASK_SECRET_KEY")
 if not app.secret_key:
@@ -78,6 +131,14 @@ if not app.secret_key:
     else:
         raise RuntimeError("FLASK_SECRET_KEY must be set in production")
 
+# Server-side sessions: the cookie only carries a signed id, so large fields
+# (resume_text, jd_text) no longer ride along on every request
+init_session_store(app)
+
+# Templates link static files through asset_url(), which resolves to the
+# content-hashed copies build_assets.py writes to static/dist
+init_static_assets(app)
+
 # CORS should be restricted in production
 allowed_origins = os.getenv("ALLOWED_ORIGINS", "*").split(",")
 CORS(app, resources={r"/*": {"origins": allowed_origins}}, supports_credentials=True)
@@ -86,7 +147,10 @@ if not os.getenv("groq_Api"):
     logger.warning("GROQ_API key is not set. Questions will fail to generate.")
 
 # ── LLM ───────────────────────────────────────────────────────────────────────
+# Cheap to construct: the Groq and Gemini clients are built on first use or by warm_up()
 llm_service=InterviewGenratSession()
+turn_evaluator = TurnEvaluator(llm_service)
+chat_memory = ChatMemory(llm_service)
 
 @app.route("/debug-templates")
 def debug_templates():
@@ -106,6 +170,66 @@ def health_check():
     return jsonify({"status": "healthy", "timestamp": datetime.utcnow().isoformat()}), 200
 
 
+# ── LIVENESS / READINESS ───────────────────────────────────────────────────
+# /livez: the process serves requests (restart it if not).
+# /readyz: warm-up finished and MySQL answers (route traffic to it if so).
+_warmup_done = threading.Event()
+_warmup_started = threading.Lock()
+_warmup_error = None
+
+def warm_up():
+    """Builds the LLM/embedding clients and opens a DB connection before real traffic arrives"""
+    global _warmup_error
+    try:
+        llm_service.warm_up()
+        conn = connection_pool.get_connection()
+        try:
+            cursor = conn.cursor()
+            cursor.execute("SELECT 1")
+            cursor.fetchall()
+            cursor.close()
+        finally:
+            conn.close()
+        # Outside any request, so helpers never create tables while holding a connection
+        ensure_lazy_tables()
+        _warmup_error = None
+        _warmup_done.set()
+        logger.info("Warm-up complete")
+    except Exception as e:
+        _warmup_error = str(e)
+        logger.warning(f"Warm-up failed, /readyz will retry: {e}")
+
+def start_warm_up():
+    """Runs warm_up() in the background once per process; gunicorn.conf.py calls it after each worker boots"""
+    if _warmup_done.is_set() or not _warmup_started.acquire(blocking=False):
+        return
+    def run():
+        try:
+            warm_up()
+        finally:
+            _warmup_started.release()
+    threading.Thread(target=run, name="warm-up", daemon=True).start()
+
+@app.route("/livez")
+def livez():
+    return jsonify({"status": "alive"}), 200
+
+@app.route("/readyz")
+def readyz():
+    if not _warmup_done.is_set():
+        start_warm_up()
+        return jsonify({"status": "warming_up", "error": _warmup_error}), 503
+    try:
+        conn = get_db_connection()
+        cursor = conn.cursor()
+        cursor.execute("SELECT 1")
+        cursor.fetchall()
+        cursor.close()
+    except Exception as e:
+        return jsonify({"status": "not_ready", "error": str(e)}), 503
+    return jsonify({"status": "ready"}), 200
+
+
 
 # ============================================================
 # INTERVIEW SESSION MODEL
@@ -121,6 +245,7 @@ class ActiveInterview:
         self.current_question = None
         self.current_stage    = "Introduction"
         self.timestamp        = datetime.utcnow().isoformat()
+        self.timings          = []   # per-turn stage breakdown, see record_turn_timing
 
     def to_dict(self):
         return {
@@ -132,7 +257,8 @@ class ActiveInterview:
             "history": self.history,
             "current_question": self.current_question,
             "current_stage": self.current_stage,
-            "timestamp": self.timestamp
+            "timestamp": self.timestamp,
+            "timings": self.timings
         }
 
     @staticmethod
@@ -144,6 +270,7 @@ class ActiveInterview:
         obj.current_question = d["current_question"]
         obj.current_stage = d["current_stage"]
         obj.timestamp = d["timestamp"]
+        obj.timings = d.get("timings", [])
         return obj
 
 from database_con import SaveInterviewState, LoadInterviewState
@@ -164,6 +291,37 @@ def persist_interview(interview):
     """Saves to DB (Stateless)"""
     SaveInterviewState(interview.session_id, json.dumps(interview.to_dict()))
 
+TIMELINE_MAX_SPANS = 40
+
+def timed_turn(f):
+    """Collects the spans of an interview step into g.turn_timeline for record_turn_timing"""
+    @wraps(f)
+    def wrapper(*args, **kwargs):
+        with collect_spans() as timeline:
+            g.turn_timeline = timeline
+            return f(*args, **kwargs)
+    return wrapper
+
+def record_turn_timing(interview, kind):
+    """
+    Appends one turn (question, answer or finish) to interview.timings from the
+    request's timed_turn timeline. Called just before persist_interview, so the
+    state write itself is the only DB time a turn does not include.
+    gap_ms on a question is the time since the previous answer was saved:
+    the candidate's think/submit gap as the server sees it.
+    """
+    timeline = g.get("turn_timeline")
+    if timeline is None:
+        return
+    entry = timeline.to_dict()
+    entry["spans"] = entry["spans"][:TIMELINE_MAX_SPANS]
+    entry.update(kind=kind, turn=interview.question_count,
+                 at=round(timeline.started_at * 1000))
+    previous = interview.timings[-1] if interview.timings else None
+    if kind == "question" and previous and previous["kind"] == "answer":
+        entry["gap_ms"] = max(0, entry["at"] - previous["at"] - round(previous["total_ms"]))
+    interview.timings.append(entry)
+
 
 # ============================================================
 # PASSWORD UTILS  (unchanged)
@@ -239,6 +397,7 @@ def register():
             (name, email, hashed_pw, admin_status),
         )
         conn.commit()
+        on_commit(stats_counters.user_registered)
         return jsonify({"success": True})
     except Exception as e:
         logger.error(f"Registration error for {email}: {e}")
@@ -264,6 +423,7 @@ def api_login():
     conn.close()
 
     if user and check_password(password, user["password"]):
+        regenerate_session(session)
         session["user_id"] = user["user_id"]
         session["name"]    = user["name"]
         session["role"]    = user["role"]
@@ -275,6 +435,7 @@ def api_login():
 @app.route("/logout")
 def logout():
     session.clear()
+    regenerate_session(session)  # deletes the stored record even if it was already empty
     return redirect(url_for("login_page"))
 
 
@@ -306,12 +467,29 @@ def feedback_page(session_id=None):
 
 @app.route("/api/feedback/<session_id>")
 @login_required
+@versioned("sessions")
 def get_feedback_api(session_id):
     user_id = session.get("user_id")
+
+    # Finished interviews: one primary-key read of the stored report
+    report = GetFeedbackReport(session_id)
+    if report:
+        if report["user_id"] != user_id:
+            return jsonify({"error": "Unauthorized access to this session's feedback"}), 403
+        cache_compressed()  # a stored report never changes
+        return jsonify({
+            "feedback": report["report_md"],
+            "feedback_html": report["report_html"],
+            "score": report["score"],
+            "last_question": report["last_question"],
+            "last_answer": report["last_answer"],
+            "history": report["history"]
+        })
+
     # Try fetching from DB first
     conn = get_db_connection()
     cursor = conn.cursor(dictionary=True)
-    cursor.execute("SELECT feedback, question, answer, user_id FROM interview_sessions WHERE session_id=%s", (session_id,))
+    cursor.execute("SELECT feedback, question, answer, score, user_id, finished_at FROM interview_sessions WHERE session_id=%s", (session_id,))
     res = cursor.fetchone()
     cursor.close()
     conn.close()
@@ -321,21 +499,28 @@ def get_feedback_api(session_id):
         return jsonify({"error": "Unauthorized access to this session's feedback"}), 403
 
     # We also want the history from the memory session if it's still there
-    history = []
     interview = get_active_interview(session_id)
-    if interview:
-        history = interview.history
-
-    if res and res["feedback"] and res["feedback"] != "Pending Final Evaluation":
+    history = interview.history if interview else []
+
+    if res and res["feedback"] and res["finished_at"] is not None:
+        # Finished before feedback_reports existed: store the report so later reads take the fast path.
+        # Unfinished rows only hold placeholders ("In Progress...", "Pending Final Evaluation");
+        # finished_at is set by FinishSession and backfilled for older rows by _rebuild_progress
+        feedback_html = render_feedback_html(res["feedback"])
+        history = compact_history(history)
+        StoreFeedbackReport(session_id, user_id, res["score"], res["feedback"], feedback_html,
+                            history, res["question"], res["answer"])
         return jsonify({
             "feedback": res["feedback"],
+            "feedback_html": feedback_html,
+            "score": float(res["score"]) if res["score"] is not None else None,
             "last_question": res["question"],
             "last_answer": res["answer"],
             "history": history
         })
     
-    # If not in DB but in memory/metadata
-    interview = get_active_interview(session_id)
+    # If not in DB but in memory/metadata; still changing, so never cache it
+    skip_response_cache()
     if interview:
         return jsonify({
             "feedback": getattr(interview, 'feedback', "Generating..."),
@@ -353,20 +538,18 @@ def get_feedback_api(session_id):
 def start_session():
     user_id = session.get("user_id")
     
-    # Check if user already completed an interview today
-    if CheckDailyLimit(user_id):
+    # Mark today's attempt as 'Started' unless the user already completed an interview today
+    if not StartDailyAttempt(user_id):
         return jsonify({
             "success": False, 
             "message": "You’ve already completed today’s interview. Come back tomorrow."
         }), 403
-        
-    # Create or update session record to 'Started'
-    CreateSessionRecord(user_id, 'Started')
     
     return jsonify({"success": True, "message": "Session started"})
 
 @app.route("/user-profile", methods=["GET"])
 @login_required
+@versioned("streak", vary=lambda: datetime.now().strftime("%Y-%m-%d %H"))  # today_status / hours_until_next
 def user_profile():
     user_id = session.get("user_id")
     streak_info = GetUserStreakInfo(user_id)
@@ -376,6 +559,14 @@ def user_profile():
         "streak_info": streak_info
     })
 
+@app.route("/api/progress", methods=["GET"])
+@login_required
+def user_progress():
+    progress = GetUserProgress(session.get("user_id"))
+    if progress is None:
+        return jsonify({"success": False, "message": "Progress unavailable"}), 503
+    return jsonify({"success": True, **progress})
+
 # Chrome DevTools occasionally pokes this path; silence the 404 log
 @app.route("/.well-known/appspecific/com.chrome.devtools.json")
 def chrome_devtools_json():
@@ -391,16 +582,32 @@ def progress_dash():
 # Get user sessions
 @app.route("/get-user-sessions",methods=["GET"])
 @login_required
+@versioned("sessions")
 def get_user_session():
+    """
+    Lists the user's sessions, newest first.
+
+    Optional query params:
+      fields  comma-separated columns (see USER_SESSION_FIELDS); list views
+              should use feedback_preview and load the full report on demand
+              from /api/feedback/<session_id>
+      limit   page size (max 100); switches the response to
+              {"sessions": [...], "next_cursor": ...}
+      cursor  next_cursor from the previous page
+    """
     user_id=session.get("user_id")
-    conn=get_db_connection()
-    cursor=conn.cursor(dictionary=True)
-    cursor.execute("""
-        select session_id, topic, score, feedback, session_date
-        from interview_sessions where user_id=%s
-        order by session_date desc
-    """,(user_id,))
-    sessions=cursor.fetchall()
+    fields = request.args.get("fields")
+    fields = [f.strip() for f in fields.split(",")] if fields else None
+    limit = request.args.get("limit", type=int)
+    after = request.args.get("cursor")
+    paginated = limit is not None or after is not None
+    if paginated:
+        limit = max(1, min(limit or 20, 100))
+
+    try:
+        sessions, next_cursor = GetUserSessions(user_id, fields, limit, after)
+    except ValueError as e:
+        return jsonify({"error": str(e)}), 400
     
     # Format the data properly to avoid JSON serialization errors
     for session_record in sessions:
@@ -411,28 +618,16 @@ def get_user_session():
             
         if session_record.get('score') is not None:
             session_record['score'] = float(session_record['score'])
-            
-    cursor.close()
-    conn.close()
+
+    if paginated:
+        return jsonify({"sessions": sessions, "next_cursor": next_cursor})
     return jsonify(sessions)
 
 # ============================================================
 # HR CHATBOT ENDPOINT
 # ============================================================
-@app.route("/api/hr-chat", methods=["POST"])
-@login_required
-def hr_chat():
-    data = request.json
-    user_message = data.get("message", "")
-    chat_history = data.get("history", []) # List of {role: 'user'|'assistant', content: '...'}
-    
-    if not user_message:
-        return jsonify({"error": "Message is required"}), 400
-        
-    user_id = session.get("user_id")
-    user_name = session.get("name", "User")
-    
-    # 1. Get Progress Data
+def load_chat_context(user_id):
+    """HR chat context from MySQL: the last 5 sessions and the resume"""
     conn = get_db_connection()
     cursor = conn.cursor(dictionary=True)
     cursor.execute("""
@@ -441,25 +636,60 @@ def hr_chat():
         ORDER BY session_date DESC LIMIT 5
     """, (user_id,))
     progress_data = cursor.fetchall()
-    
-    # 2. Get Resume
+
     cursor.execute("SELECT resume_text FROM users WHERE user_id=%s", (user_id,))
     res = cursor.fetchone()
     resume_text = res["resume_text"] if res and res["resume_text"] else ""
-    
+
     cursor.close()
     conn.close()
+    return build_chat_context(progress_data, resume_text)
+
+@app.route("/api/hr-chat", methods=["POST"])
+@login_required
+@llm_admission("hr_chat")
+def hr_chat():
+    data = request.json
+    user_message = data.get("message", "")
+
+    if not user_message:
+        return jsonify({"error": "Message is required"}), 400
+    if len(user_message) > CHAT_INPUT_MAX_CHARS:
+        return jsonify({"error": f"Message is too long (max {CHAT_INPUT_MAX_CHARS} characters)"}), 400
+
+    user_id = session.get("user_id")
+    user_name = session.get("name", "User")
+
+    # 0. Conversation so far, kept server-side. Without Redis the client
+    # sends its recent messages instead (List of {role, content})
+    memory = chat_memory.context(user_id)
+    if memory is None:
+        conversation_summary, chat_history = "", (data.get("history") or [])[-CHAT_RECENT_MESSAGES:]
+    else:
+        conversation_summary, chat_history = memory
     
+    # 1-2. Progress digest and resume excerpt, cached until the user finishes
+    # an interview or changes their resume
+    context = chat_context_cache.get(user_id, load_chat_context)
+    release_db_connection()
+
     # 3. Call LLM
-    response = llm_service.chat_with_hr(user_name, progress_data, resume_text, user_message, chat_history)
-    
-    return jsonify({"response": response})
+    try:
+        response = llm_service.chat_with_hr(user_name, context, user_message, chat_history, conversation_summary)
+    except LLMUnavailable as e:
+        # Not a reply: shown to the user, never stored in the chat memory
+        message = str(e) if str(e) in LLM_BUSY_MESSAGES else HR_CHAT_UNAVAILABLE
+        return jsonify({"error": "Service Unavailable", "message": message}), 503, {"Retry-After": "5"}
+    chat_memory.append(user_id, user_message, response)
+
+    return jsonify({"response": response, "memory": memory is not None})
 
 # ============================================================
 # NEW ► RESUME MANAGEMENT
 # ============================================================
 @app.route("/api/profile/resume", methods=["GET"])
 @login_required
+@versioned("resume")
 def get_user_resume():
     user_id = session.get("user_id")
     conn = get_db_connection()
@@ -483,32 +713,50 @@ def update_user_resume():
         if 'resume' in request.files:
             file = request.files['resume']
             if file and file.filename.endswith('.pdf'):
+                # Extraction runs in the resume process pool; on a cache miss the
+                # client polls /api/profile/resume/jobs/<job_id> for the text
+                session.pop("resume_text", None)
                 try:
-                    pdf_reader = PyPDF2.PdfReader(io.BytesIO(file.read()))
-                    for page in pdf_reader.pages:
-                        resume_text += page.extract_text() + "\n"
+                    job = resume_extractor.submit(user_id, file, SaveUserResume)
+                except ResumeTooLarge as e:
+                    return jsonify({"success": False, "message": str(e)}), 413
+                except NotAPdf as e:
+                    return jsonify({"success": False, "message": str(e)}), 400
                 except Exception as e:
                     logger.error(f"PDF extract error for user {user_id}: {e}")
+                    return jsonify({"success": False, "message": "Failed to process PDF"}), 500
+
+                if job["status"] == "pending":
+                    return jsonify({"success": True, **job}), 202
+                session["resume_text"] = job["resume_text"]
+                return jsonify({"success": True, "message": "Resume updated", **job})
             elif file:
                 resume_text = file.read().decode('utf-8', errors='ignore')
         else:
             resume_text = request.form.get("resume_text", "")
             
-    conn = get_db_connection()
-    cursor = conn.cursor()
-    cursor.execute("UPDATE users SET resume_text=%s WHERE user_id=%s", (resume_text, user_id))
-    conn.commit()
-    cursor.close()
-    conn.close()
+    SaveUserResume(user_id, resume_text)
     
     session["resume_text"] = resume_text
     return jsonify({"success": True, "message": "Resume updated"})
 
+@app.route("/api/profile/resume/jobs/<job_id>", methods=["GET"])
+@login_required
+def resume_job_status(job_id):
+    job = resume_extractor.job_status(job_id, session.get("user_id"))
+    if job is None:
+        return jsonify({"success": False, "message": "Unknown or expired job"}), 404
+    if job["status"] == "done":
+        session["resume_text"] = job["resume_text"]
+    return jsonify({"success": job["status"] != "failed", **job})
+
 # ============================================================
 # STEP 1: Generate HR Question & Create Session
 # ============================================================
 @app.route("/hr-questions", methods=["POST"])
 @login_required
+@llm_admission("hr_questions")
+@timed_turn
 def hr_questions():
     if request.is_json:
         data = request.json
@@ -546,7 +794,7 @@ def hr_questions():
             interview.difficulty_level = level
         else:
             interview = ActiveInterview(final_jd, final_resume, level)
-            persist_interview(interview)
+        release_db_connection()
             
         # State machine dict context
         state_dict = {
@@ -578,10 +826,12 @@ def hr_questions():
                 "answer": "In Progress / Unanswered",
                 "score": 0,
                 "feedback": "In Progress...",
-                "session_date": datetime.now()
+                "session_date": datetime.now(),
+                "difficulty_level": interview.difficulty_level
             }
             StoreSession(db_data)
         
+        record_turn_timing(interview, "question")
         persist_interview(interview)
         
         return jsonify({
@@ -604,6 +854,7 @@ def hr_questions():
 # ============================================================
 @app.route("/submit-answer", methods=["POST"])
 @login_required
+@timed_turn
 def submit_answer():
     data        = request.json
     session_id  = data.get("session_id")
@@ -633,10 +884,23 @@ def submit_answer():
         "answer": transcript,
         "score": 0,
         "feedback": "Pending Final Evaluation",
-        "session_date": datetime.now()
+        "session_date": datetime.now(),
+        "difficulty_level": interview.difficulty_level
     }
 
     StoreSession(db_data)
+
+    # Score this answer in the background so /finish-interview only has to summarize.
+    # Resubmitting the same answer reuses the evaluation already stored or running;
+    # over the LLM budget the answer is still saved and the turn is scored at finish
+    if interview.history:
+        payload = turn_payload(interview, len(interview.history), session.get("user_id"), interview.current_stage)
+        if interview.history[-1].get("answer_sha") != payload["answer_sha"] and admit_background("submit_answer"):
+            interview.history[-1]["answer_sha"] = payload["answer_sha"]
+            turn_evaluator.mark_pending(payload)
+            on_commit(lambda: turn_evaluator.submit(payload))
+
+    record_turn_timing(interview, "answer")
     persist_interview(interview)
 
     return jsonify({
@@ -650,6 +914,8 @@ def submit_answer():
 # ============================================================
 @app.route("/finish-interview", methods=["POST"])
 @login_required
+@llm_admission("finish_interview", cost=2)  # one summary call over per-turn results already scored
+@timed_turn
 def finish_interview():
     data = request.json
     session_id = data.get("session_id")
@@ -657,43 +923,43 @@ def finish_interview():
     interview = get_active_interview(session_id)
     if not interview:
         return jsonify({"error": "Invalid or expired session ID"}), 400
+    release_db_connection()
     
     try:
-        feedback = llm_service.evaluate_all(interview)
-        
-        # Extract score using resilient regex avoiding format failures
-        import re
-        score = 0
-        match = re.search(r'(\d+(?:\.\d+)?)\s*/\s*10', feedback)
-        
-        if match:
-            score = float(match.group(1))
-            
-        # Safely Upsert: Guarantee row exists, and force overwrite score/feedback.
         try:
-            conn = get_db_connection()
-            cursor = conn.cursor()
-            topic_str = interview.current_stage if interview.current_stage else "Final Interview Review"
-            question_str = interview.current_question if interview.current_question else "Overall assessment"
-            cursor.execute("""
-                INSERT INTO interview_sessions 
-                (session_id, user_id, topic, question, answer, score, feedback, session_date)
-                VALUES (%s, %s, %s, %s, 'Auto-Completed / Skipped', %s, %s, NOW())
-                ON DUPLICATE KEY UPDATE 
-                feedback = VALUES(feedback),
-                score = VALUES(score)
-            """, (session_id, session.get("user_id"), topic_str, question_str, score, feedback))
-            conn.commit()
-            cursor.close()
-            conn.close()
-        except Exception as db_e:
-            logger.error(f"DB Update Error in finish_interview for session {session_id}: {db_e}")
+            feedback, score = turn_evaluator.final_report(interview, session.get("user_id"))
+        except Exception as e:
+            # No usable turn results: grade the whole transcript in one prompt instead
+            logger.warning(f"Per-turn report unavailable for {session_id}, using evaluate_all: {e}")
+            feedback = llm_service.evaluate_all(interview)
+
+            # Extract score using resilient regex avoiding format failures
+            import re
+            score = 0
+            match = re.search(r'(\d+(?:\.\d+)?)\s*/\s*10', feedback)
+
+            if match:
+                score = float(match.group(1))
+
+        # Store the report and fold it into the user's progress rollup
+        topic_str = interview.current_stage if interview.current_stage else "Final Interview Review"
+        question_str = interview.current_question if interview.current_question else "Overall assessment"
+        FinishSession(session_id, session.get("user_id"), topic_str, question_str, score, feedback)
+
+        # Denormalized report for the feedback page, rendered once here instead of on every view
+        last_turn = interview.history[-1] if interview.history else {}
+        StoreFeedbackReport(session_id, session.get("user_id"), score, feedback, render_feedback_html(feedback),
+                            compact_history(interview.history), question_str, last_turn.get("answer"))
 
         # Update streak and mark session as completed
         user_id = session.get("user_id")
         if user_id:
             UpdateStreak(user_id)
 
+        # Keep the finish step's timing with the session for the admin timeline
+        record_turn_timing(interview, "finish")
+        persist_interview(interview)
+
         return jsonify({
             "status": "success",
             "session_id": session_id,
@@ -738,24 +1004,29 @@ def get_session(session_id):
 @app.route("/api/admin/stats", methods=["GET"])
 @admin_required
 def admin_stats():
-    conn = get_db_connection()
-    cursor = conn.cursor(dictionary=True)
-    
-    # Total Users
-    cursor.execute("SELECT COUNT(*) as count FROM users")
-    total_users = cursor.fetchone()['count']
-    
-    # Total Interview Sessions
-    cursor.execute("SELECT COUNT(*) as count FROM interview_sessions")
-    total_sessions = cursor.fetchone()['count']
-    
-    cursor.close()
-    conn.close()
-    
+    # mode=approx (default) serves Redis counters; mode=exact recounts in MySQL
+    mode = request.args.get("mode", "approx")
+    stats = stats_counters.get_stats(mode)
+    return jsonify({"success": True, **stats})
+
+@app.route("/api/admin/session-timeline/<session_id>", methods=["GET"])
+@admin_required
+def admin_session_timeline(session_id):
+    """Per-turn stage timings recorded with an interview (see record_turn_timing)"""
+    interview = get_active_interview(session_id)
+    if not interview:
+        return jsonify({"success": False, "error": "Session not found"}), 404
+    totals = {}  # exclusive ms per stage, so nested spans are not counted twice
+    for turn in interview.timings:
+        for stage, ms in turn["stages"].items():
+            totals[stage] = round(totals.get(stage, 0) + ms, 1)
     return jsonify({
         "success": True,
-        "total_users": total_users,
-        "total_sessions": total_sessions
+        "session_id": interview.session_id,
+        "started": interview.timestamp,
+        "question_count": interview.question_count,
+        "stage_totals": totals,
+        "turns": interview.timings,
     })
 
 @app.route("/api/admin/requests", methods=["GET"])
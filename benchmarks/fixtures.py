@@ -0,0 +1,89 @@
+"""Realistic inputs for the hot-path benchmarks. Deterministic, so runs compare."""
+import hashlib
+import random
+
+import numpy as np
+
+_rng = random.Random(1234)
+
+_WORDS = ("python flask mysql redis kubernetes latency throughput migration service team customer "
+          "pipeline dashboard incident ownership mentoring design review api cache index query "
+          "deployment monitoring reliability cost analytics stakeholder roadmap delivery").split()
+
+
+def _sentence(words=18):
+    return " ".join(_rng.choice(_WORDS) for _ in range(words)).capitalize() + "."
+
+
+def _paragraph(sentences=4):
+    return " ".join(_sentence() for _ in range(sentences))
+
+
+# ~20 KB resume in ~60 paragraphs, like a pasted multi-page PDF
+LONG_RESUME = "\n\n".join(_paragraph() for _ in range(60))
+
+JD_TEXT = ("Senior backend engineer. " + _paragraph(6)) * 2
+
+# Shape of script.js posture_data after a long answer
+POSTURE = {
+    "duration": 94,
+    "stability": "Mostly stable",
+    "emotion": "neutral",
+    "dominant_emotion": "neutral",
+    "emotion_summary": {"neutral": 61.2, "happy": 18.4, "surprised": 7.9, "sad": 5.1,
+                        "fearful": 4.0, "angry": 2.3, "disgusted": 1.1},
+    "all_probabilities": {"neutral": 0.6123, "happy": 0.1841, "surprised": 0.0792, "sad": 0.0511,
+                          "fearful": 0.0402, "angry": 0.0228, "disgusted": 0.0103},
+    "notes": "Maintained eye contact for most of the answer; brief looks away when recalling numbers. " * 4,
+}
+
+
+def make_history(turns=15):
+    """A finished interview's history: question, ~150-word answer, feedback and posture per turn"""
+    return [{"question": _sentence(16).rstrip(".") + "?",
+             "answer": " ".join(_sentence() for _ in range(8)),
+             "feedback": "Pending Evaluation",
+             "posture": dict(POSTURE)}
+            for _ in range(turns)]
+
+
+HISTORY_15 = make_history(15)
+
+PROGRESS_ROWS = [{"session_date": f"2026-10-{day:02d} 10:00:00", "topic": "Technical | Senior backend",
+                  "score": 6.5 + day % 3, "feedback": _paragraph(30)}
+                 for day in range(1, 6)]
+
+CHAT_HISTORY = [{"role": "user" if i % 2 == 0 else "assistant", "content": _paragraph(2)} for i in range(20)]
+
+# A finished interview's row in feedback_reports (GetFeedbackReport)
+FEEDBACK_REPORT = {"user_id": 1, "score": 7.5, "report_md": _paragraph(40), "report_html": f"<p>{_paragraph(40)}</p>",
+                   "history": HISTORY_15, "last_question": HISTORY_15[-1]["question"],
+                   "last_answer": HISTORY_15[-1]["answer"]}
+
+RAW_QUESTIONS = [
+    'Here is your question: "Can you walk me through the design of the last service you owned?"',
+    "Technical Interview Question: How would you shard a MySQL table that outgrew one primary?",
+    "Question 7: Tell me about a time you disagreed with your manager.",
+    "How do you decide what to cache?",
+]
+
+
+class LocalEmbeddings:
+    """Deterministic stand-in for the Gemini client, so _embed_and_chunk measures only our code"""
+
+    def __init__(self, dim=768):
+        self.dim = dim
+        self._cache = {}
+
+    def _vector(self, text):
+        vec = self._cache.get(text)
+        if vec is None:
+            seed = int.from_bytes(hashlib.sha1(text.encode()).digest()[:8], "big")
+            vec = self._cache[text] = np.random.default_rng(seed).standard_normal(self.dim).tolist()
+        return vec
+
+    def embed_documents(self, texts):
+        return [self._vector(t) for t in texts]
+
+    def embed_query(self, text):
+        return self._vector(text)
@@ -0,0 +1,65 @@
+"""
+Cold-start profile: how long `import app` takes and which imports dominate.
+
+    python benchmarks/import_time.py              # 5 fresh interpreters, top 15 modules
+    python benchmarks/import_time.py --top 30 --runs 10
+
+Each run is a new interpreter with `-X importtime`, so nothing is cached in
+sys.modules. Wall time covers the whole import of app.py, including module
+level initialisation (Flask app, Sentry, metrics, session store) that
+-X importtime attributes to `app` itself.
+"""
+import argparse
+import os
+import re
+import statistics
+import subprocess
+import sys
+from collections import defaultdict
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+LINE = re.compile(r"import time:\s+(\d+) \|\s+(\d+) \|( *)(\S+)")
+PROBE = "import time; t = time.perf_counter(); import app; print('WALL', time.perf_counter() - t)"
+
+
+def run_once():
+    env = dict(os.environ)
+    for name, value in (("groq_Api", "profile"), ("GEMINI_API_KEY", "profile"), ("FLASK_SECRET_KEY", "profile")):
+        env.setdefault(name, value)
+    result = subprocess.run([sys.executable, "-X", "importtime", "-c", PROBE], cwd=ROOT, env=env,
+                            capture_output=True, text=True)
+    if result.returncode != 0:
+        sys.exit(f"import app failed:\n{result.stderr[-2000:]}")
+    wall = float(re.search(r"WALL ([\d.]+)", result.stdout).group(1))
+    cumulative = {}
+    for match in LINE.finditer(result.stderr):
+        _, cumulative_us, _, module = match.groups()
+        cumulative[module] = int(cumulative_us)
+    return wall, cumulative
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Profile the import time of app.py")
+    parser.add_argument("--runs", type=int, default=5)
+    parser.add_argument("--top", type=int, default=15)
+    args = parser.parse_args()
+
+    walls, per_module = [], defaultdict(list)
+    for _ in range(args.runs):
+        wall, cumulative = run_once()
+        walls.append(wall)
+        for module, us in cumulative.items():
+            per_module[module].append(us)
+
+    print(f"import app: median {statistics.median(walls) * 1000:.0f} ms, "
+          f"min {min(walls) * 1000:.0f} ms over {args.runs} runs\n")
+    # Cumulative times nest (a package includes its submodules), so read the
+    # list top-down: the first entries under `app` are where the time goes.
+    print(f"{'module':<48}{'cumulative ms':>14}")
+    top = sorted(per_module.items(), key=lambda item: statistics.median(item[1]), reverse=True)
+    for module, samples in top[:args.top]:
+        print(f"{module:<48}{statistics.median(samples) / 1000:>14.1f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,224 @@
+"""
+Microbenchmarks for the Python code that runs on every interview turn.
+
+    python benchmarks/run.py                   # run and compare with baseline.json
+    python benchmarks/run.py -k prompt         # only benchmarks whose name contains "prompt"
+    python benchmarks/run.py --save            # record a new baseline.json
+
+Each benchmark is timed like pytest-benchmark / timeit: the loop count is
+calibrated so one round takes at least --min-time, then several rounds run and
+the median per-call time is reported. A benchmark counts as a regression when
+its median is more than --threshold slower than the baseline, and the run exits
+non-zero. Baselines only compare on the same machine, so re-record with --save
+when the hardware changes and commit the file with the change that explains it.
+"""
+import argparse
+import json
+import os
+import platform
+import statistics
+import subprocess
+import sys
+import time
+from datetime import datetime
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+for name, value in (("groq_Api", "benchmark"), ("GEMINI_API_KEY", "benchmark"), ("FLASK_SECRET_KEY", "benchmark")):
+    os.environ.setdefault(name, value)   # app.py refuses to import without them; nothing calls out
+
+import fixtures  # noqa: E402
+
+BASELINE = os.path.join(os.path.dirname(os.path.abspath(__file__)), "baseline.json")
+BENCHMARKS = {}
+
+
+def bench(name):
+    """Registers setup(), which returns the zero-argument callable to time"""
+    def decorator(setup):
+        BENCHMARKS[name] = setup
+        return setup
+    return decorator
+
+
+# ── BENCHMARKS ─────────────────────────────────────────────────────────────
+@bench("embed_and_chunk_long_resume")
+def _embed_and_chunk():
+    from Services.Genrator import InterviewGenratSession
+    session = object.__new__(InterviewGenratSession)   # skip the network clients
+    session.embeddings = fixtures.LocalEmbeddings()
+    query = "projects, roles, technologies, and achievements, certification"
+    session._embed_and_chunk(fixtures.LONG_RESUME, query)   # warm the embedding cache
+    return lambda: session._embed_and_chunk(fixtures.LONG_RESUME, query)
+
+
+@bench("question_prompt_15_turns")
+def _question_prompt():
+    from Services.Genrator import build_question_prompt
+    context = f"Job Description: {fixtures.JD_TEXT}\nCandidate Resume Relevant Chunks: {fixtures.LONG_RESUME[:3000]}"
+    return lambda: build_question_prompt("Technical", 7, "hard skills and situational coding/logic", "hard",
+                                         context, fixtures.HISTORY_15)
+
+
+@bench("evaluation_prompt_15_turns")
+def _evaluation_prompt():
+    from Services.Genrator import build_evaluation_prompt
+    interview = _interview()
+    return lambda: build_evaluation_prompt(interview)
+
+
+@bench("clean_question")
+def _clean_question():
+    from Services.Genrator import clean_question
+    return lambda: [clean_question(q) for q in fixtures.RAW_QUESTIONS]
+
+
+@bench("interview_state_json_roundtrip")
+def _state_roundtrip():
+    from app import ActiveInterview
+    interview = _interview()
+    return lambda: ActiveInterview.from_dict(json.loads(json.dumps(interview.to_dict())))
+
+
+@bench("hr_chat_progress_format")
+def _hr_chat_format():
+    from Services.Genrator import format_progress_summary, format_chat_history
+    return lambda: (format_progress_summary(fixtures.PROGRESS_ROWS), format_chat_history(fixtures.CHAT_HISTORY))
+
+
+@bench("hr_chat_context_build")
+def _hr_chat_context():
+    # Runs once per cache miss (Services/chat_context.py), not per chat message
+    from Services.Genrator import build_chat_context
+    return lambda: build_chat_context(fixtures.PROGRESS_ROWS, fixtures.LONG_RESUME)
+
+
+@bench("feedback_report_repeat")
+def _feedback_repeat():
+    # A stored report is compressed once at CACHED_LEVELS and then served from
+    # the compressed cache, whether the view ran or the response cache answered
+    import app
+    from prometheus_client import REGISTRY
+    app.GetFeedbackReport = lambda session_id: fixtures.FEEDBACK_REPORT
+    client = app.app.test_client()
+    with client.session_transaction() as session:
+        session["user_id"] = fixtures.FEEDBACK_REPORT["user_id"]
+
+    def get():
+        response = client.get("/api/feedback/bench-session", headers={"Accept-Encoding": "zstd, br, gzip"})
+        assert response.status_code == 200 and response.headers.get("Content-Encoding"), response.status
+        return response
+
+    def hits():
+        return REGISTRY.get_sample_value("cache_requests_total", {"cache": "compressed", "outcome": "hit"}) or 0
+
+    get()
+    before = hits()
+    get()
+    if hits() != before + 1:
+        raise AssertionError("a repeated stored report was not served from the compressed cache")
+    return get
+
+
+@bench("bcrypt_hash_password")
+def _hash_password():
+    from app import hash_password
+    return lambda: hash_password("correct horse battery staple")
+
+
+@bench("bcrypt_check_password")
+def _check_password():
+    from app import hash_password, check_password
+    hashed = hash_password("correct horse battery staple")
+    return lambda: check_password("correct horse battery staple", hashed)
+
+
+def _interview():
+    from app import ActiveInterview
+    interview = ActiveInterview(fixtures.JD_TEXT, fixtures.LONG_RESUME, "hard")
+    interview.history = fixtures.make_history(15)
+    interview.question_count = 15
+    return interview
+
+
+# ── HARNESS ────────────────────────────────────────────────────────────────
+def measure(func, min_time, rounds):
+    """Median and min seconds per call, timeit-style"""
+    func()  # warm-up
+    loops = 1
+    while True:
+        started = time.perf_counter()
+        for _ in range(loops):
+            func()
+        elapsed = time.perf_counter() - started
+        if elapsed >= min_time:
+            break
+        loops *= 2 if elapsed == 0 else max(2, min(10, int(min_time / elapsed) + 1))
+    samples = [elapsed / loops]
+    for _ in range(rounds - 1):
+        started = time.perf_counter()
+        for _ in range(loops):
+            func()
+        samples.append((time.perf_counter() - started) / loops)
+    return {"median_us": round(statistics.median(samples) * 1e6, 2),
+            "min_us": round(min(samples) * 1e6, 2), "loops": loops, "rounds": rounds}
+
+
+def machine():
+    try:
+        commit = subprocess.check_output(["git", "rev-parse", "--short", "HEAD"], cwd=ROOT, text=True).strip()
+    except (OSError, subprocess.CalledProcessError):
+        commit = "unknown"
+    return {"python": platform.python_version(), "platform": platform.platform(),
+            "processor": platform.processor() or platform.machine(), "cpus": os.cpu_count(),
+            "commit": commit, "recorded": datetime.utcnow().isoformat(timespec="seconds")}
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Hot-path microbenchmarks")
+    parser.add_argument("-k", dest="pattern", default="", help="only run benchmarks whose name contains this")
+    parser.add_argument("--min-time", type=float, default=0.2, help="seconds per round (default 0.2)")
+    parser.add_argument("--rounds", type=int, default=5)
+    parser.add_argument("--threshold", type=float, default=0.25, help="allowed slowdown before flagging (0.25 = 25%%)")
+    parser.add_argument("--baseline", default=BASELINE)
+    parser.add_argument("--save", action="store_true", help="write the results as the new baseline")
+    args = parser.parse_args()
+
+    baseline = {}
+    if os.path.exists(args.baseline) and not args.save:
+        with open(args.baseline) as f:
+            baseline = json.load(f).get("benchmarks", {})
+
+    results, regressions = {}, []
+    print(f"{'benchmark':<34}{'median':>12}{'min':>12}{'baseline':>12}{'change':>9}")
+    for name, setup in BENCHMARKS.items():
+        if args.pattern not in name:
+            continue
+        result = results[name] = measure(setup(), args.min_time, args.rounds)
+        line = f"{name:<34}{_fmt(result['median_us']):>12}{_fmt(result['min_us']):>12}"
+        old = baseline.get(name)
+        if old:
+            change = result["median_us"] / old["median_us"] - 1
+            flag = "  REGRESSION" if change > args.threshold else ""
+            if flag:
+                regressions.append(name)
+            line += f"{_fmt(old['median_us']):>12}{change:>+9.0%}{flag}"
+        print(line)
+
+    if args.save:
+        with open(args.baseline, "w") as f:
+            json.dump({"machine": machine(), "benchmarks": results}, f, indent=2)
+            f.write("\n")
+        print(f"\nBaseline written to {args.baseline}")
+    elif regressions:
+        print(f"\n{len(regressions)} regression(s) over {args.threshold:.0%}: {', '.join(regressions)}")
+        return 1
+    return 0
+
+
+def _fmt(us):
+    return f"{us / 1000:.2f} ms" if us >= 1000 else f"{us:.1f} us"
+
+
+if __name__ == "__main__":
+    sys.exit(main())
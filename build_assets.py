@@ -0,0 +1,24 @@
+"""
+Builds static/dist: content-hashed copies of everything under static/, with
+brotli and gzip variants and the manifest that asset_url() reads.
+
+    python build_assets.py           # after changing anything under static/
+    python build_assets.py --prune   # also drop hashed files no longer listed
+
+The Dockerfile runs it during the image build.
+"""
+import os
+import argparse
+from Services.static_assets import build, STATIC_DIST, STATIC_MANIFEST
+
+STATIC_FOLDER = os.path.join(os.path.dirname(os.path.abspath(__file__)), "static")
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Build content-hashed, precompressed static assets")
+    parser.add_argument("--static", default=STATIC_FOLDER)
+    parser.add_argument("--prune", action="store_true", help="delete hashed files the new manifest does not list")
+    args = parser.parse_args()
+
+    manifest = build(args.static, prune=args.prune)
+    print(f"✅ {len(manifest['assets'])} assets, {len(manifest['encodings'])} precompressed. "
+          f"Manifest: {os.path.join(args.static, STATIC_DIST, STATIC_MANIFEST)}")
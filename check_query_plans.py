@@ -0,0 +1,256 @@
+"""
+Query-plan regression check.
+
+Collects every SQL statement passed to ``cursor.execute`` in database_con.py
+and app.py, runs ``EXPLAIN`` for each one against a seeded MySQL database and
+exits non-zero when a statement needs a full table or full index scan.
+
+Run it against a local / throwaway database only (it inserts seed rows):
+
+    python setup_db.py && python check_query_plans.py
+"""
+import ast
+import os
+import re
+import sys
+from datetime import date, datetime
+
+import mysql.connector
+from dotenv import load_dotenv
+
+load_dotenv()
+
+SOURCES = ["database_con.py", "app.py"]
+
+# Statements allowed to scan a whole table, with the reason they are acceptable.
+ALLOWED_FULL_SCANS = {
+    "SELECT COUNT(*) as count FROM users": "periodic stats reconcile",
+    "SELECT COUNT(*) as count FROM interview_sessions": "periodic stats reconcile",
+    "SELECT DATE(session_date) AS day, COUNT(*) AS count FROM interview_sessions "
+    "WHERE session_date >= CURDATE() - INTERVAL %s DAY GROUP BY day": "periodic stats reconcile",
+    "SELECT COALESCE(difficulty_level, 'unknown') AS level, COUNT(*) AS count "
+    "FROM interview_sessions GROUP BY level": "periodic stats reconcile",
+    "SELECT TRIM(SUBSTRING_INDEX(topic, '|', 1)) AS stage, COUNT(*) AS count "
+    "FROM interview_sessions GROUP BY stage": "periodic stats reconcile",
+}
+
+# Statements assembled at runtime, which collect_queries() cannot see. Keep in
+# sync with the helpers named on the left.
+DYNAMIC_QUERIES = [
+    ("database_con.GetUserSessions",
+     "SELECT session_id, session_date, topic, score, LEFT(feedback, 200) AS feedback_preview "
+     "FROM interview_sessions WHERE user_id = %s "
+     "AND (session_date < %s OR (session_date = %s AND session_id < %s)) "
+     "ORDER BY session_date DESC, session_id DESC LIMIT %s"),
+]
+
+# Seed sizes: large enough that the optimizer prefers an index over a scan.
+SEED_USERS = 200
+SEED_SESSIONS_PER_USER = 25
+SEED_QUESTIONS = 2000
+
+SAMPLE_VALUES = {
+    "user_id": 1,
+    "session_id": "seed-1-1",
+    "topic": "Technical",
+    "question": "q",
+    "answer": "a",
+    "score": 5,
+    "feedback": "f",
+    "email": "seed1@example.com",
+    "name": "Seed User",
+    "password": "x",
+    "admin_request_status": "pending",
+    "role": "user",
+    "resume_text": "resume",
+    "difficulty_level": "medium",
+    "question_phase": "Technical",
+    "question_text": "Seed question 1",
+    "job_description": "jd",
+    "status": "Started",
+    "session_date": date.today(),
+    "streak_count": 1,
+    "last_active_date": date.today(),
+    "state_data": "{}",
+    "id": 1,
+}
+
+SQL_START = re.compile(r"^\s*(SELECT|INSERT|UPDATE|DELETE|REPLACE|CREATE|ALTER)\b", re.IGNORECASE)
+COMPARED_COLUMN = re.compile(r"(\w+)\s*(?:=|<=|>=|<|>|!=)\s*%s")
+INSERT_COLUMNS = re.compile(r"INSERT\s+INTO\s+\w+\s*\(([^)]*)\)\s*VALUES\s*\(", re.IGNORECASE | re.DOTALL)
+
+
+def normalize(sql):
+    return " ".join(sql.split())
+
+
+def collect_queries(path):
+    """Returns [(lineno, sql)] for the string literals handed to cursor.execute in path"""
+    tree = ast.parse(open(path, encoding="utf-8").read(), filename=path)
+    found = {}
+    for func in ast.walk(tree):
+        if not isinstance(func, (ast.FunctionDef, ast.AsyncFunctionDef)):
+            continue
+        assigned = []
+        for node in ast.walk(func):
+            if (isinstance(node, ast.Assign) and len(node.targets) == 1
+                    and isinstance(node.targets[0], ast.Name)
+                    and isinstance(node.value, ast.Constant) and isinstance(node.value.value, str)):
+                assigned.append((node.lineno, node.targets[0].id, node.value.value))
+        for node in ast.walk(func):
+            if not (isinstance(node, ast.Call) and isinstance(node.func, ast.Attribute)
+                    and node.func.attr == "execute" and node.args):
+                continue
+            arg = node.args[0]
+            sql = None
+            if isinstance(arg, ast.Constant) and isinstance(arg.value, str):
+                sql = arg.value
+            elif isinstance(arg, ast.Name):
+                candidates = [v for line, name, v in assigned if name == arg.id and line < node.lineno]
+                sql = candidates[-1] if candidates else None
+            if sql is None:
+                print(f"  skip {path}:{node.lineno} (dynamic SQL)")
+                continue
+            if SQL_START.match(sql):
+                found[node.lineno] = sql
+    return sorted(found.items())
+
+
+def split_top_level(values_sql):
+    """Splits the body of a VALUES (...) tuple on commas outside quotes and parentheses"""
+    items, depth, quote, current = [], 0, None, ""
+    for ch in values_sql:
+        if quote:
+            current += ch
+            if ch == quote:
+                quote = None
+            continue
+        if ch in "'\"":
+            quote = ch
+        elif ch == "(":
+            depth += 1
+        elif ch == ")":
+            if depth == 0:
+                break
+            depth -= 1
+        elif ch == "," and depth == 0:
+            items.append(current.strip())
+            current = ""
+            continue
+        current += ch
+    items.append(current.strip())
+    return items
+
+
+def sample_params(sql):
+    """Builds plausible parameters for every %s placeholder in sql, in order"""
+    columns = {}
+    match = INSERT_COLUMNS.search(sql)
+    if match:
+        names = [c.strip() for c in match.group(1).split(",")]
+        offset = match.end()
+        position = offset
+        for name, item in zip(names, split_top_level(sql[offset:])):
+            position = sql.index(item, position)
+            if item == "%s":
+                columns[position] = name
+            position += len(item)
+    for m in COMPARED_COLUMN.finditer(sql):
+        columns[m.end() - 2] = m.group(1)
+
+    params = []
+    for m in re.finditer(r"%s", sql):
+        column = columns.get(m.start())
+        preceding = sql[:m.start()].rstrip().upper()
+        if column is None and preceding.endswith(("LIMIT", "INTERVAL")):
+            params.append(10)
+        else:
+            params.append(SAMPLE_VALUES.get(column, "x"))
+    return tuple(params)
+
+
+def seed(cursor):
+    cursor.execute("SELECT COUNT(*) FROM users")
+    if cursor.fetchone()[0] >= SEED_USERS:
+        return
+    print("Seeding tables...")
+    cursor.executemany(
+        "INSERT IGNORE INTO users (user_id, name, email, password, admin_request_status) VALUES (%s, %s, %s, %s, %s)",
+        [(u, f"Seed {u}", f"seed{u}@example.com", "x", "pending" if u % 50 == 0 else "none")
+         for u in range(1, SEED_USERS + 1)],
+    )
+    now = datetime.now()
+    cursor.executemany(
+        "INSERT IGNORE INTO interview_sessions (session_id, user_id, topic, question, answer, score, feedback, session_date) "
+        "VALUES (%s, %s, 'Technical', 'q', 'a', 5, 'f', %s)",
+        [(f"seed-{u}-{n}", u, now.replace(microsecond=0, second=n % 60))
+         for u in range(1, SEED_USERS + 1) for n in range(SEED_SESSIONS_PER_USER)],
+    )
+    cursor.executemany(
+        "INSERT INTO sessions (user_id, session_date, status) VALUES (%s, DATE_SUB(CURDATE(), INTERVAL %s DAY), 'Completed')",
+        [(u, d) for u in range(1, SEED_USERS + 1) for d in range(10)],
+    )
+    levels, phases = ["easy", "medium", "hard"], ["Introduction", "Resume-Deep Dive", "Technical", "Situational/HR"]
+    cursor.executemany(
+        "INSERT INTO generated_questions (job_description, difficulty_level, question_phase, question_text) VALUES ('jd', %s, %s, %s)",
+        [(levels[i % 3], phases[i % 4], f"Seed question {i}") for i in range(SEED_QUESTIONS)],
+    )
+    for table in ("users", "interview_sessions", "sessions", "generated_questions"):
+        cursor.execute(f"ANALYZE TABLE {table}")
+        cursor.fetchall()
+
+
+def explain(cursor, sql):
+    """Returns the EXPLAIN rows of sql that read a whole table or index"""
+    cursor.execute("EXPLAIN " + sql, sample_params(sql))
+    rows = cursor.fetchall()
+    return [r for r in rows
+            if r["table"] and r["select_type"] not in ("INSERT", "REPLACE")
+            and r["type"] in ("ALL", "index")]
+
+
+def main():
+    db_config = {
+        "host":     os.getenv("DB_HOST", "localhost"),
+        "user":     os.getenv("DB_USER", "root"),
+        "password": os.getenv("DB_PASSWORD", "manager"),
+        "database": os.getenv("DB_NAME", "interview_tracker"),
+        "port":     int(os.getenv("DB_PORT") or 3306)
+    }
+    conn = mysql.connector.connect(**db_config)
+    cursor = conn.cursor()
+    seed(cursor)
+    conn.commit()
+    cursor.close()
+
+    statements = [(f"{path}:{lineno}", sql) for path in SOURCES for lineno, sql in collect_queries(path)]
+    statements += DYNAMIC_QUERIES
+
+    failures = 0
+    cursor = conn.cursor(dictionary=True)
+    for location, sql in statements:
+        if re.match(r"^\s*(CREATE|ALTER)\b", sql, re.IGNORECASE):
+            continue
+        flat = normalize(sql)
+        scans = explain(cursor, sql)
+        conn.rollback()
+        if not scans:
+            print(f"  ok   {location} {flat[:80]}")
+        elif flat in ALLOWED_FULL_SCANS:
+            print(f"  allow {location} {flat[:80]} ({ALLOWED_FULL_SCANS[flat]})")
+        else:
+            failures += 1
+            tables = ", ".join(f"{r['table']} ({r['type']})" for r in scans)
+            print(f"  FULL SCAN {location} {flat[:80]} -> {tables}")
+    cursor.close()
+    conn.close()
+
+    if failures:
+        print(f"\n{failures} statement(s) scan a full table. Add an index or rewrite the query.")
+        return 1
+    print("\nAll query plans use indexes.")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -1,8 +1,19 @@
 import mysql.connector
-from mysql.connector import pooling
 import os
 import logging
+import threading
+import collections
+import time
+import json
+import base64
+from datetime import datetime, timedelta
 from dotenv import load_dotenv
+from flask import g, has_request_context
+from prometheus_client import Counter, Gauge, Histogram
+from Services.cache import get_redis, redis_failed
+from Services.counters import stats_counters, session_stage
+from Services.response_cache import bump_version
+from Services.instrumentation import span, cache_outcome
 
 load_dotenv()
 logger = logging.getLogger(__name__)
@@ -28,23 +39,467 @@ if ssl_ca and os.path.exists(ssl_ca):
     db_config["ssl_verify_cert"] = True
     logger.info(f"SSL CA certificate enabled: {ssl_ca}")
 
-try:
-    connection_pool = mysql.connector.pooling.MySQLConnectionPool(
-        pool_name="skillup_pool",
-        pool_size=5,
-        pool_reset_session=True,
-        **db_config
-    )
-    logger.info("Database connection pool initialized")
-except Exception as e:
-    logger.error(f"Failed to initialize DB connection pool: {e}")
-    connection_pool = None
+# ── POOL CONFIG ────────────────────────────────────────────────────────────
+# One connection per request thread (GUNICORN_THREADS, exported by
+# gunicorn.conf.py) plus the background turn-evaluation threads, which check
+# out their own (Services/turn_evaluation.py)
+DB_POOL_SIZE = int(os.getenv("DB_POOL_SIZE")
+                   or int(os.getenv("GUNICORN_THREADS") or 1) + int(os.getenv("TURN_EVAL_WORKERS") or 4))
+DB_POOL_TIMEOUT = float(os.getenv("DB_POOL_TIMEOUT") or 5)                  # seconds to wait for a free slot
+DB_POOL_MAX_LIFETIME = float(os.getenv("DB_POOL_MAX_LIFETIME") or 1800)     # recycle connections after this
+DB_POOL_PING_AFTER = float(os.getenv("DB_POOL_PING_AFTER") or 30)           # ping idle connections older than this
+DB_POOL_RECONNECT_INTERVAL = float(os.getenv("DB_POOL_RECONNECT_INTERVAL") or 15)
+
+POOL_CONNECTIONS = Gauge("db_pool_connections", "MySQL pool connections by state", ["state"])
+POOL_WAIT_SECONDS = Histogram(
+    "db_pool_wait_seconds", "Time spent waiting for a pooled MySQL connection",
+    buckets=(0.001, 0.005, 0.01, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10)
+)
+POOL_TIMEOUTS = Counter("db_pool_timeouts_total", "Checkouts that gave up waiting for a pooled MySQL connection")
+
+
+class PoolTimeoutError(Exception):
+    """Raised when no pooled connection frees up within DB_POOL_TIMEOUT"""
+
+
+class PooledConnection:
+    """Proxy around a pooled MySQL connection; close() hands it back to the pool"""
+
+    def __init__(self, pool, cnx, created_at):
+        self._pool = pool
+        self._cnx = cnx
+        self._created_at = created_at
+
+    def __getattr__(self, name):
+        return getattr(self._cnx, name)
+
+    def close(self):
+        if self._cnx is None:
+            return
+        cnx, self._cnx = self._cnx, None
+        self._pool._release(cnx, self._created_at)
+
+
+class ConnectionPool:
+    """
+    Bounded MySQL connection pool.
+
+    Callers wait up to `timeout` seconds for a free slot instead of failing as
+    soon as every connection is checked out. Idle connections are pinged before
+    reuse when they have been parked for a while, recycled once they outlive
+    `max_lifetime`, and replaced by a background thread so requests never pay
+    for a reconnect when the database comes back after an outage.
+
+    Fork-safe: a process forked from the one that opened connections (gunicorn
+    --preload) starts with an empty pool instead of sharing the parent's
+    sockets, see after_fork().
+    """
+
+    def __init__(self, size, timeout, max_lifetime, ping_after, reconnect_interval, reset_session=True, **config):
+        self.size = size
+        self.timeout = timeout
+        self.max_lifetime = max_lifetime
+        self.ping_after = ping_after
+        self.reconnect_interval = reconnect_interval
+        self.reset_session = reset_session
+        self.config = config
+        self._reset_state()
+        POOL_CONNECTIONS.labels("in_use").set_function(lambda: self._in_use)
+        POOL_CONNECTIONS.labels("idle").set_function(lambda: len(self._idle))
+
+    def _reset_state(self):
+        self._pid = os.getpid()
+        self._slots = threading.BoundedSemaphore(self.size)
+        self._idle = collections.deque()  # (cnx, created_at, returned_at)
+        self._lock = threading.Lock()
+        self._in_use = 0
+        self._maintainer = None
+
+    def after_fork(self):
+        """
+        Forgets connections inherited from the parent process. They are dropped,
+        not closed: closing would send COM_QUIT on a socket the parent still
+        uses. Locks and the maintainer thread do not survive a fork either.
+        """
+        if self._pid != os.getpid():
+            self._reset_state()
+
+    def get_connection(self):
+        self.after_fork()
+        self._start_maintainer()
+        started = time.monotonic()
+        if not self._slots.acquire(timeout=self.timeout):
+            POOL_TIMEOUTS.inc()
+            raise PoolTimeoutError(f"No database connection available after {self.timeout:.1f}s")
+        POOL_WAIT_SECONDS.observe(time.monotonic() - started)
+        try:
+            cnx, created_at = self._checkout()
+        except Exception:
+            self._slots.release()
+            raise
+        with self._lock:
+            self._in_use += 1
+        return PooledConnection(self, cnx, created_at)
+
+    def _checkout(self):
+        while True:
+            with self._lock:
+                item = self._idle.pop() if self._idle else None  # LIFO keeps the warmest connection busy
+            if item is None:
+                return mysql.connector.connect(**self.config), time.monotonic()
+            cnx, created_at, returned_at = item
+            now = time.monotonic()
+            if now - created_at > self.max_lifetime:
+                self._discard(cnx)
+            elif now - returned_at > self.ping_after and not self._is_alive(cnx):
+                self._discard(cnx)
+            else:
+                return cnx, created_at
+
+    def _release(self, cnx, created_at):
+        try:
+            if time.monotonic() - created_at > self.max_lifetime:
+                self._discard(cnx)
+            else:
+                if self.reset_session:
+                    cnx.reset_session()
+                self._park((cnx, created_at, time.monotonic()))
+        except Exception as e:
+            logger.warning(f"Dropping pooled connection that failed to reset: {e}")
+            self._discard(cnx)
+        finally:
+            with self._lock:
+                self._in_use -= 1
+            self._slots.release()
+
+    def _park(self, item, front=False):
+        """Returns a connection to the idle set unless it is already full"""
+        with self._lock:
+            if len(self._idle) < self.size:
+                if front:
+                    self._idle.appendleft(item)
+                else:
+                    self._idle.append(item)
+                return
+        self._discard(item[0])
+
+    @staticmethod
+    def _is_alive(cnx):
+        try:
+            cnx.ping(reconnect=False)
+            return True
+        except Exception:
+            return False
+
+    @staticmethod
+    def _discard(cnx):
+        try:
+            cnx.close()
+        except Exception:
+            pass
+
+    def _start_maintainer(self):
+        if self._maintainer is not None:
+            return
+        with self._lock:
+            if self._maintainer is None:
+                self._maintainer = threading.Thread(target=self._maintain, name="db-pool-maintainer", daemon=True)
+                self._maintainer.start()
+
+    def _maintain(self):
+        """Recycles stale idle connections off the request path and reconnects after outages"""
+        healthy = True
+        while True:
+            time.sleep(self.reconnect_interval)
+            now = time.monotonic()
+            with self._lock:
+                stale = [item for item in self._idle
+                         if now - item[1] > self.max_lifetime or now - item[2] > self.ping_after]
+                for item in stale:
+                    self._idle.remove(item)
+            for cnx, created_at, returned_at in stale:
+                if now - created_at <= self.max_lifetime and self._is_alive(cnx):
+                    self._park((cnx, created_at, time.monotonic()), front=True)
+                    continue
+                self._discard(cnx)
+                try:
+                    fresh = mysql.connector.connect(**self.config)
+                except Exception as e:
+                    if healthy:
+                        logger.error(f"DB pool reconnect failed, retrying every {self.reconnect_interval:.0f}s: {e}")
+                    healthy = False
+                    continue
+                if not healthy:
+                    logger.info("DB pool reconnected")
+                healthy = True
+                self._park((fresh, time.monotonic(), time.monotonic()), front=True)
+
+
+connection_pool = ConnectionPool(
+    size=DB_POOL_SIZE,
+    timeout=DB_POOL_TIMEOUT,
+    max_lifetime=DB_POOL_MAX_LIFETIME,
+    ping_after=DB_POOL_PING_AFTER,
+    reconnect_interval=DB_POOL_RECONNECT_INTERVAL,
+    reset_session=True,
+    **db_config
+)
+logger.info(f"Database connection pool configured (size={DB_POOL_SIZE}, timeout={DB_POOL_TIMEOUT}s)")
+
+class RequestConnection:
+    """
+    The connection shared by every helper that runs inside one Flask request.
+
+    Helpers never see it directly: get_db_connection() hands each of them a
+    HelperConnection over it. The request's writes are committed together (or
+    rolled back) by end_request_transaction() when the request finishes.
+    """
+
+    def __init__(self, cnx):
+        self._cnx = cnx
+        self._savepoints = 0
+        self.failed = False     # a helper's writes could not be undone; roll the request back
+
+
+class HelperConnection:
+    """
+    One helper's handle on the request's connection.
+
+    commit() is a no-op here and close() only releases the handle. Before the
+    helper's first write a SAVEPOINT is set, and close() without a commit()
+    after it rolls back to it, so a helper that fails midway (and returns
+    False) leaves none of its writes in the request's transaction, as when
+    each helper had its own connection. Reads never set one. Cursors are
+    buffered so a helper that stops reading early cannot leave unread rows
+    behind for the next helper.
+    """
+
+    def __init__(self, request_conn):
+        self._request_conn = request_conn
+        self._cnx = request_conn._cnx
+        self._savepoint = None
+        self._callbacks = 0
+
+    def __getattr__(self, name):
+        return getattr(self._cnx, name)
+
+    def cursor(self, *args, **kwargs):
+        kwargs.setdefault("buffered", True)
+        return _HelperCursor(self, self._cnx.cursor(*args, **kwargs))
+
+    def _before_write(self):
+        if self._savepoint is not None:
+            return
+        self._request_conn._savepoints += 1
+        name = f"helper_{self._request_conn._savepoints}"
+        cursor = self._cnx.cursor()
+        cursor.execute(f"SAVEPOINT {name}")
+        cursor.close()
+        self._savepoint = name
+        self._callbacks = len(g.get("_db_on_commit", []))
+
+    def commit(self):
+        self._savepoint = None
+
+    def rollback(self):
+        if self._savepoint is None:
+            return
+        name, self._savepoint = self._savepoint, None
+        # on_commit callbacks registered since the savepoint belong to the undone writes
+        del g.get("_db_on_commit", [])[self._callbacks:]
+        try:
+            cursor = self._cnx.cursor()
+            cursor.execute(f"ROLLBACK TO SAVEPOINT {name}")
+            cursor.close()
+        except Exception as e:
+            logger.error(f"Rollback to {name} failed, rolling back the request: {e}")
+            self._request_conn.failed = True
+
+    def close(self):
+        self.rollback()
+
+
+class _HelperCursor:
+    """Cursor proxy that sets its helper's savepoint before the first write"""
+
+    def __init__(self, conn, cursor):
+        self._conn = conn
+        self._cursor = cursor
+
+    def __getattr__(self, name):
+        return getattr(self._cursor, name)
+
+    def execute(self, operation, *args, **kwargs):
+        if operation.lstrip()[:6].upper() != "SELECT":
+            self._conn._before_write()
+        return self._cursor.execute(operation, *args, **kwargs)
+
+    def executemany(self, operation, *args, **kwargs):
+        self._conn._before_write()
+        return self._cursor.executemany(operation, *args, **kwargs)
+
 
 def get_db_connection():
-    if connection_pool:
+    """
+    Returns a handle on the request's unit-of-work connection inside a Flask
+    request, or a plain pooled connection elsewhere (workers, scripts). Pooled
+    checkouts wait up to DB_POOL_TIMEOUT for a free slot.
+    """
+    if not has_request_context():
         return connection_pool.get_connection()
-    return mysql.connector.connect(**db_config)
+    conn = g.get("_db_conn")
+    if conn is None:
+        conn = RequestConnection(connection_pool.get_connection())
+        g._db_conn = conn
+    return HelperConnection(conn)
+
+def end_request_transaction(commit=True):
+    """Commits or rolls back the request's unit of work and returns its connection to the pool"""
+    conn = g.pop("_db_conn", None)
+    callbacks = g.pop("_db_on_commit", [])
+    if conn is None:
+        return
+    try:
+        if commit and not conn.failed:
+            conn._cnx.commit()
+        else:
+            conn._cnx.rollback()
+            callbacks = []
+    finally:
+        conn._cnx.close()
+    for callback in callbacks:
+        try:
+            callback()
+        except Exception as e:
+            logger.error(f"on_commit callback failed: {e}")
+
+def on_commit(callback):
+    """
+    Runs callback once the current request's writes are committed, so caches
+    and counters never see rolled-back rows. Outside a request (or with no
+    open unit of work) the helper has already committed and it runs at once.
+    """
+    if has_request_context() and g.get("_db_conn") is not None:
+        g.setdefault("_db_on_commit", []).append(callback)
+    else:
+        callback()
+
+def release_db_connection():
+    """
+    Ends the current unit of work early. Call it before slow LLM calls so a
+    request does not sit on a pool slot while waiting on the network; the next
+    helper call lazily checks out a fresh connection.
+    """
+    if has_request_context():
+        end_request_transaction(commit=True)
+
+def init_request_transactions(app):
+    """Binds one DB connection and transaction to each request of app"""
+
+    @app.after_request
+    def _commit_request_transaction(response):
+        end_request_transaction(commit=response.status_code < 500)
+        return response
+
+    @app.teardown_request
+    def _release_request_connection(exc):
+        end_request_transaction(commit=False)
+
+# Tables the helpers below create on first use when setup_db.py has not run.
+# DDL implicitly commits in MySQL, so it runs once per process on its own
+# connection rather than inside a request's unit of work.
+LAZY_TABLES = {
+    "generated_questions": """
+        CREATE TABLE IF NOT EXISTS generated_questions (
+            id INT AUTO_INCREMENT PRIMARY KEY,
+            job_description TEXT,
+            difficulty_level VARCHAR(50),
+            question_phase VARCHAR(100),
+            question_text TEXT,
+            INDEX idx_questions_level_phase (difficulty_level, question_phase),
+            INDEX idx_questions_text (question_text(255))
+        )
+    """,
+    "session_metadata": """
+        CREATE TABLE IF NOT EXISTS session_metadata (
+            session_id VARCHAR(100) PRIMARY KEY,
+            state_data LONGTEXT,
+            updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP ON UPDATE CURRENT_TIMESTAMP
+        )
+    """,
+    "user_progress": """
+        CREATE TABLE IF NOT EXISTS user_progress (
+            user_id INT PRIMARY KEY,
+            session_count INT NOT NULL DEFAULT 0,
+            scored_count INT NOT NULL DEFAULT 0,
+            score_sum DECIMAL(10,1) NOT NULL DEFAULT 0,
+            best_score DECIMAL(3,1),
+            last_scores JSON,
+            stage_stats JSON,
+            streak_count INT NOT NULL DEFAULT 0,
+            last_active_date DATE,
+            today_date DATE,
+            today_status VARCHAR(50),
+            updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP ON UPDATE CURRENT_TIMESTAMP,
+            FOREIGN KEY (user_id) REFERENCES users(user_id)
+        )
+    """,
+    "feedback_reports": """
+        CREATE TABLE IF NOT EXISTS feedback_reports (
+            session_id VARCHAR(100) PRIMARY KEY,
+            user_id INT,
+            score DECIMAL(3,1),
+            report_md MEDIUMTEXT,
+            report_html MEDIUMTEXT,
+            history JSON,
+            last_question TEXT,
+            last_answer TEXT,
+            created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+        )
+    """,
+    "turn_evaluations": """
+        CREATE TABLE IF NOT EXISTS turn_evaluations (
+            session_id VARCHAR(100) NOT NULL,
+            turn INT NOT NULL,
+            user_id INT,
+            answer_sha CHAR(16),
+            status VARCHAR(10) NOT NULL DEFAULT 'pending',
+            score DECIMAL(3,1),
+            evaluation JSON,
+            updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP ON UPDATE CURRENT_TIMESTAMP,
+            PRIMARY KEY (session_id, turn)
+        )
+    """,
+}
+_ensured_tables = set()
+
+def ensure_lazy_tables():
+    """Creates every missing table of LAZY_TABLES on one connection; app.warm_up() runs it"""
+    missing = [name for name in LAZY_TABLES if name not in _ensured_tables]
+    if not missing:
+        return
+    conn = connection_pool.get_connection()
+    try:
+        cursor = conn.cursor()
+        for name in missing:
+            cursor.execute(LAZY_TABLES[name])
+            _ensured_tables.add(name)
+        cursor.close()
+    finally:
+        conn.close()
+
+def EnsureTable(name):
+    """Creates one of LAZY_TABLES the first time this process needs it"""
+    if name in _ensured_tables:
+        return
+    if has_request_context() and g.get("_db_conn") is not None:
+        # The request already holds a pool slot: a second checkout could wait
+        # on the pool, and DDL on its own connection would commit its unit of
+        # work. Warm-up creates the tables; until then assume setup_db.py did.
+        return
+    ensure_lazy_tables()
 
+@span("db")
 def StoreSession(session_data):
     """Stores interview session data in MySQL database"""
     conn = None
@@ -53,8 +508,8 @@ def StoreSession(session_data):
         cursor = conn.cursor()
         query = """
         INSERT INTO interview_sessions
-        (session_id, user_id, topic, question, answer, score, feedback, session_date)
-        VALUES (%s, %s, %s, %s, %s, %s, %s, %s)
+        (session_id, user_id, topic, question, answer, score, feedback, session_date, difficulty_level)
+        VALUES (%s, %s, %s, %s, %s, %s, %s, %s, %s)
         ON DUPLICATE KEY UPDATE
         topic = VALUES(topic),
         question = VALUES(question),
@@ -69,10 +524,16 @@ def StoreSession(session_data):
             session_data["answer"],
             session_data["score"],
             session_data["feedback"],
-            session_data["session_date"]
+            session_data["session_date"],
+            session_data.get("difficulty_level")
         )
         cursor.execute(query, values)
+        inserted = cursor.rowcount == 1  # 1 = inserted, 2 = updated an existing row
         conn.commit()
+        if inserted:
+            on_commit(lambda: stats_counters.session_created(
+                session_data["session_date"], session_data.get("difficulty_level"), session_data["topic"]))
+        on_commit(lambda: bump_version(session_data["user_id"], "sessions"))
         cursor.close()
         logger.info(f"Session {session_data['session_id']} stored successfully")
         return True
@@ -82,21 +543,14 @@ def StoreSession(session_data):
     finally:
         if conn: conn.close()
 
+@span("db")
 def StoreGeneratedQuestion(jd, level, phase, question):
     """Stores generated interview question in structured format"""
     conn = None
     try:
+        EnsureTable("generated_questions")
         conn = get_db_connection()
         cursor = conn.cursor()
-        cursor.execute("""
-        CREATE TABLE IF NOT EXISTS generated_questions (
-            id INT AUTO_INCREMENT PRIMARY KEY,
-            job_description TEXT,
-            difficulty_level VARCHAR(50),
-            question_phase VARCHAR(100),
-            question_text TEXT
-        )
-        """)
         cursor.execute("SELECT id FROM generated_questions WHERE question_text = %s", (question,))
         if not cursor.fetchone():
             query = "INSERT INTO generated_questions (job_description, difficulty_level, question_phase, question_text) VALUES (%s, %s, %s, %s)"
@@ -110,6 +564,7 @@ def StoreGeneratedQuestion(jd, level, phase, question):
     finally:
         if conn: conn.close()
 
+@span("db")
 def GetFallbackQuestions(level, phase=None):
     """Retrieves questions from DB based on level and optionally phase"""
     conn = None
@@ -131,84 +586,102 @@ def GetFallbackQuestions(level, phase=None):
     finally:
         if conn: conn.close()
 
-def CheckDailyLimit(user_id):
-    """Checks if the user has already completed an interview today"""
-    conn = None
+# ── DAILY ATTEMPTS & STREAKS ───────────────────────────────────────────────
+# sessions has one row per (user_id, session_date) (uq_daily_user_date), so
+# every write below is a single atomic upsert instead of SELECT-then-write.
+STREAK_CACHE_TTL = int(os.getenv("STREAK_CACHE_TTL") or 300)
+
+def _streak_cache_key(user_id):
+    return f"streak:{user_id}"
+
+def ForgetStreakInfo(user_id):
+    """Drops the cached /user-profile streak info; call after the write commits"""
+    r = get_redis()
+    if r is None:
+        return
     try:
-        conn = get_db_connection()
-        cursor = conn.cursor(dictionary=True)
-        query = "SELECT id FROM sessions WHERE user_id = %s AND session_date = CURDATE() AND status = 'Completed'"
-        cursor.execute(query, (user_id,))
-        res = cursor.fetchone()
-        cursor.close()
-        return res is not None
+        r.delete(_streak_cache_key(user_id))
     except Exception as e:
-        logger.error(f"Error CheckDailyLimit: {e}")
-        return False
-    finally:
-        if conn: conn.close()
+        redis_failed(e)
+
+def _forget_streak_on_commit(user_id):
+    def forget():
+        ForgetStreakInfo(user_id)
+        bump_version(user_id, "streak")
+    on_commit(forget)
 
-def CreateSessionRecord(user_id, status='Started'):
-    """Creates a new entry in the sessions table for tracking daily attempts"""
+@span("db")
+def StartDailyAttempt(user_id):
+    """
+    Records today's attempt and returns False if today's interview is already
+    completed. One upsert, so the check and the write cannot race: rowcount
+    is 1 for a new row, 2 when an unfinished attempt was bumped and 0 when
+    the row is 'Completed' (the update changes nothing).
+    """
     conn = None
     try:
         conn = get_db_connection()
         cursor = conn.cursor()
-        cursor.execute("SELECT id FROM sessions WHERE user_id = %s AND session_date = CURDATE()", (user_id,))
-        existing = cursor.fetchone()
-        
-        if existing:
-            cursor.execute("UPDATE sessions SET status = %s WHERE id = %s", (status, existing[0]))
-        else:
-            query = "INSERT INTO sessions (user_id, session_date, status) VALUES (%s, CURDATE(), %s)"
-            cursor.execute(query, (user_id, status))
-            
+        cursor.execute("""
+            INSERT INTO sessions (user_id, session_date, status) VALUES (%s, CURDATE(), 'Started')
+            ON DUPLICATE KEY UPDATE
+                attempts = attempts + IF(status = 'Completed', 0, 1),
+                status = IF(status = 'Completed', status, VALUES(status))
+        """, (user_id,))
+        allowed = cursor.rowcount != 0
+
+        if allowed:
+            cursor.execute("UPDATE user_progress SET today_date = CURDATE(), today_status = 'Started' WHERE user_id = %s",
+                           (user_id,))
+
         conn.commit()
+        if allowed:
+            _forget_streak_on_commit(user_id)
         cursor.close()
-        return True
+        return allowed
     except Exception as e:
-        logger.error(f"Error CreateSessionRecord: {e}")
-        return False
+        logger.error(f"Error StartDailyAttempt: {e}")
+        return True
     finally:
         if conn: conn.close()
 
+def _sync_progress_streak(cursor, user_id):
+    """Mirrors the user's streak into their progress rollup, if one was built"""
+    cursor.execute("""
+        UPDATE user_progress p JOIN users u ON u.user_id = p.user_id
+        SET p.streak_count = u.streak_count, p.last_active_date = u.last_active_date,
+            p.today_date = CURDATE(), p.today_status = 'Completed'
+        WHERE p.user_id = %s
+    """, (user_id,))
+
+@span("db")
 def UpdateStreak(user_id):
     """Updates the user's streak based on consecutive daily activity"""
     conn = None
     try:
         conn = get_db_connection()
-        cursor = conn.cursor(dictionary=True)
-        from datetime import datetime, timedelta
-        
-        cursor.execute("SELECT streak_count, last_active_date FROM users WHERE user_id = %s", (user_id,))
-        user = cursor.fetchone()
-        
-        if not user: return False
-        
-        streak = user.get('streak_count') or 0
-        last_date = user.get('last_active_date')
-        today = datetime.now().date()
-        
-        if last_date == today:
-            cursor.execute("UPDATE sessions SET status = 'Completed' WHERE user_id = %s AND session_date = %s", 
-                           (user_id, today))
-            conn.commit()
-            return True
-            
-        yesterday = today - timedelta(days=1)
-        
-        if last_date == yesterday:
-            streak += 1
-        else:
-            streak = 1
-            
-        cursor.execute("UPDATE users SET streak_count = %s, last_active_date = %s WHERE user_id = %s", 
-                       (streak, today, user_id))
-        
-        cursor.execute("UPDATE sessions SET status = 'Completed' WHERE user_id = %s AND session_date = %s", 
-                       (user_id, today))
-        
+        cursor = conn.cursor()
+
+        # streak_count is assigned first, so it still sees the old last_active_date
+        cursor.execute("""
+            UPDATE users
+            SET streak_count = CASE
+                    WHEN last_active_date = CURDATE() THEN COALESCE(streak_count, 0)
+                    WHEN last_active_date = CURDATE() - INTERVAL 1 DAY THEN COALESCE(streak_count, 0) + 1
+                    ELSE 1
+                END,
+                last_active_date = CURDATE()
+            WHERE user_id = %s
+        """, (user_id,))
+
+        # Fails on the users foreign key when the user does not exist
+        cursor.execute("""
+            INSERT INTO sessions (user_id, session_date, status) VALUES (%s, CURDATE(), 'Completed')
+            ON DUPLICATE KEY UPDATE status = 'Completed'
+        """, (user_id,))
+        _sync_progress_streak(cursor, user_id)
         conn.commit()
+        _forget_streak_on_commit(user_id)
         cursor.close()
         return True
     except Exception as e:
@@ -217,56 +690,106 @@ def UpdateStreak(user_id):
     finally:
         if conn: conn.close()
 
-def GetUserStreakInfo(user_id):
-    """Retrieves streak and today's status for the user profile"""
+def _load_streak_info(user_id):
+    """Reads streak_count, last_active_date and today's status from MySQL"""
     conn = None
     try:
+        EnsureTable("user_progress")
         conn = get_db_connection()
         cursor = conn.cursor(dictionary=True)
-        
-        cursor.execute("SELECT streak_count, last_active_date FROM users WHERE user_id = %s", (user_id,))
+
+        # The progress rollup answers this in one primary-key read once it exists
+        cursor.execute("""
+            SELECT streak_count, last_active_date, IF(today_date = CURDATE(), today_status, NULL) AS status
+            FROM user_progress WHERE user_id = %s
+        """, (user_id,))
         user = cursor.fetchone()
-        
-        cursor.execute("SELECT status FROM sessions WHERE user_id = %s AND session_date = CURDATE()", (user_id,))
-        session_today = cursor.fetchone()
-        
+        session_today = user if user and user["status"] else None
+
+        if not user:
+            cursor.execute("""
+                SELECT u.streak_count, u.last_active_date, s.status
+                FROM users u
+                LEFT JOIN sessions s ON s.user_id = u.user_id AND s.session_date = CURDATE()
+                WHERE u.user_id = %s
+            """, (user_id,))
+            user = cursor.fetchone()
+            session_today = user if user and user["status"] else None
+
         cursor.close()
-        
-        streak = user['streak_count'] if user and user['streak_count'] else 0
-        status = session_today['status'] if session_today else 'Available'
-        
-        # Calculate hours until tomorrow
-        from datetime import datetime, time, timedelta
-        now = datetime.now()
-        tomorrow_midnight = datetime.combine(now.date() + timedelta(days=1), time.min)
-        delta = tomorrow_midnight - now
-        hours_until = int(delta.total_seconds() // 3600)
-        
         return {
-            "streak_count": streak,
+            "streak_count": user['streak_count'] if user and user['streak_count'] else 0,
             "last_active_date": str(user['last_active_date']) if user and user['last_active_date'] else None,
-            "today_status": status,
-            "hours_until_next": hours_until
+            "today_status": session_today['status'] if session_today else 'Available',
         }
+    finally:
+        if conn: conn.close()
+
+@span("db")
+def GetUserStreakInfo(user_id):
+    """Retrieves streak and today's status for the user profile"""
+    now = datetime.now()
+    today = now.date().isoformat()
+    r = get_redis()
+    key = _streak_cache_key(user_id)
+    try:
+        info = None
+        if r is not None:
+            try:
+                cached = r.get(key)
+                info = json.loads(cached) if cached else None
+            except Exception as e:
+                redis_failed(e)
+                cache_outcome("streak", "error")
+                r = None
+        # today_status is per calendar day, so an entry cached yesterday is a miss
+        if info is None or info.pop("cached_on", None) != today:
+            if r is not None:
+                cache_outcome("streak", "miss")
+            info = _load_streak_info(user_id)
+            if r is not None:
+                try:
+                    r.set(key, json.dumps({**info, "cached_on": today}), ex=STREAK_CACHE_TTL)
+                except Exception as e:
+                    redis_failed(e)
+        else:
+            cache_outcome("streak", "hit")
+
+        # Calculate hours until tomorrow
+        tomorrow_midnight = datetime.combine(now.date() + timedelta(days=1), datetime.min.time())
+        delta = tomorrow_midnight - now
+        info["hours_until_next"] = int(delta.total_seconds() // 3600)
+        return info
     except Exception as e:
         logger.error(f"Error GetUserStreakInfo: {e}")
         return {"streak_count": 0, "last_active_date": None, "today_status": "Error", "hours_until_next": 0}
+
+@span("db")
+def SaveUserResume(user_id, resume_text):
+    """Stores the user's resume text; also called from the resume extraction pool's callback thread"""
+    conn = None
+    try:
+        conn = get_db_connection()
+        cursor = conn.cursor()
+        cursor.execute("UPDATE users SET resume_text=%s WHERE user_id=%s", (resume_text, user_id))
+        conn.commit()
+        on_commit(lambda: bump_version(user_id, "resume"))
+        cursor.close()
+        return True
+    except Exception as e:
+        logger.error(f"Error SaveUserResume: {e}")
+        return False
     finally:
         if conn: conn.close()
 
+@span("db")
 def SaveInterviewState(session_id, state_json):
     """Saves the entire ActiveInterview object state as JSON for stateless worker support"""
     conn = None
     try:
+        EnsureTable("session_metadata")
         conn = get_db_connection()
         cursor = conn.cursor()
-        cursor.execute("""
-            CREATE TABLE IF NOT EXISTS session_metadata (
-                session_id VARCHAR(100) PRIMARY KEY,
-                state_data LONGTEXT,
-                updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP ON UPDATE CURRENT_TIMESTAMP
-            )
-        """)
         cursor.execute("""
             INSERT INTO session_metadata (session_id, state_data) 
             VALUES (%s, %s) 
@@ -281,6 +804,7 @@ def SaveInterviewState(session_id, state_json):
     finally:
         if conn: conn.close()
 
+@span("db")
 def LoadInterviewState(session_id):
     """Loads the ActiveInterview object state from the database"""
     conn = None
@@ -295,4 +819,442 @@ def LoadInterviewState(session_id):
         logger.error(f"Error LoadInterviewState: {e}")
         return None
     finally:
-        if conn: conn.close()
\ No newline at end of file
+        if conn: conn.close()
+
+# Columns /get-user-sessions may project. feedback is a multi-KB LONGTEXT
+# report, so list views should ask for feedback_preview instead.
+USER_SESSION_FIELDS = {
+    "session_id":       "session_id",
+    "session_date":     "session_date",
+    "topic":            "topic",
+    "score":            "score",
+    "question":         "question",
+    "answer":           "answer",
+    "feedback":         "feedback",
+    "feedback_preview": "LEFT(feedback, 200) AS feedback_preview",
+}
+DEFAULT_USER_SESSION_FIELDS = ["session_id", "topic", "score", "feedback", "session_date"]
+
+def EncodeSessionCursor(session_date, session_id):
+    """Opaque keyset cursor pointing just past (session_date, session_id)"""
+    raw = json.dumps([str(session_date), session_id])
+    return base64.urlsafe_b64encode(raw.encode("utf-8")).decode("ascii")
+
+def DecodeSessionCursor(cursor_token):
+    """Inverse of EncodeSessionCursor; raises ValueError on a malformed cursor"""
+    try:
+        session_date, session_id = json.loads(base64.urlsafe_b64decode(cursor_token.encode("ascii")))
+        return datetime.fromisoformat(session_date), str(session_id)
+    except Exception as e:
+        raise ValueError(f"Invalid cursor: {e}")
+
+@span("db")
+def GetUserSessions(user_id, fields=None, limit=None, after=None):
+    """
+    Lists a user's interview sessions newest first, keyset-paginated on
+    (session_date, session_id) so every page is an index range read.
+
+    Returns (rows, next_cursor); next_cursor is None on the last page or when
+    limit is None (unpaginated).
+    """
+    fields = [f for f in (fields or DEFAULT_USER_SESSION_FIELDS) if f in USER_SESSION_FIELDS]
+    selected = list(dict.fromkeys(["session_id", "session_date"] + fields))
+    columns = ", ".join(USER_SESSION_FIELDS[f] for f in selected)
+
+    query = f"SELECT {columns} FROM interview_sessions WHERE user_id = %s"
+    params = [user_id]
+    if after:
+        after_date, after_id = DecodeSessionCursor(after)
+        query += " AND (session_date < %s OR (session_date = %s AND session_id < %s))"
+        params += [after_date, after_date, after_id]
+    query += " ORDER BY session_date DESC, session_id DESC"
+    if limit is not None:
+        query += " LIMIT %s"
+        params.append(limit + 1)  # one extra row tells us whether another page exists
+
+    conn = None
+    try:
+        conn = get_db_connection()
+        cursor = conn.cursor(dictionary=True)
+        cursor.execute(query, tuple(params))
+        rows = cursor.fetchall()
+        cursor.close()
+    finally:
+        if conn: conn.close()
+
+    next_cursor = None
+    if limit is not None and len(rows) > limit:
+        rows = rows[:limit]
+        last = rows[-1]
+        next_cursor = EncodeSessionCursor(last["session_date"], last["session_id"])
+
+    for row in rows:
+        for key in list(row):
+            if key not in fields:
+                del row[key]
+    return rows, next_cursor
+
+
+@span("db")
+def GetExactStats(days):
+    """Exact platform totals and session breakdowns; scans interview_sessions, so call it sparingly"""
+    conn = None
+    try:
+        conn = get_db_connection()
+        cursor = conn.cursor(dictionary=True)
+        cursor.execute("SELECT COUNT(*) as count FROM users")
+        total_users = cursor.fetchone()['count']
+        cursor.execute("SELECT COUNT(*) as count FROM interview_sessions")
+        total_sessions = cursor.fetchone()['count']
+        cursor.execute("""
+            SELECT DATE(session_date) AS day, COUNT(*) AS count FROM interview_sessions
+            WHERE session_date >= CURDATE() - INTERVAL %s DAY GROUP BY day
+        """, (days,))
+        by_day = {str(r["day"]): r["count"] for r in cursor.fetchall()}
+        cursor.execute("""
+            SELECT COALESCE(difficulty_level, 'unknown') AS level, COUNT(*) AS count
+            FROM interview_sessions GROUP BY level
+        """)
+        by_level = {r["level"]: r["count"] for r in cursor.fetchall()}
+        cursor.execute("""
+            SELECT TRIM(SUBSTRING_INDEX(topic, '|', 1)) AS stage, COUNT(*) AS count
+            FROM interview_sessions GROUP BY stage
+        """)
+        by_topic = {r["stage"]: r["count"] for r in cursor.fetchall()}
+        cursor.close()
+        return {"total_users": total_users, "total_sessions": total_sessions,
+                "by_day": by_day, "by_level": by_level, "by_topic": by_topic}
+    finally:
+        if conn: conn.close()
+
+
+# ── FEEDBACK REPORTS ───────────────────────────────────────────────────────
+# Read model for /api/feedback/<session_id>: written once when an interview
+# is finished, so the feedback page never has to parse session_metadata.
+@span("db")
+def StoreFeedbackReport(session_id, user_id, score, report_md, report_html, history, last_question, last_answer):
+    """Stores (or replaces) the finished report of a session"""
+    conn = None
+    try:
+        EnsureTable("feedback_reports")
+        conn = get_db_connection()
+        cursor = conn.cursor()
+        cursor.execute("""
+            REPLACE INTO feedback_reports
+            (session_id, user_id, score, report_md, report_html, history, last_question, last_answer)
+            VALUES (%s, %s, %s, %s, %s, %s, %s, %s)
+        """, (session_id, user_id, score, report_md, report_html, json.dumps(history), last_question, last_answer))
+        conn.commit()
+        on_commit(lambda: bump_version(user_id, "sessions"))
+        cursor.close()
+        return True
+    except Exception as e:
+        logger.error(f"DB Error StoreFeedbackReport for session {session_id}: {e}")
+        return False
+    finally:
+        if conn: conn.close()
+
+@span("db")
+def GetFeedbackReport(session_id):
+    """Returns the stored report of a session in one primary-key read, or None"""
+    conn = None
+    try:
+        EnsureTable("feedback_reports")
+        conn = get_db_connection()
+        cursor = conn.cursor(dictionary=True)
+        cursor.execute("""
+            SELECT user_id, score, report_md, report_html, history, last_question, last_answer
+            FROM feedback_reports WHERE session_id = %s
+        """, (session_id,))
+        report = cursor.fetchone()
+        cursor.close()
+        if report:
+            report["history"] = json.loads(report["history"]) if report["history"] else []
+            report["score"] = float(report["score"]) if report["score"] is not None else None
+        return report
+    except Exception as e:
+        logger.error(f"DB Error GetFeedbackReport for session {session_id}: {e}")
+        return None
+    finally:
+        if conn: conn.close()
+
+# ── TURN EVALUATIONS ───────────────────────────────────────────────────────
+# One row per answered turn, scored in the background after /submit-answer
+# (Services/turn_evaluation.py). answer_sha ties a result to the answer it
+# scored, so a late result for an answer that was since resubmitted is dropped.
+@span("db")
+def MarkTurnPending(session_id, turn, user_id, answer_sha):
+    """Records that an evaluation of this answer has been queued"""
+    conn = None
+    try:
+        EnsureTable("turn_evaluations")
+        conn = get_db_connection()
+        cursor = conn.cursor()
+        cursor.execute("""
+            INSERT INTO turn_evaluations (session_id, turn, user_id, answer_sha, status, score, evaluation)
+            VALUES (%s, %s, %s, %s, 'pending', NULL, NULL)
+            ON DUPLICATE KEY UPDATE
+            user_id = VALUES(user_id), answer_sha = VALUES(answer_sha),
+            status = 'pending', score = NULL, evaluation = NULL
+        """, (session_id, turn, user_id, answer_sha))
+        conn.commit()
+        cursor.close()
+        return True
+    except Exception as e:
+        logger.error(f"DB Error MarkTurnPending for session {session_id}: {e}")
+        return False
+    finally:
+        if conn: conn.close()
+
+@span("db")
+def StoreTurnEvaluation(session_id, turn, user_id, answer_sha, status, score=None, evaluation=None):
+    """Stores the result (status 'done' or 'failed') unless the turn now holds a different answer"""
+    conn = None
+    try:
+        EnsureTable("turn_evaluations")
+        conn = get_db_connection()
+        cursor = conn.cursor()
+        cursor.execute("""
+            INSERT INTO turn_evaluations (session_id, turn, user_id, answer_sha, status, score, evaluation)
+            VALUES (%s, %s, %s, %s, %s, %s, %s)
+            ON DUPLICATE KEY UPDATE
+            status = IF(answer_sha = VALUES(answer_sha), VALUES(status), status),
+            score = IF(answer_sha = VALUES(answer_sha), VALUES(score), score),
+            evaluation = IF(answer_sha = VALUES(answer_sha), VALUES(evaluation), evaluation)
+        """, (session_id, turn, user_id, answer_sha, status, score,
+              json.dumps(evaluation) if evaluation is not None else None))
+        conn.commit()
+        cursor.close()
+        return True
+    except Exception as e:
+        logger.error(f"DB Error StoreTurnEvaluation for session {session_id} turn {turn}: {e}")
+        return False
+    finally:
+        if conn: conn.close()
+
+@span("db")
+def GetTurnEvaluations(session_id):
+    """Returns {turn: row} for a session; age is seconds since the row last changed"""
+    conn = None
+    try:
+        EnsureTable("turn_evaluations")
+        conn = get_db_connection()
+        cursor = conn.cursor(dictionary=True)
+        cursor.execute("""
+            SELECT turn, answer_sha, status, score, evaluation,
+                   TIMESTAMPDIFF(SECOND, updated_at, CURRENT_TIMESTAMP) AS age
+            FROM turn_evaluations WHERE session_id = %s
+        """, (session_id,))
+        rows = cursor.fetchall()
+        cursor.close()
+        for row in rows:
+            row["evaluation"] = json.loads(row["evaluation"]) if row["evaluation"] else None
+            row["score"] = float(row["score"]) if row["score"] is not None else None
+        return {row["turn"]: row for row in rows}
+    except Exception as e:
+        logger.error(f"DB Error GetTurnEvaluations for session {session_id}: {e}")
+        return {}
+    finally:
+        if conn: conn.close()
+
+# ── PROGRESS ROLLUP ────────────────────────────────────────────────────────
+# user_progress keeps one pre-aggregated row per user so progress views are a
+# single primary-key read instead of a scan over interview_sessions. It is
+# maintained incrementally by FinishSession / UpdateStreak / StartDailyAttempt
+# and can be rebuilt from history with RebuildUserProgress (see
+# Services/backfill_progress.py).
+PROGRESS_LAST_N = 10
+
+def _apply_finished_session(progress, session_id, topic, score, session_date):
+    """Folds one finished session into a progress dict (mutates and returns it)"""
+    score = float(score or 0)
+    progress["session_count"] += 1
+    if score > 0:
+        progress["scored_count"] += 1
+        progress["score_sum"] += score
+        progress["best_score"] = max(progress["best_score"] or 0, score)
+        stage = progress["stage_stats"].setdefault(session_stage(topic), {"sum": 0.0, "count": 0})
+        stage["sum"] += score
+        stage["count"] += 1
+    progress["last_scores"].append({"session_id": session_id, "score": score, "date": str(session_date)})
+    progress["last_scores"] = progress["last_scores"][-PROGRESS_LAST_N:]
+    return progress
+
+def _empty_progress(user_id):
+    return {"user_id": user_id, "session_count": 0, "scored_count": 0, "score_sum": 0.0, "best_score": None,
+            "last_scores": [], "stage_stats": {}}
+
+def _load_progress_for_update(cursor, user_id):
+    cursor.execute("""
+        SELECT user_id, session_count, scored_count, score_sum, best_score, last_scores, stage_stats
+        FROM user_progress WHERE user_id = %s FOR UPDATE
+    """, (user_id,))
+    row = cursor.fetchone()
+    if not row:
+        return None
+    row["score_sum"] = float(row["score_sum"] or 0)
+    row["best_score"] = float(row["best_score"]) if row["best_score"] is not None else None
+    row["last_scores"] = json.loads(row["last_scores"]) if row["last_scores"] else []
+    row["stage_stats"] = json.loads(row["stage_stats"]) if row["stage_stats"] else {}
+    return row
+
+def _save_progress(cursor, progress):
+    cursor.execute("""
+        UPDATE user_progress
+        SET session_count = %s, scored_count = %s, score_sum = %s, best_score = %s,
+            last_scores = %s, stage_stats = %s
+        WHERE user_id = %s
+    """, (progress["session_count"], progress["scored_count"], progress["score_sum"], progress["best_score"],
+          json.dumps(progress["last_scores"]), json.dumps(progress["stage_stats"]), progress["user_id"]))
+
+@span("db")
+def FinishSession(session_id, user_id, topic, question, score, feedback):
+    """
+    Stores the final evaluation of an interview and folds it into the user's
+    progress rollup. Finishing the same session again rewrites the report and
+    rebuilds that user's rollup instead of counting the session twice.
+    """
+    conn = None
+    try:
+        EnsureTable("user_progress")
+        conn = get_db_connection()
+        cursor = conn.cursor(dictionary=True)
+        cursor.execute("SELECT finished_at FROM interview_sessions WHERE session_id = %s FOR UPDATE", (session_id,))
+        existing = cursor.fetchone()
+        first_finish = not existing or existing["finished_at"] is None
+
+        # Safely Upsert: Guarantee row exists, and force overwrite score/feedback.
+        cursor.execute("""
+            INSERT INTO interview_sessions 
+            (session_id, user_id, topic, question, answer, score, feedback, session_date, finished_at)
+            VALUES (%s, %s, %s, %s, 'Auto-Completed / Skipped', %s, %s, NOW(), NOW())
+            ON DUPLICATE KEY UPDATE 
+            feedback = VALUES(feedback),
+            score = VALUES(score),
+            finished_at = COALESCE(finished_at, VALUES(finished_at))
+        """, (session_id, user_id, topic, question, score, feedback))
+
+        if user_id:
+            progress = _load_progress_for_update(cursor, user_id) if first_finish else None
+            if progress:
+                _save_progress(cursor, _apply_finished_session(progress, session_id, topic, score, datetime.now()))
+            else:
+                _rebuild_progress(cursor, user_id)
+
+        conn.commit()
+        if user_id:
+            on_commit(lambda: bump_version(user_id, "sessions"))
+        cursor.close()
+        return True
+    except Exception as e:
+        logger.error(f"DB Error FinishSession for session {session_id}: {e}")
+        return False
+    finally:
+        if conn: conn.close()
+
+def _rebuild_progress(cursor, user_id=None):
+    """Recomputes user_progress rows from interview_sessions / users / sessions"""
+    user_filter = " AND user_id = %s" if user_id else ""
+    params = (user_id,) if user_id else ()
+
+    # Sessions finished before finished_at existed: anything past the in-progress placeholders
+    cursor.execute("""
+        UPDATE interview_sessions SET finished_at = session_date
+        WHERE finished_at IS NULL
+        AND feedback NOT IN ('In Progress...', 'Pending Final Evaluation')""" + user_filter, params)
+
+    cursor.execute("""
+        SELECT u.user_id, u.streak_count, u.last_active_date, s.status AS today_status
+        FROM users u LEFT JOIN sessions s ON s.user_id = u.user_id AND s.session_date = CURDATE()
+        WHERE 1 = 1""" + user_filter.replace("user_id", "u.user_id"), params)
+    users = {row["user_id"]: row for row in cursor.fetchall()}
+    progress = {uid: _empty_progress(uid) for uid in users}
+
+    cursor.execute("""
+        SELECT user_id, session_id, topic, score, session_date
+        FROM interview_sessions
+        WHERE finished_at IS NOT NULL""" + user_filter + """
+        ORDER BY user_id, session_date""", params)
+    for row in cursor.fetchall():
+        if row["user_id"] in progress:
+            _apply_finished_session(progress[row["user_id"]], row["session_id"], row["topic"],
+                                    row["score"], row["session_date"])
+
+    rows = [(uid, p["session_count"], p["scored_count"], p["score_sum"], p["best_score"],
+             json.dumps(p["last_scores"]), json.dumps(p["stage_stats"]),
+             users[uid]["streak_count"] or 0, users[uid]["last_active_date"], users[uid]["today_status"])
+            for uid, p in progress.items()]
+    if rows:
+        cursor.executemany("""
+            INSERT INTO user_progress
+            (user_id, session_count, scored_count, score_sum, best_score, last_scores, stage_stats,
+             streak_count, last_active_date, today_date, today_status)
+            VALUES (%s, %s, %s, %s, %s, %s, %s, %s, %s, CURDATE(), %s)
+            ON DUPLICATE KEY UPDATE
+            session_count = VALUES(session_count), scored_count = VALUES(scored_count),
+            score_sum = VALUES(score_sum), best_score = VALUES(best_score),
+            last_scores = VALUES(last_scores), stage_stats = VALUES(stage_stats),
+            streak_count = VALUES(streak_count), last_active_date = VALUES(last_active_date),
+            today_date = VALUES(today_date), today_status = VALUES(today_status)
+        """, rows)
+    return len(rows)
+
+@span("db")
+def RebuildUserProgress(user_id=None):
+    """Backfills the progress rollup for one user, or for every user when user_id is None"""
+    conn = None
+    try:
+        EnsureTable("user_progress")
+        conn = get_db_connection()
+        cursor = conn.cursor(dictionary=True)
+        count = _rebuild_progress(cursor, user_id)
+        conn.commit()
+        cursor.close()
+        return count
+    except Exception as e:
+        logger.error(f"Error RebuildUserProgress: {e}")
+        return 0
+    finally:
+        if conn: conn.close()
+
+@span("db")
+def GetUserProgress(user_id):
+    """Reads the user's progress rollup (one primary-key read), building it on first use"""
+    conn = None
+    try:
+        EnsureTable("user_progress")
+        conn = get_db_connection()
+        cursor = conn.cursor(dictionary=True)
+        query = """
+            SELECT session_count, scored_count, score_sum, best_score, last_scores, stage_stats,
+                   streak_count, last_active_date,
+                   IF(today_date = CURDATE(), today_status, NULL) AS today_status
+            FROM user_progress WHERE user_id = %s
+        """
+        cursor.execute(query, (user_id,))
+        row = cursor.fetchone()
+        if not row:
+            _rebuild_progress(cursor, user_id)
+            conn.commit()
+            cursor.execute(query, (user_id,))
+            row = cursor.fetchone()
+        cursor.close()
+        if not row:
+            return None
+
+        stage_stats = json.loads(row["stage_stats"]) if row["stage_stats"] else {}
+        return {
+            "session_count": row["session_count"],
+            "average_score": round(float(row["score_sum"]) / row["scored_count"], 1) if row["scored_count"] else 0.0,
+            "best_score": float(row["best_score"]) if row["best_score"] is not None else None,
+            "last_scores": list(reversed(json.loads(row["last_scores"]) if row["last_scores"] else [])),
+            "stage_averages": {stage: round(v["sum"] / v["count"], 1) for stage, v in stage_stats.items() if v["count"]},
+            "streak_count": row["streak_count"] or 0,
+            "last_active_date": str(row["last_active_date"]) if row["last_active_date"] else None,
+            "today_status": row["today_status"] or "Available",
+        }
+    except Exception as e:
+        logger.error(f"Error GetUserProgress: {e}")
+        return None
+    finally:
+        if conn: conn.close()
@@ -0,0 +1,53 @@
+"""
+Gunicorn settings. The app is imported once in the master (preload_app) and
+shared copy-on-write by the workers, so a worker boot costs a fork instead of
+re-importing Flask, langchain and friends. Anything that holds sockets or
+threads is reset in the child in post_fork; the LLM/embedding clients and the
+first DB connection are warmed in the background once the worker is up, and
+/readyz reports 503 until that finishes.
+
+GUNICORN_PROFILE picks the worker class. Interview routes spend almost all of
+their time waiting on Groq, Gemini and MySQL, so the default "gthread" lets
+each worker hold GUNICORN_THREADS requests in flight instead of one; "sync"
+keeps the old one-request-per-worker behaviour. loadtest/concurrency.py
+measures both.
+
+    gunicorn -c gunicorn.conf.py app:app
+    GUNICORN_PROFILE=sync gunicorn -c gunicorn.conf.py app:app
+"""
+import os
+import sys
+
+bind = f"0.0.0.0:{os.getenv('PORT', '5000')}"
+workers = int(os.getenv("WEB_CONCURRENCY") or 2)
+timeout = int(os.getenv("GUNICORN_TIMEOUT") or 120)
+preload_app = True
+
+GUNICORN_PROFILE = (os.getenv("GUNICORN_PROFILE") or "gthread").lower()
+if GUNICORN_PROFILE == "gthread":
+    worker_class = "gthread"
+    threads = int(os.getenv("GUNICORN_THREADS") or 16)
+    # Idle browser connections park in the worker's poller rather than holding a thread
+    keepalive = int(os.getenv("GUNICORN_KEEPALIVE") or 5)
+elif GUNICORN_PROFILE == "sync":
+    worker_class = "sync"
+    threads = 1
+else:
+    raise ValueError(f"GUNICORN_PROFILE must be sync or gthread, not {GUNICORN_PROFILE!r}")
+# database_con.py sizes each worker's MySQL pool from this; the app is
+# imported after this file runs
+os.environ["GUNICORN_THREADS"] = str(threads)
+
+
+def post_fork(server, worker):
+    # Connections the master opened while importing the app belong to the master.
+    # redis-py and Sentry's transport check the pid themselves.
+    database_con = sys.modules.get("database_con")
+    if database_con is not None:
+        database_con.connection_pool.after_fork()
+
+
+def post_worker_init(worker):
+    app_module = sys.modules.get("app")
+    if app_module is not None:
+        app_module.start_warm_up()
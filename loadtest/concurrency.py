@@ -0,0 +1,162 @@
+"""
+Concurrent interviews per worker, sync vs gthread.
+
+Boots a single gunicorn worker under each GUNICORN_PROFILE against the
+emulators, drives it with loadtest/driver.py at increasing concurrency and
+reports completed interviews per minute and turn latency for each step:
+
+    python loadtest/concurrency.py --levels 1,4,8,16 --out loadtest/reports/concurrency.json
+
+    docker compose -f loadtest/docker-compose.yml run --rm --entrypoint \\
+        "python loadtest/concurrency.py --emulator-url http://emulator:8090" driver
+
+A profile has saturated when interviews/min stops growing with concurrency
+while the p95 keeps climbing. Needs the same DB_*/REDIS_URL/GROQ_API_BASE/
+GEMINI_API_BASE env as the app, and a throwaway database (see driver.py).
+"""
+import argparse
+import json
+import os
+import subprocess
+import sys
+import tempfile
+import time
+import uuid
+from argparse import Namespace
+from concurrent.futures import ThreadPoolExecutor
+
+import requests
+
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+import driver  # noqa: E402
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+def start_server(profile, port, threads, app):
+    env = dict(os.environ, GUNICORN_PROFILE=profile, GUNICORN_THREADS=str(threads),
+               WEB_CONCURRENCY="1", PORT=str(port))
+    # A file rather than a pipe: nobody drains a pipe while the sweep runs
+    log = tempfile.NamedTemporaryFile("w+", prefix=f"gunicorn-{profile}-", suffix=".log", delete=False)
+    server = subprocess.Popen([sys.executable, "-m", "gunicorn", "-c", "gunicorn.conf.py", app],
+                              cwd=ROOT, env=env, stdout=log, stderr=log, text=True)
+    server.log_path = log.name
+    deadline = time.monotonic() + 90
+    while time.monotonic() < deadline:
+        if server.poll() is not None:
+            log.seek(0)
+            sys.exit(f"gunicorn ({profile}) exited:\n{log.read()[-2000:]}")
+        try:
+            if requests.get(f"http://127.0.0.1:{port}/readyz", timeout=2).status_code == 200:
+                return server
+        except requests.RequestException:
+            pass
+        time.sleep(0.5)
+    server.terminate()
+    sys.exit(f"gunicorn ({profile}) was not ready after 90s, see {log.name}")
+
+
+def stop_server(server):
+    server.terminate()
+    try:
+        server.wait(timeout=30)
+    except subprocess.TimeoutExpired:
+        server.kill()
+
+
+def run_level(base_url, concurrency, args):
+    """One step of the sweep: rounds x concurrency candidates, concurrency at a time"""
+    run = Namespace(run_id=uuid.uuid4().hex[:8], password=args.password, level=args.level,
+                    questions=args.questions, think_ms=args.think_ms)
+    recorder = driver.Recorder(base_url, args.timeout)
+    started = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=concurrency) as pool:
+        for index in range(concurrency * args.rounds):
+            pool.submit(driver.run_candidate, recorder, index, run)
+    duration = time.perf_counter() - started
+    turns = recorder.latencies["/hr-questions"] + recorder.latencies["/submit-answer"]
+    return {
+        "concurrency": concurrency,
+        "completed": len(recorder.flows),
+        "failed": recorder.failed_flows,
+        "interviews_per_min": round(len(recorder.flows) / duration * 60, 1),
+        "turn_p50_ms": driver.percentile(turns, 50),
+        "turn_p95_ms": driver.percentile(turns, 95),
+        "flow_p95_ms": driver.percentile(recorder.flows, 95),
+        "duration_s": round(duration, 1),
+    }
+
+
+def print_sweep(results):
+    profiles = list(results)
+    header = f"{'concurrency':>12}" + "".join(f"{p + ' ivw/min':>18}{p + ' turn p95':>18}" for p in profiles)
+    print(header)
+    for i, row in enumerate(results[profiles[0]]):
+        line = f"{row['concurrency']:>12}"
+        for profile in profiles:
+            step = results[profile][i]
+            failed = f" ({step['failed']} failed)" if step["failed"] else ""
+            line += f"{str(step['interviews_per_min']) + failed:>18}{_ms(step['turn_p95_ms']):>18}"
+        print(line)
+    print()
+    for profile in profiles:
+        best = max(results[profile], key=lambda step: step["interviews_per_min"])
+        print(f"{profile}: peak {best['interviews_per_min']} interviews/min per worker "
+              f"at concurrency {best['concurrency']}")
+
+
+def _ms(value):
+    return "-" if value is None else f"{value:.0f} ms"
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Concurrent interviews per worker, by gunicorn profile")
+    parser.add_argument("--profiles", default="sync,gthread")
+    parser.add_argument("--levels", default="1,2,4,8,16", help="concurrency steps")
+    parser.add_argument("--rounds", type=int, default=2, help="interviews per in-flight slot at each step")
+    parser.add_argument("--threads", type=int, default=16, help="GUNICORN_THREADS for gthread")
+    parser.add_argument("--port", type=int, default=5100)
+    parser.add_argument("--app", default="app:app")
+    parser.add_argument("--emulator-url", default=os.getenv("LOADTEST_EMULATOR_URL") or "http://localhost:8090")
+    parser.add_argument("--questions", type=int, default=3)
+    parser.add_argument("--level", default="medium")
+    parser.add_argument("--think-ms", type=int, default=0)
+    parser.add_argument("--timeout", type=float, default=180)
+    parser.add_argument("--password", default="loadtest-password")
+    parser.add_argument("--out", help="write the JSON results here")
+    args = parser.parse_args()
+
+    levels = [int(level) for level in args.levels.split(",")]
+    base_url = f"http://127.0.0.1:{args.port}"
+    emulator = driver.emulator_stats(Namespace(emulator_url=args.emulator_url))
+    if emulator is None:
+        print(f"warning: no emulator at {args.emulator_url}; latencies reflect whatever GROQ_API_BASE points at",
+              file=sys.stderr)
+
+    results = {}
+    for profile in args.profiles.split(","):
+        server = start_server(profile, args.port, args.threads, args.app)
+        try:
+            results[profile] = []
+            for level in levels:
+                step = run_level(base_url, level, args)
+                results[profile].append(step)
+                print(f"{profile:>8} x{level:<3} {step['interviews_per_min']} interviews/min, "
+                      f"turn p95 {_ms(step['turn_p95_ms'])}", file=sys.stderr)
+        finally:
+            stop_server(server)
+            print(f"{profile:>8} server log: {server.log_path}", file=sys.stderr)
+
+    print()
+    print_sweep(results)
+    if args.out:
+        os.makedirs(os.path.dirname(os.path.abspath(args.out)), exist_ok=True)
+        with open(args.out, "w") as f:
+            json.dump({"commit": driver.git_commit(), "threads": args.threads, "questions": args.questions,
+                       "results": results}, f, indent=2)
+        print(f"\nResults written to {args.out}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
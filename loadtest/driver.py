@@ -0,0 +1,305 @@
+"""
+Load driver for the interview flow.
+
+Drives simulated candidates through the app the way the browser does:
+
+    /register -> /login -> /api/profile/resume -> /start-session
+    -> (/hr-questions -> /submit-answer) x N -> /finish-interview
+
+and writes a JSON report with per-route latency, per-stage timings (from the
+timelines stored with each interview, read through
+/api/admin/session-timeline) and the LLM/embedding emulator counters. Reports
+carry the git commit, so two runs can be compared:
+
+    python loadtest/driver.py --users 40 --concurrency 10 --out loadtest/reports/run.json
+    python loadtest/driver.py ... --compare loadtest/reports/baseline.json
+
+Every candidate registers a fresh account, since /start-session allows one
+interview per user per day. Point it at a throwaway database only: the stage
+report promotes a load-test account to admin (Services/promote_admin.py), so
+the driver needs the same DB_* env as the app. See loadtest/docker-compose.yml
+for a self-contained stack.
+"""
+import argparse
+import json
+import os
+import subprocess
+import sys
+import threading
+import time
+import uuid
+from collections import defaultdict
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime
+
+import requests
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+JD_TEXT = ("Backend Python developer: Flask, MySQL, Redis, REST APIs, background jobs, "
+           "observability and performance tuning. Works with product and data teams.")
+RESUME_TEXT = "\n\n".join([
+    "Software engineer with five years of experience building Python web services and data pipelines.",
+    "Projects: rebuilt a Flask order service on MySQL with read replicas, cutting p95 latency from 900 ms to 200 ms.",
+    "Roles: backend lead for a four-person team; owned on-call, incident reviews and capacity planning.",
+    "Technologies: Python, Flask, FastAPI, MySQL, PostgreSQL, Redis, RQ, Celery, Docker, Kubernetes, Prometheus.",
+    "Achievements: introduced load testing in CI, caught two regressions before release, mentored three juniors.",
+    "Certification: AWS Certified Developer Associate; completed a distributed systems course.",
+] * 3)
+ANSWER_TEXT = ("In my last role I owned the order service. We had a latency problem under peak load, so I "
+               "profiled the hot paths, added an index and a Redis cache, and load-tested the change before "
+               "release. p95 latency dropped by about seventy percent and incidents went down.")
+POSTURE = {"duration": 42, "stability": "Stable", "emotion": "neutral", "dominant_emotion": "neutral",
+           "notes": "Maintained eye contact"}
+
+
+def percentile(values, pct):
+    """Nearest-rank percentile"""
+    if not values:
+        return None
+    ordered = sorted(values)
+    index = max(0, min(len(ordered) - 1, round(pct / 100 * len(ordered) + 0.5) - 1))
+    return ordered[index]
+
+
+def summarize(values):
+    return {
+        "count": len(values),
+        "mean": round(sum(values) / len(values), 1) if values else None,
+        "p50": percentile(values, 50),
+        "p90": percentile(values, 90),
+        "p95": percentile(values, 95),
+        "p99": percentile(values, 99),
+        "max": max(values) if values else None,
+    }
+
+
+class Recorder:
+    """Thread-safe latency and error collection per route"""
+
+    def __init__(self, base_url, timeout):
+        self.base_url = base_url
+        self.timeout = timeout
+        self.lock = threading.Lock()
+        self.latencies = defaultdict(list)   # route -> [ms]
+        self.statuses = defaultdict(lambda: defaultdict(int))
+        self.flows = []                      # ms per completed interview
+        self.failed_flows = 0
+        self.session_ids = []
+
+    def call(self, http, method, route, **kwargs):
+        started = time.perf_counter()
+        try:
+            response = http.request(method, self.base_url + route, timeout=self.timeout, **kwargs)
+            status = response.status_code
+        except requests.RequestException:
+            response, status = None, "error"
+        elapsed = round((time.perf_counter() - started) * 1000, 1)
+        key = route.split("?")[0]
+        with self.lock:
+            self.latencies[key].append(elapsed)
+            self.statuses[key][str(status)] += 1
+        if response is None or status >= 400:
+            raise RuntimeError(f"{method} {route} -> {status}")
+        return response
+
+
+def run_candidate(recorder, index, args):
+    http = requests.Session()
+    email = f"loadtest-{args.run_id}-{index}@loadtest.local"
+    started = time.perf_counter()
+    try:
+        recorder.call(http, "POST", "/register", json={"name": f"Candidate {index}", "email": email,
+                                                         "password": args.password})
+        recorder.call(http, "POST", "/login", json={"email": email, "password": args.password})
+        recorder.call(http, "POST", "/api/profile/resume", json={"resume_text": RESUME_TEXT})
+        recorder.call(http, "POST", "/start-session")
+
+        session_id = None
+        for _ in range(args.questions):
+            question = recorder.call(http, "POST", "/hr-questions",
+                                     json={"level": args.level, "jd": JD_TEXT, "session_id": session_id}).json()
+            session_id = question["session_id"]
+            if args.think_ms:
+                time.sleep(args.think_ms / 1000)
+            recorder.call(http, "POST", "/submit-answer",
+                          json={"session_id": session_id, "transcript": ANSWER_TEXT, "posture_data": POSTURE})
+        recorder.call(http, "POST", "/finish-interview", json={"session_id": session_id})
+    except (RuntimeError, KeyError, ValueError) as e:
+        with recorder.lock:
+            recorder.failed_flows += 1
+        print(f"candidate {index} failed: {e}", file=sys.stderr)
+        return
+    with recorder.lock:
+        recorder.flows.append(round((time.perf_counter() - started) * 1000, 1))
+        recorder.session_ids.append(session_id)
+
+
+def admin_session(args):
+    """Logged-in admin session for the timeline endpoint, or None"""
+    http = requests.Session()
+    email, password = args.admin_email, args.admin_password or args.password
+    if not email:
+        email = f"loadtest-admin-{args.run_id}@loadtest.local"
+        http.post(f"{args.base_url}/register", json={"name": "Load Test Admin", "email": email,
+                                                     "password": password}, timeout=args.timeout)
+        try:
+            from Services.promote_admin import promote_to_admin
+            promote_to_admin(email)
+        except Exception as e:
+            print(f"Could not promote {email} to admin ({e}); no stage report", file=sys.stderr)
+            return None
+    login = http.post(f"{args.base_url}/login", json={"email": email, "password": password}, timeout=args.timeout)
+    if login.status_code != 200 or login.json().get("role") != "admin":
+        print(f"{email} is not an admin; no stage report", file=sys.stderr)
+        return None
+    return http
+
+
+def collect_stages(args, session_ids):
+    """Per-stage ms across every turn of every interview, keyed 'kind/stage' and 'kind/total'"""
+    http = admin_session(args)
+    if http is None:
+        return {}
+    stages = defaultdict(list)
+    for session_id in session_ids:
+        response = http.get(f"{args.base_url}/api/admin/session-timeline/{session_id}", timeout=args.timeout)
+        if response.status_code != 200:
+            continue
+        for turn in response.json().get("turns", []):
+            stages[f"{turn['kind']}/total"].append(turn["total_ms"])
+            for stage, ms in turn["stages"].items():
+                stages[f"{turn['kind']}/{stage}"].append(ms)
+            if "gap_ms" in turn:
+                stages["question/gap"].append(turn["gap_ms"])
+    return {key: summarize(values) for key, values in sorted(stages.items())}
+
+
+def emulator_stats(args):
+    if not args.emulator_url:
+        return None
+    try:
+        return requests.get(f"{args.emulator_url}/stats", timeout=5).json()
+    except requests.RequestException:
+        return None
+
+
+def git_commit():
+    try:
+        commit = subprocess.check_output(["git", "rev-parse", "--short", "HEAD"], text=True).strip()
+        dirty = subprocess.call(["git", "diff", "--quiet", "HEAD"]) != 0
+        return commit + ("-dirty" if dirty else "")
+    except (OSError, subprocess.CalledProcessError):
+        return os.getenv("GIT_COMMIT", "unknown")
+
+
+def build_report(args, recorder, duration, stages, emu_before, emu_after):
+    emulator = None
+    if emu_before and emu_after:
+        emulator = {"config": emu_after["config"],
+                    **{k: emu_after[k] - emu_before[k] for k in emu_after if k != "config"}}
+    total_requests = sum(len(v) for v in recorder.latencies.values())
+    return {
+        "meta": {
+            "commit": git_commit(),
+            "started": datetime.utcnow().isoformat(),
+            "base_url": args.base_url,
+            "users": args.users,
+            "concurrency": args.concurrency,
+            "questions": args.questions,
+            "think_ms": args.think_ms,
+        },
+        "summary": {
+            "duration_s": round(duration, 2),
+            "interviews_completed": len(recorder.flows),
+            "interviews_failed": recorder.failed_flows,
+            "interviews_per_min": round(len(recorder.flows) / duration * 60, 2) if duration else None,
+            "requests": total_requests,
+            "requests_per_s": round(total_requests / duration, 2) if duration else None,
+            "interview_ms": summarize(recorder.flows),
+        },
+        "routes": {route: {**summarize(values), "status": dict(recorder.statuses[route])}
+                   for route, values in sorted(recorder.latencies.items())},
+        "stages": stages,
+        "emulator": emulator,
+    }
+
+
+def print_table(title, rows, baseline=None):
+    print(f"\n{title}")
+    print(f"  {'name':<34}{'count':>7}{'p50':>10}{'p95':>10}{'p99':>10}{'max':>10}")
+    for name, row in rows.items():
+        line = f"  {name:<34}{row['count']:>7}"
+        for key in ("p50", "p95", "p99", "max"):
+            line += f"{row[key] if row[key] is not None else '-':>10}"
+        old = (baseline or {}).get(name)
+        if old and old.get("p95") and row.get("p95") is not None:
+            line += f"   p95 {(row['p95'] - old['p95']) / old['p95'] * 100:+.0f}%"
+        print(line)
+
+
+def print_report(report, baseline=None):
+    summary = report["summary"]
+    print(f"commit {report['meta']['commit']}: {summary['interviews_completed']} interviews "
+          f"({summary['interviews_failed']} failed) in {summary['duration_s']}s, "
+          f"{summary['interviews_per_min']}/min, {summary['requests_per_s']} req/s")
+    if baseline:
+        old = baseline["summary"]
+        print(f"baseline {baseline['meta']['commit']}: {old['interviews_per_min']}/min, "
+              f"{old['requests_per_s']} req/s")
+    print_table("Routes (ms)", report["routes"], baseline and baseline.get("routes"))
+    if report["stages"]:
+        print_table("Stages per turn (ms)", report["stages"], baseline and baseline.get("stages"))
+    if report["emulator"]:
+        emu = report["emulator"]
+        print(f"\nEmulator: {emu['chat']} chat calls ({emu['chat_429']} throttled), "
+              f"{emu['embed_requests']} embedding calls ({emu['embed_429']} throttled)")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Interview-flow load driver")
+    parser.add_argument("--base-url", default=os.getenv("LOADTEST_BASE_URL") or "http://localhost:5000")
+    parser.add_argument("--emulator-url", default=os.getenv("LOADTEST_EMULATOR_URL") or "http://localhost:8090")
+    parser.add_argument("--users", type=int, default=20, help="candidates to run in total")
+    parser.add_argument("--concurrency", type=int, default=5, help="candidates in flight at once")
+    parser.add_argument("--questions", type=int, default=5, help="questions per interview")
+    parser.add_argument("--level", default="medium")
+    parser.add_argument("--think-ms", type=int, default=0, help="pause between question and answer")
+    parser.add_argument("--timeout", type=float, default=180)
+    parser.add_argument("--password", default="loadtest-password")
+    parser.add_argument("--admin-email", help="existing admin account (default: create and promote one)")
+    parser.add_argument("--admin-password")
+    parser.add_argument("--out", help="write the JSON report here")
+    parser.add_argument("--compare", help="baseline JSON report to diff against")
+    args = parser.parse_args()
+    args.base_url = args.base_url.rstrip("/")
+    args.run_id = uuid.uuid4().hex[:8]
+
+    recorder = Recorder(args.base_url, args.timeout)
+
+    emu_before = emulator_stats(args)
+    started = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=args.concurrency) as pool:
+        for index in range(args.users):
+            pool.submit(run_candidate, recorder, index, args)
+    duration = time.perf_counter() - started
+    emu_after = emulator_stats(args)
+
+    report = build_report(args, recorder, duration, collect_stages(args, recorder.session_ids),
+                          emu_before, emu_after)
+    baseline = None
+    if args.compare:
+        with open(args.compare) as f:
+            baseline = json.load(f)
+    print_report(report, baseline)
+
+    if args.out:
+        os.makedirs(os.path.dirname(os.path.abspath(args.out)), exist_ok=True)
+        with open(args.out, "w") as f:
+            json.dump(report, f, indent=2)
+        print(f"\nReport written to {args.out}")
+    return 0 if report["summary"]["interviews_completed"] else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,287 @@
+"""
+Local stand-ins for the Groq chat-completions and Gemini embeddings APIs.
+
+Serves just enough of both for the app's clients (langchain_groq / the groq
+SDK and langchain_google_genai / google-genai) so the interview flow can be
+load-tested without spending quota:
+
+    POST /openai/v1/chat/completions             (Groq, OpenAI-compatible)
+    POST /v1beta/models/<model>:batchEmbedContents
+    POST /v1beta/models/<model>:embedContent      (Gemini)
+    GET  /stats                                   call counts, for the report
+
+Point the app at it with GROQ_API_BASE=http://host:8090 and
+GEMINI_API_BASE=http://host:8090, then
+
+    python loadtest/emulators.py --port 8090
+
+Latencies are "fixed:MS", "uniform:LO:HI", "normal:MEAN:SD" or
+"lognormal:MEDIAN:SIGMA" (milliseconds), set per endpoint with env or flags:
+
+    EMU_CHAT_LATENCY        time to first token           (lognormal:350:0.6)
+    EMU_CHAT_TOKENS_PER_SEC completion throughput          (500)
+    EMU_CHAT_429_RATE       fraction answered with 429     (0)
+    EMU_EMBED_LATENCY                                      (lognormal:120:0.4)
+    EMU_EMBED_429_RATE                                     (0)
+    EMU_EMBED_DIM           vector size                    (768)
+    EMU_SEED                random seed for latencies/429s (unset = random)
+"""
+import argparse
+import hashlib
+import json
+import math
+import os
+import random
+import re
+import threading
+import time
+import uuid
+
+import numpy as np
+from flask import Flask, jsonify, request
+
+app = Flask(__name__)
+
+
+def parse_latency(spec):
+    """'lognormal:350:0.6' -> callable returning seconds"""
+    kind, *args = spec.split(":")
+    args = [float(a) for a in args]
+    if kind == "fixed":
+        return lambda rng: args[0] / 1000
+    if kind == "uniform":
+        return lambda rng: rng.uniform(args[0], args[1]) / 1000
+    if kind == "normal":
+        return lambda rng: max(0.0, rng.gauss(args[0], args[1])) / 1000
+    if kind == "lognormal":
+        return lambda rng: rng.lognormvariate(math.log(args[0]), args[1]) / 1000
+    raise ValueError(f"Unknown latency distribution {spec!r}")
+
+
+class EmulatorConfig:
+    def __init__(self, chat_latency, tokens_per_sec, chat_429_rate, embed_latency, embed_429_rate,
+                 embed_dim, seed=None):
+        self.chat_latency_spec = chat_latency
+        self.embed_latency_spec = embed_latency
+        self.chat_latency = parse_latency(chat_latency)
+        self.embed_latency = parse_latency(embed_latency)
+        self.tokens_per_sec = tokens_per_sec
+        self.chat_429_rate = chat_429_rate
+        self.embed_429_rate = embed_429_rate
+        self.embed_dim = embed_dim
+        self.rng = random.Random(seed)
+        self.lock = threading.Lock()
+        self.stats = {"chat": 0, "chat_429": 0, "embed_requests": 0, "embed_texts": 0, "embed_429": 0,
+                      "prompt_tokens": 0, "completion_tokens": 0}
+
+    def sample(self, latency):
+        with self.lock:
+            return latency(self.rng)
+
+    def throttled(self, rate):
+        with self.lock:
+            return rate > 0 and self.rng.random() < rate
+
+    def count(self, **deltas):
+        with self.lock:
+            for key, value in deltas.items():
+                self.stats[key] += value
+
+    def describe(self):
+        return {"chat_latency": self.chat_latency_spec, "tokens_per_sec": self.tokens_per_sec,
+                "chat_429_rate": self.chat_429_rate, "embed_latency": self.embed_latency_spec,
+                "embed_429_rate": self.embed_429_rate, "embed_dim": self.embed_dim}
+
+
+config = None
+
+
+def _tokens(text):
+    # ~4 characters per token is close enough for throughput modelling
+    return max(1, len(text) // 4)
+
+
+# ── canned completions ─────────────────────────────────────────────────────
+QUESTIONS = [
+    "Here is your question: Can you walk me through a project you are most proud of?",
+    "Describe a time you had to learn a new technology quickly to deliver on a deadline.",
+    "How would you design a rate limiter for a public API?",
+    "Tell me about a disagreement with a teammate and how you resolved it.",
+    "Question 5: What trade-offs would you consider when choosing between SQL and NoSQL storage?",
+    "How do you prioritise when several stakeholders need something from you at once?",
+]
+
+
+def _question(prompt):
+    match = re.search(r"\(Question (\d+)\)", prompt)
+    number = int(match.group(1)) if match else 1
+    return QUESTIONS[(number - 1) % len(QUESTIONS)]
+
+
+def _final_report(prompt):
+    transcript = re.findall(r"^\s*Q\d+: (.*)$", prompt, flags=re.MULTILINE)
+    breakdown = "\n\n".join(
+        f"**Question**: {question}\n"
+        f"**Feedback on Candidate's Answer**: The answer was relevant but could use a concrete example "
+        f"with measurable results.\n"
+        f"**HR Recommended Answer**: A structured STAR answer describing the situation, the actions taken "
+        f"and the outcome, with numbers where possible."
+        for question in transcript
+    )
+    return (
+        "## Overall Assessment\nThe candidate communicated clearly and stayed on topic across the interview, "
+        "with room to add more depth on technical trade-offs.\n\n"
+        "## Key Strengths\n- Clear structure\n- Relevant experience\n- Calm delivery\n\n"
+        "## Areas for Improvement (including Body Language/Emotions)\n- More metrics\n- Shorter intros\n"
+        "- Steadier eye contact\n\n"
+        "## Behavioral & Emotional Analysis\nMostly neutral and stable, with brief moments of hesitation.\n\n"
+        f"## Question Breakdown & HR Expected Answers\n{breakdown}\n\n"
+        "## Score\n7/10\n\n## Hiring Recommendation\nMove Forward: solid fundamentals and communication."
+    )
+
+
+def _answer_feedback(prompt):
+    return json.dumps({
+        "score": 6,
+        "feedback": "A reasonable answer that addressed the question, but it stayed general.",
+        "strengths": ["Relevant", "Concise"],
+        "improvements": ["Add a concrete example", "Quantify the outcome"],
+        "emotion_note": "Mostly neutral and stable.",
+        "ideal_answer": "A structured STAR answer describing the situation, the actions taken and the "
+                        "outcome, with numbers where possible.",
+    })
+
+
+def _interview_summary(prompt):
+    return (
+        "## Overall Assessment\nThe candidate communicated clearly and stayed on topic across the interview, "
+        "with room to add more depth on technical trade-offs.\n\n"
+        "## Key Strengths\n- Clear structure\n- Relevant experience\n- Calm delivery\n\n"
+        "## Areas for Improvement (including Body Language/Emotions)\n- More metrics\n- Shorter intros\n"
+        "- Steadier eye contact\n\n"
+        "## Behavioral & Emotional Analysis\nMostly neutral and stable, with brief moments of hesitation.\n\n"
+        "## Hiring Recommendation\nMove Forward: solid fundamentals and communication."
+    )
+
+
+def _chat_reply(prompt):
+    return ("Based on your recent sessions your scores are trending up. Focus on adding concrete "
+            "examples to behavioural answers, and practise one technical question a day.")
+
+
+def _chat_summary(prompt):
+    return ("The candidate wants to improve behavioural answers and was advised to use STAR with "
+            "measurable outcomes and to practise one technical question a day.")
+
+
+def completion_for(prompt):
+    if "Generate exactly 1 interview question" in prompt:
+        return _question(prompt)
+    if "final, comprehensive evaluation" in prompt:
+        return _final_report(prompt)
+    if "per-question evaluations that have already been made" in prompt:
+        return _interview_summary(prompt)
+    if "expert interview coach" in prompt:
+        return _answer_feedback(prompt)
+    if "Condense this HR coaching conversation" in prompt:
+        return _chat_summary(prompt)
+    if "SkillUp HR Assistant" in prompt:
+        return _chat_reply(prompt)
+    return "OK."
+
+
+# ── Groq ───────────────────────────────────────────────────────────────────
+@app.route("/openai/v1/chat/completions", methods=["POST"])
+def chat_completions():
+    body = request.get_json(force=True)
+    if config.throttled(config.chat_429_rate):
+        config.count(chat_429=1)
+        response = jsonify({"error": {"message": "Rate limit reached (emulated)", "type": "tokens",
+                                      "code": "rate_limit_exceeded"}})
+        response.headers["Retry-After"] = "1"
+        return response, 429
+
+    prompt = "\n".join(str(m.get("content", "")) for m in body.get("messages", []))
+    content = completion_for(prompt)
+    prompt_tokens, completion_tokens = _tokens(prompt), _tokens(content)
+    time.sleep(config.sample(config.chat_latency) + completion_tokens / config.tokens_per_sec)
+    config.count(chat=1, prompt_tokens=prompt_tokens, completion_tokens=completion_tokens)
+    return jsonify({
+        "id": f"chatcmpl-{uuid.uuid4().hex}",
+        "object": "chat.completion",
+        "created": int(time.time()),
+        "model": body.get("model", "emulated"),
+        "choices": [{"index": 0, "message": {"role": "assistant", "content": content},
+                     "finish_reason": "stop", "logprobs": None}],
+        "usage": {"prompt_tokens": prompt_tokens, "completion_tokens": completion_tokens,
+                  "total_tokens": prompt_tokens + completion_tokens},
+    })
+
+
+# ── Gemini ─────────────────────────────────────────────────────────────────
+def _vector(text):
+    """Deterministic unit vector per text, so top-k selection is repeatable between runs"""
+    seed = int.from_bytes(hashlib.sha1(text.encode()).digest()[:8], "big")
+    vec = np.random.default_rng(seed).standard_normal(config.embed_dim)
+    return (vec / np.linalg.norm(vec)).round(6).tolist()
+
+
+def _content_text(content):
+    return "".join(part.get("text", "") for part in (content or {}).get("parts", []))
+
+
+def _embed(texts):
+    if config.throttled(config.embed_429_rate):
+        config.count(embed_429=1)
+        return jsonify({"error": {"code": 429, "message": "Resource has been exhausted (emulated)",
+                                  "status": "RESOURCE_EXHAUSTED"}}), 429
+    time.sleep(config.sample(config.embed_latency))
+    config.count(embed_requests=1, embed_texts=len(texts))
+    return None
+
+
+@app.route("/v1beta/models/<model>:batchEmbedContents", methods=["POST"])
+def batch_embed(model):
+    texts = [_content_text(r.get("content")) for r in request.get_json(force=True).get("requests", [])]
+    throttled = _embed(texts)
+    if throttled:
+        return throttled
+    return jsonify({"embeddings": [{"values": _vector(t)} for t in texts]})
+
+
+@app.route("/v1beta/models/<model>:embedContent", methods=["POST"])
+def embed(model):
+    text = _content_text(request.get_json(force=True).get("content"))
+    throttled = _embed([text])
+    if throttled:
+        return throttled
+    return jsonify({"embedding": {"values": _vector(text)}})
+
+
+@app.route("/stats")
+def stats():
+    with config.lock:
+        return jsonify({"config": config.describe(), **config.stats})
+
+
+def main():
+    global config
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--host", default="0.0.0.0")
+    parser.add_argument("--port", type=int, default=int(os.getenv("EMU_PORT") or 8090))
+    parser.add_argument("--chat-latency", default=os.getenv("EMU_CHAT_LATENCY") or "lognormal:350:0.6")
+    parser.add_argument("--tokens-per-sec", type=float, default=float(os.getenv("EMU_CHAT_TOKENS_PER_SEC") or 500))
+    parser.add_argument("--chat-429-rate", type=float, default=float(os.getenv("EMU_CHAT_429_RATE") or 0))
+    parser.add_argument("--embed-latency", default=os.getenv("EMU_EMBED_LATENCY") or "lognormal:120:0.4")
+    parser.add_argument("--embed-429-rate", type=float, default=float(os.getenv("EMU_EMBED_429_RATE") or 0))
+    parser.add_argument("--embed-dim", type=int, default=int(os.getenv("EMU_EMBED_DIM") or 768))
+    parser.add_argument("--seed", type=int, default=int(os.environ["EMU_SEED"]) if os.getenv("EMU_SEED") else None)
+    args = parser.parse_args()
+
+    config = EmulatorConfig(args.chat_latency, args.tokens_per_sec, args.chat_429_rate,
+                            args.embed_latency, args.embed_429_rate, args.embed_dim, args.seed)
+    app.run(host=args.host, port=args.port, threaded=True)
+
+
+if __name__ == "__main__":
+    main()
@@ -4,6 +4,80 @@ from dotenv import load_dotenv
 
 load_dotenv()
 
+# Secondary indexes backing the hot queries in database_con.py and app.py.
+# They are declared inline in the CREATE TABLE statements below for fresh
+# databases; ensure_indexes() back-fills them on databases created earlier.
+INDEXES = [
+    ("users", "idx_users_admin_request", "(admin_request_status)"),
+    ("interview_sessions", "idx_sessions_user_date", "(user_id, session_date)"),
+    ("generated_questions", "idx_questions_level_phase", "(difficulty_level, question_phase)"),
+    ("generated_questions", "idx_questions_text", "(question_text(255))"),
+]
+
+# Columns added after the first release, back-filled by ensure_columns().
+COLUMNS = [
+    ("interview_sessions", "finished_at", "DATETIME NULL"),
+    ("interview_sessions", "difficulty_level", "VARCHAR(50) NULL"),
+    ("sessions", "attempts", "INT NOT NULL DEFAULT 1"),
+]
+
+def ensure_columns(cursor, database):
+    """Adds any column from COLUMNS that an existing table is missing"""
+    for table, column, definition in COLUMNS:
+        cursor.execute("""
+            SELECT 1 FROM information_schema.columns
+            WHERE table_schema = %s AND table_name = %s AND column_name = %s
+        """, (database, table, column))
+        if cursor.fetchone():
+            continue
+        cursor.execute(f"ALTER TABLE {table} ADD COLUMN {column} {definition}")
+        print(f"Column '{column}' added on '{table}'.")
+
+def ensure_indexes(cursor, database):
+    """Adds any index from INDEXES that an existing table is missing"""
+    for table, index_name, columns in INDEXES:
+        cursor.execute("""
+            SELECT 1 FROM information_schema.statistics
+            WHERE table_schema = %s AND table_name = %s AND index_name = %s
+            LIMIT 1
+        """, (database, table, index_name))
+        if cursor.fetchone():
+            continue
+        cursor.execute(f"ALTER TABLE {table} ADD INDEX {index_name} {columns}")
+        print(f"Index '{index_name}' added on '{table}'.")
+
+def ensure_daily_unique_key(cursor, database):
+    """
+    Makes sessions(user_id, session_date) unique so the daily-attempt upserts
+    in database_con.py are atomic. Duplicates left by the old SELECT-then-INSERT
+    code are collapsed first, keeping the 'Completed' row (else the newest).
+    """
+    cursor.execute("""
+        SELECT 1 FROM information_schema.statistics
+        WHERE table_schema = %s AND table_name = 'sessions' AND index_name = 'uq_daily_user_date'
+        LIMIT 1
+    """, (database,))
+    if cursor.fetchone():
+        return
+    cursor.execute("""
+        DELETE older FROM sessions older
+        JOIN sessions kept
+          ON kept.user_id = older.user_id AND kept.session_date = older.session_date
+        WHERE (COALESCE(kept.status, '') = 'Completed') > (COALESCE(older.status, '') = 'Completed')
+           OR ((COALESCE(kept.status, '') = 'Completed') = (COALESCE(older.status, '') = 'Completed')
+               AND kept.id > older.id)
+    """)
+    print(f"Removed {cursor.rowcount} duplicate daily session row(s).")
+    cursor.execute("ALTER TABLE sessions ADD UNIQUE KEY uq_daily_user_date (user_id, session_date)")
+    cursor.execute("""
+        SELECT 1 FROM information_schema.statistics
+        WHERE table_schema = %s AND table_name = 'sessions' AND index_name = 'idx_daily_user_date'
+        LIMIT 1
+    """, (database,))
+    if cursor.fetchone():
+        cursor.execute("ALTER TABLE sessions DROP INDEX idx_daily_user_date")
+    print("Unique key 'uq_daily_user_date' added on 'sessions'.")
+
 def setup_managed_db():
     print("Initializing Managed MySQL Database...")
     
@@ -50,7 +124,8 @@ def setup_managed_db():
             resume_text LONGTEXT,
             streak_count INT DEFAULT 0,
             last_active_date DATE,
-            created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+            created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+            INDEX idx_users_admin_request (admin_request_status)
         )
         """)
         print("'users' table ensured.")
@@ -66,7 +141,10 @@ def setup_managed_db():
             score DECIMAL(3,1),
             feedback LONGTEXT,
             session_date DATETIME,
-            FOREIGN KEY (user_id) REFERENCES users(user_id)
+            finished_at DATETIME NULL,
+            difficulty_level VARCHAR(50) NULL,
+            FOREIGN KEY (user_id) REFERENCES users(user_id),
+            INDEX idx_sessions_user_date (user_id, session_date)
         )
         """)
         print("'interview_sessions' table ensured.")
@@ -88,7 +166,9 @@ def setup_managed_db():
             user_id INT,
             session_date DATE,
             status VARCHAR(50),
-            FOREIGN KEY (user_id) REFERENCES users(user_id)
+            attempts INT NOT NULL DEFAULT 1,
+            FOREIGN KEY (user_id) REFERENCES users(user_id),
+            UNIQUE KEY uq_daily_user_date (user_id, session_date)
         )
         """)
         print("'sessions' progress table ensured.")
@@ -100,11 +180,72 @@ def setup_managed_db():
             job_description TEXT,
             difficulty_level VARCHAR(50),
             question_phase VARCHAR(100),
-            question_text TEXT
+            question_text TEXT,
+            INDEX idx_questions_level_phase (difficulty_level, question_phase),
+            INDEX idx_questions_text (question_text(255))
         )
         """)
         print("'generated_questions' table ensured.")
 
+        # 6. Per-user progress rollup (see database_con.RebuildUserProgress)
+        cursor.execute("""
+        CREATE TABLE IF NOT EXISTS user_progress (
+            user_id INT PRIMARY KEY,
+            session_count INT NOT NULL DEFAULT 0,
+            scored_count INT NOT NULL DEFAULT 0,
+            score_sum DECIMAL(10,1) NOT NULL DEFAULT 0,
+            best_score DECIMAL(3,1),
+            last_scores JSON,
+            stage_stats JSON,
+            streak_count INT NOT NULL DEFAULT 0,
+            last_active_date DATE,
+            today_date DATE,
+            today_status VARCHAR(50),
+            updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP ON UPDATE CURRENT_TIMESTAMP,
+            FOREIGN KEY (user_id) REFERENCES users(user_id)
+        )
+        """)
+        print("'user_progress' table ensured.")
+
+        # 7. Finished feedback reports (read model for /api/feedback/<session_id>)
+        cursor.execute("""
+        CREATE TABLE IF NOT EXISTS feedback_reports (
+            session_id VARCHAR(100) PRIMARY KEY,
+            user_id INT,
+            score DECIMAL(3,1),
+            report_md MEDIUMTEXT,
+            report_html MEDIUMTEXT,
+            history JSON,
+            last_question TEXT,
+            last_answer TEXT,
+            created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+        )
+        """)
+        print("'feedback_reports' table ensured.")
+
+        # 8. Per-turn scores written in the background after /submit-answer
+        cursor.execute("""
+        CREATE TABLE IF NOT EXISTS turn_evaluations (
+            session_id VARCHAR(100) NOT NULL,
+            turn INT NOT NULL,
+            user_id INT,
+            answer_sha CHAR(16),
+            status VARCHAR(10) NOT NULL DEFAULT 'pending',
+            score DECIMAL(3,1),
+            evaluation JSON,
+            updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP ON UPDATE CURRENT_TIMESTAMP,
+            PRIMARY KEY (session_id, turn)
+        )
+        """)
+        print("'turn_evaluations' table ensured.")
+
+        ensure_columns(cursor, config["database"])
+        print("Added columns ensured.")
+
+        ensure_indexes(cursor, config["database"])
+        ensure_daily_unique_key(cursor, config["database"])
+        print("Secondary indexes ensured.")
+
         conn.commit()
         cursor.close()
         conn.close()
@@ -5,18 +5,92 @@ document.addEventListener('DOMContentLoaded', () => {
 
 async function fetchStats() {
     try {
-        const response = await fetch('/api/admin/stats');
+        const modeSelect = document.getElementById('statsMode');
+        const mode = modeSelect ? modeSelect.value : 'approx';
+        const response = await fetch(`/api/admin/stats?mode=${mode}`);
         const data = await response.json();
         
         if (data.success) {
             document.getElementById('totalUsers').textContent = data.total_users;
             document.getElementById('totalSessions').textContent = data.total_sessions;
+            renderBreakdown('breakdownByDay', data.by_day);
+            renderBreakdown('breakdownByLevel', data.by_level);
+            renderBreakdown('breakdownByStage', data.by_stage);
         }
     } catch (error) {
         console.error('Error fetching stats:', error);
     }
 }
 
+function renderBreakdown(containerId, counts) {
+    const container = document.getElementById(containerId);
+    if (!container) return;
+    const entries = Object.entries(counts || {});
+    if (entries.length === 0) {
+        container.innerHTML = '<p style="color: var(--text-gray);">No data yet.</p>';
+        return;
+    }
+    const max = Math.max(...entries.map(([, count]) => count));
+    container.innerHTML = entries.map(([label, count]) => `
+        <div class="bar-row">
+            <span class="bar-label" title="${label}">${label}</span>
+            <div class="bar-track"><div class="bar-fill" style="width: ${(count / max) * 100}%"></div></div>
+            <strong>${count}</strong>
+        </div>
+    `).join('');
+}
+
+// Stages drawn in their own colour on the waterfall; anything else uses stage-other
+const TIMELINE_STAGES = ['db', 'embedding', 'rq_wait', 'semaphore_wait', 'llm_call'];
+
+async function fetchTimeline(event) {
+    if (event) event.preventDefault();
+    const container = document.getElementById('timelineContainer');
+    const sessionId = document.getElementById('timelineSessionId').value.trim();
+    if (!sessionId) return;
+    try {
+        const response = await fetch(`/api/admin/session-timeline/${encodeURIComponent(sessionId)}`);
+        const data = await response.json();
+        if (!data.success) {
+            container.innerHTML = `<p style="color: var(--text-gray);">${data.error || 'Session not found'}</p>`;
+            return;
+        }
+        renderTimeline(container, data);
+    } catch (error) {
+        console.error('Error fetching timeline:', error);
+    }
+}
+
+function renderTimeline(container, data) {
+    const turns = data.turns || [];
+    if (turns.length === 0) {
+        container.innerHTML = '<p style="color: var(--text-gray);">No timings recorded for this session.</p>';
+        return;
+    }
+    const ms = value => `${Math.round(value)} ms`;
+    const totals = Object.entries(data.stage_totals || {})
+        .map(([stage, value]) => `${stage}: ${ms(value)}`).join(' · ');
+    // Every turn shares the scale of the slowest one so the bars are comparable
+    const scale = Math.max(...turns.map(turn => turn.total_ms), 1);
+
+    container.innerHTML = `
+        <div class="timeline-summary">${data.question_count} questions · ${totals}</div>
+    ` + turns.map(turn => {
+        const spans = (turn.spans || []).map(([stage, offset, duration]) => {
+            const cls = TIMELINE_STAGES.includes(stage) ? stage : 'other';
+            return `<div class="waterfall-span stage-${cls}" title="${stage}: ${ms(duration)} at +${ms(offset)}"
+                        style="left: ${(offset / scale) * 100}%; width: ${(duration / scale) * 100}%"></div>`;
+        }).join('');
+        const gap = turn.gap_ms !== undefined ? ` · gap since answer ${ms(turn.gap_ms)}` : '';
+        return `
+            <div class="waterfall-turn">
+                <h3>Turn ${turn.turn} · ${turn.kind} · ${ms(turn.total_ms)}${gap}</h3>
+                <div class="waterfall-track" style="width: ${(turn.total_ms / scale) * 100}%">${spans}</div>
+            </div>
+        `;
+    }).join('');
+}
+
 async function fetchRequests() {
     try {
         const response = await fetch('/api/admin/requests');
@@ -12,7 +12,10 @@ document.addEventListener('DOMContentLoaded', function() {
         return;
     }
 
+    // The server keeps the conversation; this copy is only sent when it
+    // reports that it has no memory (Redis unavailable)
     let history = [];
+    let serverMemory = true;
 
     // 2. Event Handlers
     function toggleChat() {
@@ -48,7 +51,7 @@ document.addEventListener('DOMContentLoaded', function() {
             const response = await fetch('/api/hr-chat', {
                 method: 'POST',
                 headers: { 'Content-Type': 'application/json' },
-                body: JSON.stringify({
+                body: JSON.stringify(serverMemory ? { message: text } : {
                     message: text,
                     history: history
                 })
@@ -65,7 +68,10 @@ document.addEventListener('DOMContentLoaded', function() {
                 appendMessage('assistant', data.response);
                 history.push({ role: 'user', content: text });
                 history.push({ role: 'assistant', content: data.response });
-                if (history.length > 20) history = history.slice(-20);
+                if (history.length > 6) history = history.slice(-6);
+                serverMemory = data.memory !== false;
+            } else if ((response.status === 429 || response.status === 503) && data.message) {
+                appendMessage('assistant', data.message);
             } else {
                 appendMessage('assistant', "I'm sorry, I'm having some trouble responding right now.");
             }
@@ -1,4 +1,25 @@
 const API_BASE = "";
+const SESSION_LIST_FIELDS = "session_id,topic,score,session_date,feedback_preview";
+
+// Recent sessions for the table; rows carry only scalar columns plus a short
+// feedback preview, full reports are fetched on demand.
+async function fetchRecentSessions(limit = 50) {
+    const params = new URLSearchParams({ fields: SESSION_LIST_FIELDS, limit });
+    const res = await fetch(`${API_BASE}/get-user-sessions?${params}`);
+    if (!res.ok) throw new Error("Failed to fetch sessions");
+    const page = await res.json();
+    return page.sessions;
+}
+
+// Pre-aggregated totals (count, average, best, per-stage) from the progress rollup
+async function fetchProgressSummary() {
+    try {
+        const res = await fetch(`${API_BASE}/api/progress`);
+        return res.ok ? await res.json() : null;
+    } catch (_) {
+        return null;
+    }
+}
 
 async function loadProgress() {
     try {
@@ -40,10 +61,7 @@ async function loadProgress() {
             }
         }
 
-        const res = await fetch(`${API_BASE}/get-user-sessions`);
-        if (!res.ok) throw new Error("Failed to fetch sessions");
-
-        const sessions = await res.json();
+        const [sessions, summary] = await Promise.all([fetchRecentSessions(), fetchProgressSummary()]);
 
         if (sessions.length === 0) {
             document.getElementById("totalSessions").innerText = "0";
@@ -52,15 +70,21 @@ async function loadProgress() {
             return;
         }
 
-        // OVERVIEW
-        document.getElementById("totalSessions").innerText = sessions.length;
+        // OVERVIEW (rollup when available, otherwise derived from the recent page)
+        let avgScore;
+        if (summary && summary.success) {
+            document.getElementById("totalSessions").innerText = summary.session_count;
+            avgScore = summary.average_score;
+        } else {
+            document.getElementById("totalSessions").innerText = sessions.length;
 
-        // Process scores as numbers, excluding pending/0-score sessions from bringing down the average
-        const completedSessions = sessions.filter(s => s.score !== null && parseFloat(s.score) > 0);
-        const numericScores = completedSessions.map(s => parseFloat(s.score));
-        
-        const totalScore = numericScores.reduce((sum, score) => sum + score, 0);
-        const avgScore = numericScores.length > 0 ? (totalScore / numericScores.length) : 0;
+            // Process scores as numbers, excluding pending/0-score sessions from bringing down the average
+            const completedSessions = sessions.filter(s => s.score !== null && parseFloat(s.score) > 0);
+            const numericScores = completedSessions.map(s => parseFloat(s.score));
+
+            const totalScore = numericScores.reduce((sum, score) => sum + score, 0);
+            avgScore = numericScores.length > 0 ? (totalScore / numericScores.length) : 0;
+        }
 
         document.getElementById("avgScore").innerText = isNaN(avgScore) ? "0.0" : avgScore.toFixed(1);
         // document.getElementById("latestScore").innerText = numericScores.length > 0 ? numericScores[0].toFixed(1) : "-"; // Element removed in UI update
@@ -83,8 +107,11 @@ async function loadProgress() {
 
         // SKILLS TO DEVELOP
         const skillsContainer = document.getElementById("skillsToDevelop");
-        if (sessions.length > 0 && sessions[0].feedback) {
-            const feedback = sessions[0].feedback;
+        const latestFeedback = sessions.length > 0 && sessions[0].feedback_preview
+            ? await fetch(`${API_BASE}/api/feedback/${sessions[0].session_id}`).then(r => r.ok ? r.json() : {}).catch(() => ({}))
+            : {};
+        if (latestFeedback.feedback) {
+            const feedback = latestFeedback.feedback;
             const improvementMatch = feedback.match(/## Critical Areas for Improvement[:\s]*([\s\S]*?)(?=\n##|$)/i);
 
             if (improvementMatch) {
@@ -106,7 +133,7 @@ async function loadProgress() {
             const row = document.createElement("tr");
             const date = new Date(s.session_date).toLocaleDateString();
 
-            const feedbackText = s.feedback || "Review Pending";
+            const feedbackText = s.feedback_preview || "Review Pending";
             const topicText = s.topic || "General Interview";
             const scoreText = s.score !== null ? (parseFloat(s.score) || 0).toFixed(1) : "Pnd";
 
@@ -321,6 +321,8 @@ const SpeechRecognition =
   window.SpeechRecognition || window.webkitSpeechRecognition;
 
 const API_BASE = window.location.origin;
+// Hashed face-api weights directory from asset_url(); read while this script is still executing
+const MODEL_URL = document.currentScript?.dataset.modelUrl || '/static/models/';
 console.log('[SkillUp] App initialised at:', API_BASE);
 
 // ============================================================
@@ -415,14 +417,15 @@ async function uploadResumeFile(event) {
   formData.append('resume', file);
   try {
     const res = await fetch(`${API_BASE}/api/profile/resume`, { method: 'POST', body: formData });
-    if (res.ok) {
-      const fetchRes = await fetch(`${API_BASE}/api/profile/resume`);
-      const data = await fetchRes.json();
+    let data = await res.json().catch(() => ({}));
+    // 202: extraction continues in the background, poll until it finishes
+    if (res.status === 202) data = await pollResumeJob(data.job_id);
+    if (res.ok && data.status === 'done') {
       document.getElementById('resume-text').value = data.resume_text;
-      statusEl.textContent = 'Extracted and Saved!';
+      statusEl.textContent = data.truncated ? 'Extracted and Saved! (only the first pages were read)' : 'Extracted and Saved!';
       setTimeout(() => (statusEl.textContent = ''), 2000);
     } else {
-      statusEl.textContent = 'Failed to process PDF.';
+      statusEl.textContent = data.error || data.message || 'Failed to process PDF.';
     }
   } catch (e) {
     console.error('Upload resume error:', e);
@@ -430,6 +433,16 @@ async function uploadResumeFile(event) {
   }
 }
 
+async function pollResumeJob(jobId, intervalMs = 1000, maxAttempts = 60) {
+  for (let attempt = 0; attempt < maxAttempts; attempt++) {
+    await new Promise((resolve) => setTimeout(resolve, intervalMs));
+    const res = await fetch(`${API_BASE}/api/profile/resume/jobs/${jobId}`);
+    const data = await res.json().catch(() => ({}));
+    if (!res.ok || data.status !== 'pending') return data;
+  }
+  return { status: 'failed', error: 'PDF extraction timed out.' };
+}
+
 // ============================================================
 // START INTERVIEW
 // ============================================================
@@ -444,7 +457,6 @@ async function startInterview() {
 
   try {
     // Load face-api models
-    const MODEL_URL = '/static/models/';
     await faceapi.nets.tinyFaceDetector.loadFromUri(MODEL_URL);
     await faceapi.nets.faceExpressionNet.loadFromUri(MODEL_URL);
 
@@ -466,7 +478,7 @@ async function startInterview() {
     showLoading(true, 'Generating your first interview question…');
 
     // Fetch first question
-    const res = await fetch(`${API_BASE}/hr-questions`, {
+    const res = await fetchWithRetry(`${API_BASE}/hr-questions`, {
       method: 'POST',
       headers: { 'Content-Type': 'application/json' },
       body: JSON.stringify({ jd, level: difficulty }),
@@ -523,7 +535,7 @@ async function nextQuestion() {
     if (recognition) recognition.stop();
     stopEmotionPolling();
 
-    const res = await fetch(`${API_BASE}/hr-questions`, {
+    const res = await fetchWithRetry(`${API_BASE}/hr-questions`, {
       method: 'POST',
       headers: { 'Content-Type': 'application/json' },
       body: JSON.stringify({
@@ -861,7 +873,7 @@ async function analyzeResponse() {
 async function finishInterview() {
   showLoading(true, 'Compiling your final comprehensive HR Evaluation… (This may take up to 2 minutes)');
   try {
-    const res = await fetch(`${API_BASE}/finish-interview`, {
+    const res = await fetchWithRetry(`${API_BASE}/finish-interview`, {
       method: 'POST',
       headers: { 'Content-Type': 'application/json' },
       body: JSON.stringify({ session_id: currentSession.session_id }),
@@ -879,6 +891,18 @@ async function finishInterview() {
 // ============================================================
 // UTILITY FUNCTIONS
 // ============================================================
+// LLM routes answer 429 + Retry-After when the interviewer is saturated;
+// wait it out (up to twice) rather than failing the turn
+async function fetchWithRetry(url, options, retries = 2) {
+  for (let attempt = 0; ; attempt++) {
+    const res = await fetch(url, options);
+    const retryAfter = Number(res.headers.get('Retry-After'));
+    if (res.status !== 429 || attempt >= retries || !(retryAfter > 0 && retryAfter <= 30)) return res;
+    showLoading(true, `The interviewer is busy, retrying in ${retryAfter}s…`);
+    await new Promise((resolve) => setTimeout(resolve, retryAfter * 1000));
+  }
+}
+
 function startTimer() {
   document.getElementById('recording-timer').classList.remove('hidden');
   timerInterval = setInterval(() => {